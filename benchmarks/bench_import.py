@@ -0,0 +1,106 @@
+"""Benchmark of the time of import of this package
+
+Run: python benchmarks/bench_import.py --repeats 20 --output import.json
+Every import is measured in a new interpreter. Heavy modules which
+should be imported only on use are reported if they were loaded.
+"""
+# Standard library imports
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# Third party imports
+
+# Local imports
+
+
+DICT_STATEMENT_BY_NAME = {
+    "import_package": "import selenium_screenshots",
+    "import_make_screenshot":
+        "from selenium_screenshots import make_screenshot",
+    "import_screenshots": "from selenium_screenshots import Screenshots",
+}
+# Modules which should not be loaded just by the import of the package
+TUPLE_LAZY_MODULES = (
+    "tqdm",
+    "local_simple_database",
+    "sqlite3",
+    "asyncio",
+    "multiprocessing",
+    "numpy",
+    "PIL",
+)
+
+
+def measure_import(str_statement, int_repeats):
+    """Measure import statement in new interpreters
+
+    Args:
+        str_statement (str): Python statement to run
+        int_repeats (int): Number of the measurements
+
+    Returns:
+        dict: Results of the benchmark
+    """
+    str_code = (
+        "import sys, time\n"
+        "float_start_time = time.perf_counter()\n"
+        "%s\n"
+        "float_seconds = time.perf_counter() - float_start_time\n"
+        "print(float_seconds)\n"
+        "print(','.join(sorted(sys.modules)))\n"
+    ) % str_statement
+    list_ms = []
+    set_loaded_modules = set()
+    for _ in range(int_repeats):
+        list_output_lines = subprocess.check_output(
+            [sys.executable, "-c", str_code]).decode().splitlines()
+        list_ms.append(float(list_output_lines[0]) * 1000)
+        set_loaded_modules.update(list_output_lines[1].split(","))
+    return {
+        "median_ms": statistics.median(list_ms),
+        "min_ms": min(list_ms),
+        "lazy_modules_loaded": [
+            str_module for str_module in TUPLE_LAZY_MODULES
+            if str_module in set_loaded_modules
+        ],
+    }
+
+
+def main():
+    """Parse arguments, run benchmarks and save results
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeats", type=int, default=10,
+        help="Number of the measurements of every import")
+    parser.add_argument(
+        "--output", default="",
+        help="Path to the JSON file where to save results")
+    args = parser.parse_args()
+    list_results = []
+    for str_name, str_statement in DICT_STATEMENT_BY_NAME.items():
+        dict_result = measure_import(str_statement, args.repeats)
+        dict_result["benchmark"] = str_name
+        print(json.dumps(dict_result), file=sys.stderr)
+        list_results.append(dict_result)
+    dict_report = {
+        "python": sys.version.split()[0],
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": list_results,
+    }
+    if args.output:
+        with open(args.output, "w") as file_handle:
+            json.dump(dict_report, file_handle, indent=2)
+    else:
+        print(json.dumps(dict_report, indent=2))
+    # Non zero exit code lets CI catch regressions
+    return int(any(
+        dict_result["lazy_modules_loaded"] for dict_result in list_results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
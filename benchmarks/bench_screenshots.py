@@ -0,0 +1,336 @@
+"""Benchmarks of the overhead of this package with a fake webdriver
+
+Run: python benchmarks/bench_screenshots.py --sizes 1000,10000 \
+    --output results.json
+Results are printed and saved as JSON, so they can be compared between
+versions of the package.
+"""
+# Standard library imports
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+# Third party imports
+
+# Local imports
+from fake_webdriver import FakeWebdriver
+from selenium_screenshots import Screenshots
+from selenium_screenshots import MemoryScreenshotsCounter
+
+
+LIST_DESCRIPTIONS = ["login", "search", "cart", "checkout", "profile"]
+
+
+def get_package_version():
+    """Get installed version of the package
+
+    Returns:
+        str: Version or "unknown"
+    """
+    try:
+        from importlib.metadata import version
+        return version("selenium_screenshots")
+    except Exception:
+        return "unknown"
+
+
+def fill_directory_with_screenshots(str_path_dir, int_files):
+    """Create empty screenshots files, names are like real ones
+
+    Args:
+        str_path_dir (str): Directory where to create files
+        int_files (int): Number of the files to create
+    """
+    os.makedirs(str_path_dir, exist_ok=True)
+    for int_num in range(1, int_files + 1):
+        str_name = "%d_%s.png" % (
+            int_num, LIST_DESCRIPTIONS[int_num % len(LIST_DESCRIPTIONS)])
+        with open(os.path.join(str_path_dir, str_name), "wb"):
+            pass
+
+
+def get_latency_stats(list_seconds):
+    """Get statistics of the latencies
+
+    Args:
+        list_seconds (list): Latencies in seconds
+
+    Returns:
+        dict: Statistics in milliseconds
+    """
+    list_ms = sorted(float_seconds * 1000 for float_seconds in list_seconds)
+    return {
+        "mean_ms": statistics.mean(list_ms),
+        "p50_ms": list_ms[len(list_ms) // 2],
+        "p95_ms": list_ms[min(len(list_ms) - 1, int(len(list_ms) * 0.95))],
+        "max_ms": list_ms[-1],
+    }
+
+
+def bench_capture(str_path_dir, webdriver, int_captures, dict_kwargs):
+    """Measure latency and throughput of create_screenshot()
+
+    Args:
+        str_path_dir (str): Directory for the screenshots
+        webdriver (FakeWebdriver): Fake webdriver
+        int_captures (int): Number of the screenshots to create
+        dict_kwargs (dict): Arguments for Screenshots(...)
+
+    Returns:
+        dict: Results of the benchmark
+    """
+    screenshots_handler = Screenshots(
+        webdriver, str_path_dir_with_screenshots=str_path_dir, **dict_kwargs)
+    list_seconds = []
+    float_start_time = time.perf_counter()
+    for int_capture in range(int_captures):
+        float_capture_start_time = time.perf_counter()
+        screenshots_handler.create_screenshot(
+            LIST_DESCRIPTIONS[int_capture % len(LIST_DESCRIPTIONS)])
+        list_seconds.append(time.perf_counter() - float_capture_start_time)
+    screenshots_handler.close()
+    float_seconds = time.perf_counter() - float_start_time
+    dict_result = get_latency_stats(list_seconds)
+    dict_result["captures_per_second"] = int_captures / float_seconds
+    return dict_result
+
+
+def bench_startup(str_path_dir, webdriver, int_repeats):
+    """Measure time of Screenshots(...) on the existing directory
+
+    Args:
+        str_path_dir (str): Directory with screenshots
+        webdriver (FakeWebdriver): Fake webdriver
+        int_repeats (int): Number of the measurements
+
+    Returns:
+        dict: Results of the benchmark
+    """
+    list_seconds = []
+    for _ in range(int_repeats):
+        float_start_time = time.perf_counter()
+        screenshots_handler = Screenshots(
+            webdriver, str_path_dir_with_screenshots=str_path_dir)
+        list_seconds.append(time.perf_counter() - float_start_time)
+        screenshots_handler.close()
+    return get_latency_stats(list_seconds)
+
+
+def bench_rotation(str_path_dir, webdriver, int_files):
+    """Measure latency of the screenshot which triggers rotation
+
+    Args:
+        str_path_dir (str): Directory with int_files screenshots
+        webdriver (FakeWebdriver): Fake webdriver
+        int_files (int): Number of the screenshots in the directory
+
+    Returns:
+        dict: Results of the benchmark
+    """
+    screenshots_handler = Screenshots(
+        webdriver,
+        str_path_dir_with_screenshots=str_path_dir,
+        int_screenshots_to_delete_half=int_files,
+    )
+    float_start_time = time.perf_counter()
+    screenshots_handler.create_screenshot("rotation")
+    float_seconds = time.perf_counter() - float_start_time
+    int_screenshots_left = \
+        screenshots_handler._count_screenshots_in_the_directory()
+    screenshots_handler.close()
+    return {
+        "rotation_ms": float_seconds * 1000,
+        "screenshots_deleted": int_files + 1 - int_screenshots_left,
+    }
+
+
+def bench_delete_not_unique(str_path_dir, webdriver):
+    """Measure time of delete_not_unique_screenshots()
+
+    Args:
+        str_path_dir (str): Directory with screenshots
+        webdriver (FakeWebdriver): Fake webdriver
+
+    Returns:
+        dict: Results of the benchmark
+    """
+    screenshots_handler = Screenshots(
+        webdriver, str_path_dir_with_screenshots=str_path_dir)
+    float_start_time = time.perf_counter()
+    screenshots_handler.delete_not_unique_screenshots()
+    float_seconds = time.perf_counter() - float_start_time
+    screenshots_handler.close()
+    return {"delete_not_unique_ms": float_seconds * 1000}
+
+
+def bench_validation(str_path_dir, int_calls):
+    """Measure per call overhead of the arguments validation by char
+
+    The same method of the same handler is called through the wrapper
+    of char and without it, so only the wrapper makes the difference.
+    A cheap method is used, the overhead on a capture is the same
+    absolute number and is usually hidden by the noise of writing.
+
+    Args:
+        str_path_dir (str): Directory for the screenshots
+        int_calls (int): Number of the calls of every method
+
+    Returns:
+        dict: Results of the benchmark in microseconds per call
+    """
+    webdriver = FakeWebdriver(int_width=16, int_height=16)
+    screenshots_handler = Screenshots(
+        webdriver,
+        str_path_dir_with_screenshots=str_path_dir,
+        counter=MemoryScreenshotsCounter(),
+    )
+    func_wrapped = Screenshots._create_name_for_screenshot
+    func_not_wrapped = getattr(func_wrapped, "__wrapped__", func_wrapped)
+    dict_result = {}
+    for str_name, func_method in [
+            ("name_checked_us", func_wrapped),
+            ("name_not_checked_us", func_not_wrapped),
+    ]:
+        list_seconds = []
+        # The best of a few runs is less affected by other processes
+        for _ in range(5):
+            float_start_time = time.perf_counter()
+            for int_call in range(int_calls):
+                func_method(
+                    screenshots_handler,
+                    "checkout_page",
+                    int_screenshot_num=int_call,
+                )
+            list_seconds.append(time.perf_counter() - float_start_time)
+        dict_result[str_name] = min(list_seconds) / int_calls * 1e6
+    dict_result["wrapper_overhead_us"] = \
+        dict_result["name_checked_us"] - dict_result["name_not_checked_us"]
+    screenshots_handler.close()
+    return dict_result
+
+
+def run_benchmarks(list_sizes, int_captures, int_repeats, str_path_tmp_dir):
+    """Run all benchmarks
+
+    Args:
+        list_sizes (list): Numbers of the screenshots in the directory
+        int_captures (int): Number of the screenshots to create \
+            in the capture benchmarks
+        int_repeats (int): Number of the measurements of the startup
+        str_path_tmp_dir (str): Directory for the temporary files
+
+    Returns:
+        list: Results of all benchmarks
+    """
+    webdriver = FakeWebdriver()
+    list_results = []
+
+    def add_result(str_benchmark, dict_params, dict_result):
+        dict_result = dict(dict_params, **dict_result)
+        dict_result["benchmark"] = str_benchmark
+        # Progress is printed to stderr, so stdout has only the report
+        print(json.dumps(dict_result), file=sys.stderr)
+        list_results.append(dict_result)
+
+    for str_name, dict_kwargs in [
+            ("capture", {}),
+            (
+                "capture_memory_counter",
+                {"counter": MemoryScreenshotsCounter()},
+            ),
+            ("capture_writer_threads", {"int_writer_threads": 2}),
+            ("capture_index", {"is_to_use_index": True}),
+    ]:
+        str_path_dir = os.path.join(str_path_tmp_dir, str_name)
+        add_result(
+            str_name,
+            {"captures": int_captures},
+            bench_capture(str_path_dir, webdriver, int_captures, dict_kwargs)
+        )
+        shutil.rmtree(str_path_dir)
+    str_path_dir = os.path.join(str_path_tmp_dir, "validation")
+    add_result(
+        "validation",
+        {"calls": int_captures},
+        bench_validation(str_path_dir, int_captures)
+    )
+    shutil.rmtree(str_path_dir)
+    for int_files in list_sizes:
+        str_path_dir = os.path.join(str_path_tmp_dir, "files_%d" % int_files)
+        fill_directory_with_screenshots(str_path_dir, int_files)
+        add_result(
+            "startup",
+            {"files_in_dir": int_files},
+            bench_startup(str_path_dir, webdriver, int_repeats)
+        )
+        add_result(
+            "delete_not_unique",
+            {"files_in_dir": int_files},
+            bench_delete_not_unique(str_path_dir, webdriver)
+        )
+        shutil.rmtree(str_path_dir)
+        fill_directory_with_screenshots(str_path_dir, int_files)
+        add_result(
+            "rotation",
+            {"files_in_dir": int_files},
+            bench_rotation(str_path_dir, webdriver, int_files)
+        )
+        shutil.rmtree(str_path_dir)
+    return list_results
+
+
+def main():
+    """Parse arguments, run benchmarks and save results
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="1000,10000",
+        help="Comma separated numbers of the screenshots in the directory, "
+             "E.G. 1000,10000,100000,1000000")
+    parser.add_argument(
+        "--captures", type=int, default=500,
+        help="Number of the screenshots to create in capture benchmarks")
+    parser.add_argument(
+        "--repeats", type=int, default=5,
+        help="Number of the measurements of the startup time")
+    parser.add_argument(
+        "--output", default="",
+        help="Path to the JSON file where to save results")
+    parser.add_argument(
+        "--tmp-dir", default=None,
+        help="Directory for the temporary screenshots, E.G. on the "
+             "filesystem to measure")
+    args = parser.parse_args()
+    str_path_tmp_dir = tempfile.mkdtemp(
+        prefix="selenium_screenshots_bench_", dir=args.tmp_dir)
+    try:
+        list_results = run_benchmarks(
+            [int(str_size) for str_size in args.sizes.split(",")],
+            args.captures,
+            args.repeats,
+            str_path_tmp_dir,
+        )
+    finally:
+        shutil.rmtree(str_path_tmp_dir, ignore_errors=True)
+    dict_report = {
+        "package_version": get_package_version(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": list_results,
+    }
+    if args.output:
+        with open(args.output, "w") as file_handle:
+            json.dump(dict_report, file_handle, indent=2)
+    else:
+        print(json.dumps(dict_report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
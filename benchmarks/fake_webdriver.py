@@ -0,0 +1,96 @@
+"""Fake in-process webdriver which returns synthetic PNG screenshots"""
+# Standard library imports
+import zlib
+import struct
+import random
+
+# Third party imports
+
+# Local imports
+
+
+def make_synthetic_png(int_width=1280, int_height=720, int_seed=0):
+    """Create valid RGB PNG with noise, so it compresses like a screenshot
+
+    Only a part of every row is random, the rest is a flat background.
+
+    Args:
+        int_width (int, optional): Width of the image
+        int_height (int, optional): Height of the image
+        int_seed (int, optional): Seed of the noise, different seeds \
+            give different images
+
+    Returns:
+        bytes: Content of the PNG file
+    """
+    random_generator = random.Random(int_seed)
+    int_noise_bytes = int_width * 3 // 8
+    bytes_background = b"\xf0" * (int_width * 3 - int_noise_bytes)
+    bytes_raw = b"".join(
+        b"\x00" +
+        bytes(random_generator.getrandbits(8)
+              for _ in range(int_noise_bytes)) +
+        bytes_background
+        for _ in range(int_height)
+    )
+
+    def make_chunk(bytes_type, bytes_data):
+        bytes_chunk = bytes_type + bytes_data
+        return struct.pack(">I", len(bytes_data)) + bytes_chunk + \
+            struct.pack(">I", zlib.crc32(bytes_chunk) & 0xffffffff)
+
+    return (
+        b"\x89PNG\r\n\x1a\n" +
+        make_chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", int_width, int_height, 8, 2, 0, 0, 0)) +
+        make_chunk(b"IDAT", zlib.compress(bytes_raw, 6)) +
+        make_chunk(b"IEND", b"")
+    )
+
+
+class FakeWebdriver(object):
+    """Webdriver which returns prepared screenshots one by one"""
+
+    def __init__(
+            self,
+            int_different_screenshots=8,
+            int_width=1280,
+            int_height=720,
+    ):
+        """Prepare synthetic screenshots
+
+        Args:
+            int_different_screenshots (int, optional): Number of the \
+                different screenshots to return in turn
+            int_width (int, optional): Width of the screenshots
+            int_height (int, optional): Height of the screenshots
+        """
+        self.list_bytes_png = [
+            make_synthetic_png(int_width, int_height, int_seed)
+            for int_seed in range(int_different_screenshots)
+        ]
+        self.int_screenshots_taken = 0
+
+    def get_screenshot_as_png(self):
+        """Get the next prepared screenshot
+
+        Returns:
+            bytes: PNG content of the screenshot
+        """
+        bytes_png = self.list_bytes_png[
+            self.int_screenshots_taken % len(self.list_bytes_png)]
+        self.int_screenshots_taken += 1
+        return bytes_png
+
+    def get_screenshot_as_file(self, str_path):
+        """Save the next prepared screenshot to the file
+
+        Args:
+            str_path (str): Path to the file
+
+        Returns:
+            bool: True as the screenshot is always saved
+        """
+        with open(str_path, "wb") as file_handle:
+            file_handle.write(self.get_screenshot_as_png())
+        return True
@@ -1,24 +1,70 @@
 """Python package to handle creation of many screenshots for selenium"""
 # Standard library imports
 import logging
+import importlib
 
 # Third party imports
 
 # Local imports
-from selenium_screenshots.class_screenshots import Screenshots
-from selenium_screenshots.func_screenshot import make_screenshot
 
-__all__ = ["Screenshots", "make_screenshot"]
+# Classes and functions are imported only on the first use,
+# so "import selenium_screenshots" is fast
+DICT_MODULE_BY_EXPORTED_NAME = {
+    "Screenshots": "class_screenshots",
+    "ScreenshotSession": "class_screenshot_session",
+    "ScreenshotRecord": "class_screenshot_record",
+    "AsyncScreenshots": "class_async_screenshots",
+    "LsdScreenshotsCounter": "class_counters",
+    "MemoryScreenshotsCounter": "class_counters",
+    "ProcessSafeScreenshotsCounter": "class_counters",
+    "RetentionPolicy": "class_retention_policy",
+    "PngEncoder": "class_encoders",
+    "JpegEncoder": "class_encoders",
+    "WebpEncoder": "class_encoders",
+    "ScreenshotsMetrics": "class_metrics",
+    "CallbackMetrics": "class_metrics",
+    "StatsdMetrics": "class_metrics",
+    "HistogramMetrics": "class_metrics",
+    "FilenamePolicy": "class_filename_policy",
+    "DeltaStorage": "class_delta_storage",
+    "ScreenshotsStorage": "class_storage",
+    "LocalStorage": "class_storage",
+    "MemoryStorage": "class_storage",
+    "PackStorage": "class_pack_storage",
+    "ObjectStoreStorage": "class_object_store_storage",
+    "make_screenshot": "func_screenshot",
+    "clear_cached_handlers": "func_screenshot",
+    "migrate_screenshots_layout": "func_shards",
+}
 
+__all__ = list(DICT_MODULE_BY_EXPORTED_NAME)
 
-#####
-# Prepare basic logger in case user is not setting it itself.
-#####
-LOGGER = logging.getLogger("selenium_screenshots")
-LOGGER.propagate = False
-LOGGER.setLevel(level=logging.WARNING)  # Or any level you see suitable now
 
-stdout_handler = logging.StreamHandler()
-stdout_handler.setFormatter(
-    logging.Formatter("%(asctime)s - [%(levelname)s]: %(message)s"))
-LOGGER.addHandler(stdout_handler)
+def __getattr__(str_name):
+    """Import exported class or function on the first use
+
+    Args:
+        str_name (str): Name of the class or function
+
+    Raises:
+        AttributeError: There is no such name in the package
+
+    Returns:
+        object: Class or function
+    """
+    str_module_name = DICT_MODULE_BY_EXPORTED_NAME.get(str_name)
+    if str_module_name is None:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, str_name))
+    value = getattr(
+        importlib.import_module("." + str_module_name, __name__), str_name)
+    globals()[str_name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(DICT_MODULE_BY_EXPORTED_NAME))
+
+
+# Messages are shown only if the application configures logging
+logging.getLogger("selenium_screenshots").addHandler(logging.NullHandler())
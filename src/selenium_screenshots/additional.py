@@ -1,15 +1,95 @@
 """Some additional functions for this python package"""
 # Standard library imports
+import os
+import types
 import logging
+import importlib
 
 # Third party imports
-from char import char
 
 # Local imports
+from .exceptions import SeleniumScreenshotsError
+from .class_filename_policy import FilenamePolicy
 
 LOGGER = logging.getLogger("selenium_screenshots")
+# Optional dependencies: {extra of the package: what to install}
+DICT_PACKAGES_BY_EXTRA = {
+    "images": "numpy and Pillow",
+    "s3": "boto3",
+}
+# Screenshots saved as changed tiles of the last keyframe
+STR_DELTA_EXTENSION = ".delta.npz"
+TUPLE_SCREENSHOTS_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".webp", STR_DELTA_EXTENSION)
+STR_VALIDATION_MODE_ENV_VARIABLE = "SELENIUM_SCREENSHOTS_VALIDATION"
+TUPLE_VALIDATION_MODES = ("strict", "off")
+# Every not alphanumeric character becomes "_"
+DEFAULT_FILENAME_POLICY = FilenamePolicy()
 
-@char
+
+def get_validation_mode_from_env():
+    """Get mode of the arguments validation from the environment variable
+
+    "strict" - types of the arguments are checked by char on every call,
+    "off" - arguments are not checked, so there are no wrapper frames.
+
+    Returns:
+        str: Mode of the validation, "strict" by default
+    """
+    str_validation_mode = os.environ.get(
+        STR_VALIDATION_MODE_ENV_VARIABLE, "").strip().lower()
+    if not str_validation_mode:
+        return "strict"
+    if str_validation_mode not in TUPLE_VALIDATION_MODES:
+        LOGGER.warning(
+            "Unknown validation mode in %s: %s, use strict",
+            STR_VALIDATION_MODE_ENV_VARIABLE, str_validation_mode
+        )
+        return "strict"
+    return str_validation_mode
+
+
+# Default mode of the validation chosen on import
+STR_DEFAULT_VALIDATION_MODE = get_validation_mode_from_env()
+
+
+def char_if_strict(func):
+    """Decorate function with char only if validation is strict on import
+
+    If validation is off then char isn't even imported.
+
+    Args:
+        func (callable): Function to decorate
+
+    Returns:
+        callable: Decorated or the same function
+    """
+    if STR_DEFAULT_VALIDATION_MODE == "off":
+        return func
+    from char import char
+    return char(func)
+
+
+def bind_methods_without_validation(obj):
+    """Bind to the object its methods without char wrappers
+
+    After it methods of this object are called without checking
+    of the arguments, other objects of the same class are not changed.
+
+    Args:
+        obj (object): Object which methods are decorated with char
+    """
+    for cls in reversed(type(obj).__mro__):
+        for str_name, func in vars(cls).items():
+            if str_name.startswith("__") or \
+            isinstance(func, (staticmethod, classmethod)):
+                continue
+            func_original = getattr(func, "__wrapped__", None)
+            if func_original is not None:
+                setattr(obj, str_name, types.MethodType(func_original, obj))
+
+
+@char_if_strict
 def delete_from_file_name_forbidden_characters(str_filename):
     """Delete forbidden charactars in a filename from the given string
 
@@ -19,10 +99,124 @@ def delete_from_file_name_forbidden_characters(str_filename):
     Returns:
         str: filename with removed characters which are not allowed
     """
-    list_chars_of_filtered_filenames = []
-    for str_char in str_filename:
-        if str_char.isalnum():
-            list_chars_of_filtered_filenames.append(str_char)
-        else:
-            list_chars_of_filtered_filenames.append('_')
-    return "".join(list_chars_of_filtered_filenames)
+    return DEFAULT_FILENAME_POLICY.sanitize(str_filename)
+
+
+def get_screenshot_num_from_name(str_screenshot_name):
+    """Get number of the screenshot from its name like "<number>_<descr>.png"
+
+    Args:
+        str_screenshot_name (str): Name of the screenshot file, \
+            it can be in a shard like "<shard>/<number>_<descr>.png"
+
+    Returns:
+        int: Number of the screenshot or None if name has wrong format
+    """
+    str_screenshot_num = get_screenshot_filename(
+        str_screenshot_name).split("_")[0].split(".")[0]
+    try:
+        return int(str_screenshot_num)
+    except ValueError:
+        return None
+
+
+def get_screenshot_filename(str_screenshot_name):
+    """Get filename of the screenshot without shard directory
+
+    Args:
+        str_screenshot_name (str): Name of the screenshot like \
+            "<number>_<descr>.png" or "<shard>/<number>_<descr>.png"
+
+    Returns:
+        str: Filename of the screenshot
+    """
+    return str_screenshot_name.rsplit("/", 1)[-1]
+
+
+def get_max_screenshot_num(list_screenshots_names):
+    """Get max number of the screenshots with given names
+
+    Args:
+        list_screenshots_names (list): Names of the screenshots
+
+    Returns:
+        int: Max number of the screenshots or 0 if there are no numbers
+    """
+    int_max_screenshot_num = 0
+    for str_screenshot_name in list_screenshots_names:
+        int_screenshot_num = get_screenshot_num_from_name(str_screenshot_name)
+        if int_screenshot_num is not None:
+            int_max_screenshot_num = \
+                max(int_max_screenshot_num, int_screenshot_num)
+    return int_max_screenshot_num
+
+
+def get_screenshot_description_from_name(str_screenshot_name):
+    """Get description of the screenshot from its name
+
+    Args:
+        str_screenshot_name (str): Name of the screenshot file, \
+            it can be in a shard like "<shard>/<number>_<descr>.png"
+
+    Returns:
+        str: Description of the screenshot, empty if there is no one
+    """
+    # Description can't contain dots, so everything after one is extension
+    str_screen_descr = \
+        get_screenshot_filename(str_screenshot_name).split(".")[0]
+    # delete screenshot number from screenshot description
+    return "_".join(str_screen_descr.split("_")[1:])
+
+
+def is_screenshot_filename(str_filename):
+    """Check if the file with given name is a screenshot
+
+    Args:
+        str_filename (str): Name of the file
+
+    Returns:
+        bool: True if it's a screenshot
+    """
+    return str_filename.endswith(TUPLE_SCREENSHOTS_EXTENSIONS)
+
+
+def get_png_from_webdriver(webdriver):
+    """Get screenshot from the webdriver as PNG content
+
+    Args:
+        webdriver (selenium.webdriver): Selenium Webdriver
+
+    Raises:
+        SeleniumScreenshotsError: Main exception of this python package
+
+    Returns:
+        bytes: PNG content of the screenshot
+    """
+    try:
+        return webdriver.get_screenshot_as_png()
+    except Exception as ex:
+        LOGGER.error("Unable to get screenshot from the webdriver")
+        raise SeleniumScreenshotsError(str(ex))
+
+
+def import_optional_module(str_module_name, str_extra="images"):
+    """Import module from the optional dependencies of this package
+
+    Args:
+        str_module_name (str): Name of the module to import
+        str_extra (str, optional): Extra of the package with this module
+
+    Raises:
+        SeleniumScreenshotsError: Module is not installed
+
+    Returns:
+        module: Imported module
+    """
+    try:
+        return importlib.import_module(str_module_name)
+    except ImportError as ex:
+        raise SeleniumScreenshotsError(
+            "To use this feature please install %s: "
+            "pip install selenium_screenshots[%s]\n%s" % (
+                DICT_PACKAGES_BY_EXTRA[str_extra], str_extra, ex)
+        )
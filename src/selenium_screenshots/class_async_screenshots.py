@@ -0,0 +1,217 @@
+"""File with asyncio counterpart of the class Screenshots"""
+# Standard library imports
+import asyncio
+import inspect
+import logging
+import functools
+from concurrent.futures import Future
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .class_screenshots import Screenshots
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class AsyncScreenshots(object):
+    """Class to create screenshots from asyncio code
+
+    Screenshots are taken from an async source (E.G. async WebDriver or
+    CDP client) and written to the disk in a thread executor, so the event
+    loop is never blocked. Numbering, counting and rotation are done by
+    the usual Screenshots handler which is kept in screenshots_handler.
+    Use "await AsyncScreenshots.create(...)" inside of a running loop,
+    as creation of the handler reads the directory.
+    """
+
+    def __init__(
+            self,
+            screenshot_source,
+            str_path_dir_with_screenshots="screenshots",
+            executor=None,
+            screenshots_handler=None,
+            **kwargs
+    ):
+        """Init object for handling screenshots in asyncio code
+
+        Args:
+            screenshot_source (object): Object with method \
+                get_screenshot_as_png() or callable without arguments. \
+                It can return PNG bytes or coroutine with them.
+            str_path_dir_with_screenshots (str, optional): \
+                Path to directory where to save screenshots.
+            executor (concurrent.futures.Executor, optional): Executor \
+                where to write screenshots, by default one of the loop
+            screenshots_handler (Screenshots, optional): Already created \
+                handler, if set then other arguments of it are not used
+            **kwargs: Other arguments for Screenshots(...)
+        """
+        self.screenshot_source = screenshot_source
+        self.executor = executor
+        if screenshots_handler is None:
+            screenshots_handler = Screenshots(
+                None,
+                str_path_dir_with_screenshots=str_path_dir_with_screenshots,
+                **kwargs
+            )
+        self.screenshots_handler = screenshots_handler
+
+    @classmethod
+    async def create(
+            cls,
+            screenshot_source,
+            str_path_dir_with_screenshots="screenshots",
+            executor=None,
+            **kwargs
+    ):
+        """Create object in the executor without blocking the event loop
+
+        Args:
+            screenshot_source (object): Object with method \
+                get_screenshot_as_png() or callable without arguments
+            str_path_dir_with_screenshots (str, optional): \
+                Path to directory where to save screenshots.
+            executor (concurrent.futures.Executor, optional): Executor \
+                where to create the handler and write screenshots
+            **kwargs: Other arguments for Screenshots(...)
+
+        Returns:
+            AsyncScreenshots: New object
+        """
+        loop = asyncio.get_running_loop()
+        screenshots_handler = await loop.run_in_executor(
+            executor,
+            functools.partial(
+                Screenshots,
+                None,
+                str_path_dir_with_screenshots=str_path_dir_with_screenshots,
+                **kwargs
+            ),
+        )
+        return cls(
+            screenshot_source,
+            executor=executor,
+            screenshots_handler=screenshots_handler,
+        )
+
+    async def create_screenshot(self, str_description=""):
+        """Create a new screenshot with given description
+
+        Args:
+            str_description (str): description to add in the screenshot name.
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str: Path to the new screenshot
+        """
+        bytes_png = await self._get_png_from_source()
+        return await self.save_screenshot(bytes_png, str_description)
+
+    async def save_screenshot(self, bytes_png, str_description=""):
+        """Save already captured screenshot as a new screenshot file
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            str_description (str, optional): description to add in the \
+                screenshot name.
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str: Path to the new screenshot
+        """
+        return await self._run_in_executor(
+            self.screenshots_handler.save_screenshot,
+            bytes_png,
+            str_description,
+        )
+
+    async def save_screenshots(self, list_tuples_png_and_description):
+        """Save already captured screenshots as new screenshot files
+
+        Args:
+            list_tuples_png_and_description (list): Tuples like \
+                (bytes_png, str_description)
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            list: Paths to the new screenshots
+        """
+        return await self._run_in_executor(
+            self.screenshots_handler.save_screenshots,
+            list_tuples_png_and_description,
+        )
+
+    async def flush(self):
+        """Wait till all screenshots saving in the background are saved
+
+        Returns:
+            bool: True if there are no more screenshots waiting to be saved
+        """
+        return await self._run_in_executor(self.screenshots_handler.flush)
+
+    async def close(self):
+        """Save all pending screenshots and close the handler
+        """
+        await self._run_in_executor(self.screenshots_handler.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _get_png_from_source(self):
+        """Get screenshot from the source as PNG content
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            bytes: PNG content of the screenshot
+        """
+        func_get_png = getattr(
+            self.screenshot_source,
+            "get_screenshot_as_png",
+            self.screenshot_source
+        )
+        try:
+            result = func_get_png()
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as ex:
+            LOGGER.error("Unable to get screenshot from the source")
+            raise SeleniumScreenshotsError(str(ex))
+        if not isinstance(result, bytes):
+            raise SeleniumScreenshotsError(
+                "Screenshot source returned %s instead of bytes" %
+                type(result).__name__
+            )
+        return result
+
+    async def _run_in_executor(self, func, *args):
+        """Run blocking function of the handler in the executor
+
+        If the handler saves screenshots in the background then
+        its future is awaited too.
+
+        Args:
+            func (callable): Function to run
+            *args: Arguments of the function
+
+        Returns:
+            object: Result of the function
+        """
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, func, *args)
+        if isinstance(result, Future):
+            result = await asyncio.wrap_future(result)
+        return result
@@ -0,0 +1,112 @@
+"""File with the class to save screenshots in the background threads"""
+# Standard library imports
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class BackgroundWriter(object):
+    """Bounded pool of threads which runs screenshot saving jobs
+
+    If there are already too many pending jobs then submitting of a new one
+    blocks until some job is finished, so screenshots are never dropped.
+    """
+
+    def __init__(self, int_threads=1, int_max_pending_jobs=64):
+        """Init pool of the writer threads
+
+        Args:
+            int_threads (int, optional): Number of the writer threads
+            int_max_pending_jobs (int, optional): Max number of the jobs \
+                which are submitted but not finished yet
+        """
+        if int_threads < 1:
+            raise SeleniumScreenshotsError(
+                "Number of the writer threads should be positive")
+        if int_max_pending_jobs < 1:
+            raise SeleniumScreenshotsError(
+                "Max number of the pending jobs should be positive")
+        self.int_threads = int_threads
+        self.int_max_pending_jobs = int_max_pending_jobs
+        self.is_closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=int_threads,
+            thread_name_prefix="selenium_screenshots_writer",
+        )
+        self._semaphore_pending_jobs = \
+            threading.BoundedSemaphore(int_max_pending_jobs)
+        self._lock = threading.Lock()
+        self._set_pending_futures = set()
+
+    def submit(self, func, *args, **kwargs):
+        """Submit a new job to the writer threads
+
+        Args:
+            func (callable): Function which to run in the background
+
+        Raises:
+            SeleniumScreenshotsError: Writer is already closed
+
+        Returns:
+            concurrent.futures.Future: Future with result of the job
+        """
+        if self.is_closed:
+            raise SeleniumScreenshotsError(
+                "Unable to submit a screenshot, writer is already closed")
+        self._semaphore_pending_jobs.acquire()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:
+            self._semaphore_pending_jobs.release()
+            raise
+        with self._lock:
+            self._set_pending_futures.add(future)
+        future.add_done_callback(self._on_job_done)
+        return future
+
+    def flush(self, float_timeout=None):
+        """Wait till all already submitted jobs are finished
+
+        Args:
+            float_timeout (float, optional): Max seconds to wait
+
+        Returns:
+            bool: True if all jobs were finished
+        """
+        with self._lock:
+            list_pending_futures = list(self._set_pending_futures)
+        _, set_not_done = wait(list_pending_futures, timeout=float_timeout)
+        return not set_not_done
+
+    def close(self):
+        """Finish all pending jobs and stop the writer threads
+        """
+        if self.is_closed:
+            return None
+        self.is_closed = True
+        self._executor.shutdown(wait=True)
+        return None
+
+    def _on_job_done(self, future):
+        """Release place of the finished job and log its failure if any
+
+        Args:
+            future (concurrent.futures.Future): Finished job
+        """
+        with self._lock:
+            self._set_pending_futures.discard(future)
+        self._semaphore_pending_jobs.release()
+        if not future.cancelled() and future.exception() is not None:
+            LOGGER.error(
+                "Background saving of a screenshot failed: %s",
+                future.exception()
+            )
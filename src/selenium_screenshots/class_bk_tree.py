@@ -0,0 +1,74 @@
+"""File with BK-tree to find hashes within given Hamming distance"""
+# Standard library imports
+import logging
+
+# Third party imports
+
+# Local imports
+from .func_perceptual_hash import get_hamming_distance
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class BKTree(object):
+    """BK-tree of hashes with Hamming distance as the metric
+
+    Search of close hashes checks only a small part of the tree
+    instead of comparing the hash with every added one.
+    """
+
+    def __init__(self):
+        """Init empty tree"""
+        # Node is a list: [hash, item, {distance: child_node, ...}]
+        self._list_root = None
+        self.int_size = 0
+
+    def add(self, int_hash, item):
+        """Add hash with the item attached to it
+
+        Args:
+            int_hash (int): Hash to add
+            item (object): Any object to return when the hash is found
+        """
+        self.int_size += 1
+        if self._list_root is None:
+            self._list_root = [int_hash, item, {}]
+            return None
+        list_node = self._list_root
+        while True:
+            int_distance = get_hamming_distance(int_hash, list_node[0])
+            dict_children = list_node[2]
+            if int_distance not in dict_children:
+                dict_children[int_distance] = [int_hash, item, {}]
+                return None
+            list_node = dict_children[int_distance]
+
+    def find(self, int_hash, int_max_distance):
+        """Find all items with hashes close to the given one
+
+        Args:
+            int_hash (int): Hash to search for
+            int_max_distance (int): Max Hamming distance
+
+        Returns:
+            list: Tuples (distance, item) sorted by distance
+        """
+        list_found = []
+        if self._list_root is None:
+            return list_found
+        list_nodes_to_check = [self._list_root]
+        while list_nodes_to_check:
+            int_node_hash, item, dict_children = list_nodes_to_check.pop()
+            int_distance = get_hamming_distance(int_hash, int_node_hash)
+            if int_distance <= int_max_distance:
+                list_found.append((int_distance, item))
+            # By triangle inequality only these children can be close
+            for int_child_distance, list_child in dict_children.items():
+                if abs(int_child_distance - int_distance) <= int_max_distance:
+                    list_nodes_to_check.append(list_child)
+        list_found.sort(key=lambda tuple_found: tuple_found[0])
+        return list_found
+
+    def __len__(self):
+        return self.int_size
@@ -0,0 +1,489 @@
+"""File with counters which keep numbers of the screenshots in the dir"""
+# Standard library imports
+import os
+import time
+import logging
+
+# Third party imports
+
+# Local imports
+from .class_interprocess_lock import InterprocessLock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class LsdScreenshotsCounter(object):
+    """Counter which saves every change to LocalSimpleDatabase right away
+
+    Caller should not change the counter from many threads at the same time.
+    """
+
+    # If True then number of the screenshots should be recounted
+    # only while holding the lock of the counter
+    is_shared_between_processes = False
+
+    def __init__(self):
+        """Init counter, it starts working only after call of open(...)"""
+        self.LSD = None
+        self.str_path_dir_with_screenshots = ""
+
+    def open(
+            self,
+            str_path_dir_with_screenshots,
+            int_max_screenshot_num_on_disk=0,
+    ):
+        """Start counting screenshots in the given directory
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory with screenshots
+            int_max_screenshot_num_on_disk (int, optional): Max number of \
+                the screenshot which is already saved in the directory
+        """
+        # Imported here, so it's not loaded till a handler is created
+        from local_simple_database import LocalSimpleDatabase
+        self.str_path_dir_with_screenshots = str_path_dir_with_screenshots
+        self.LSD = LocalSimpleDatabase(str_path_dir_with_screenshots)
+        self._reconcile_with_disk(int_max_screenshot_num_on_disk)
+
+    def get_last_screenshot_num(self):
+        """Get number of the last created screenshot
+
+        Returns:
+            int: Number of the last screenshot
+        """
+        return self.LSD["int_last_screenshot_num"]
+
+    def increase_last_screenshot_num(self, int_step=1):
+        """Increase number of the last created screenshot
+
+        Args:
+            int_step (int, optional): How much to add to the number
+
+        Returns:
+            int: New number of the last screenshot
+        """
+        int_last_screenshot_num = \
+            self.LSD["int_last_screenshot_num"] + int_step
+        self.LSD["int_last_screenshot_num"] = int_last_screenshot_num
+        return int_last_screenshot_num
+
+    def get_screenshots_in_the_dir(self):
+        """Get number of the screenshots in the directory
+
+        Returns:
+            int: Number of the screenshots
+        """
+        return self.LSD["int_screenshots_in_the_dir"]
+
+    def set_screenshots_in_the_dir(self, int_screenshots):
+        """Set number of the screenshots in the directory
+
+        Args:
+            int_screenshots (int): Number of the screenshots
+        """
+        self.LSD["int_screenshots_in_the_dir"] = int_screenshots
+
+    def increase_screenshots_in_the_dir(self, int_step=1):
+        """Increase number of the screenshots in the directory
+
+        Args:
+            int_step (int, optional): How much to add to the number
+
+        Returns:
+            int: New number of the screenshots in the directory
+        """
+        int_screenshots = self.LSD["int_screenshots_in_the_dir"] + int_step
+        self.LSD["int_screenshots_in_the_dir"] = int_screenshots
+        return int_screenshots
+
+    def recount_screenshots_in_the_dir(self, func_count_screenshots):
+        """Set number of the screenshots in the directory to the counted one
+
+        Args:
+            func_count_screenshots (function): Function without arguments \
+                which counts screenshots in the directory
+
+        Returns:
+            int: Number of the screenshots in the directory
+        """
+        self.set_screenshots_in_the_dir(func_count_screenshots())
+        return self.get_screenshots_in_the_dir()
+
+    def flush(self):
+        """Save state of the counter, every change is already saved here
+        """
+
+    def close(self):
+        """Save state of the counter and stop using it
+        """
+        self.flush()
+
+    def _reconcile_with_disk(self, int_max_screenshot_num_on_disk):
+        """Don't let saved last number to be less than numbers on the disk
+
+        It can happen if a process crashed before the last number was saved.
+
+        Args:
+            int_max_screenshot_num_on_disk (int): Max number on the disk
+        """
+        if self.LSD["int_last_screenshot_num"] < \
+        int_max_screenshot_num_on_disk:
+            LOGGER.warning(
+                "Saved number of the last screenshot is behind the disk, "
+                "continue from: %d",
+                int_max_screenshot_num_on_disk
+            )
+            self.LSD["int_last_screenshot_num"] = \
+                int_max_screenshot_num_on_disk
+
+
+class MemoryScreenshotsCounter(LsdScreenshotsCounter):
+    """Counter which keeps its state in memory and saves it in batches
+
+    State is saved to the same LocalSimpleDatabase files as for
+    LsdScreenshotsCounter, so both counters can be used for one directory.
+    After a crash, last number is restored from the numbers on the disk.
+    """
+
+    def __init__(
+            self,
+            int_changes_to_persist=100,
+            float_seconds_to_persist=5.0,
+    ):
+        """Init counter, it starts working only after call of open(...)
+
+        Args:
+            int_changes_to_persist (int, optional): Save state after \
+                this number of the changes
+            float_seconds_to_persist (float, optional): Save state if \
+                this number of seconds has passed since the last save
+        """
+        super(MemoryScreenshotsCounter, self).__init__()
+        self.int_changes_to_persist = int_changes_to_persist
+        self.float_seconds_to_persist = float_seconds_to_persist
+        self._int_last_screenshot_num = 0
+        self._int_screenshots_in_the_dir = 0
+        self._int_changes_not_persisted = 0
+        self._float_last_persist_time = time.monotonic()
+
+    def open(
+            self,
+            str_path_dir_with_screenshots,
+            int_max_screenshot_num_on_disk=0,
+    ):
+        """Start counting screenshots in the given directory
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory with screenshots
+            int_max_screenshot_num_on_disk (int, optional): Max number of \
+                the screenshot which is already saved in the directory
+        """
+        super(MemoryScreenshotsCounter, self).open(
+            str_path_dir_with_screenshots,
+            int_max_screenshot_num_on_disk=int_max_screenshot_num_on_disk,
+        )
+        self._int_last_screenshot_num = self.LSD["int_last_screenshot_num"]
+        self._int_screenshots_in_the_dir = \
+            self.LSD["int_screenshots_in_the_dir"]
+        self._int_changes_not_persisted = 0
+        self._float_last_persist_time = time.monotonic()
+
+    def get_last_screenshot_num(self):
+        """Get number of the last created screenshot
+
+        Returns:
+            int: Number of the last screenshot
+        """
+        return self._int_last_screenshot_num
+
+    def increase_last_screenshot_num(self, int_step=1):
+        """Increase number of the last created screenshot
+
+        Args:
+            int_step (int, optional): How much to add to the number
+
+        Returns:
+            int: New number of the last screenshot
+        """
+        self._int_last_screenshot_num += int_step
+        self._register_change()
+        return self._int_last_screenshot_num
+
+    def get_screenshots_in_the_dir(self):
+        """Get number of the screenshots in the directory
+
+        Returns:
+            int: Number of the screenshots
+        """
+        return self._int_screenshots_in_the_dir
+
+    def set_screenshots_in_the_dir(self, int_screenshots):
+        """Set number of the screenshots in the directory
+
+        Args:
+            int_screenshots (int): Number of the screenshots
+        """
+        self._int_screenshots_in_the_dir = int_screenshots
+        self._register_change()
+
+    def increase_screenshots_in_the_dir(self, int_step=1):
+        """Increase number of the screenshots in the directory
+
+        Args:
+            int_step (int, optional): How much to add to the number
+
+        Returns:
+            int: New number of the screenshots in the directory
+        """
+        self._int_screenshots_in_the_dir += int_step
+        self._register_change()
+        return self._int_screenshots_in_the_dir
+
+    def flush(self):
+        """Save state of the counter to LocalSimpleDatabase
+        """
+        if self.LSD is None or not self._int_changes_not_persisted:
+            return None
+        self.LSD["int_last_screenshot_num"] = self._int_last_screenshot_num
+        self.LSD["int_screenshots_in_the_dir"] = \
+            self._int_screenshots_in_the_dir
+        self._int_changes_not_persisted = 0
+        self._float_last_persist_time = time.monotonic()
+        return None
+
+    def _register_change(self):
+        """Save state of the counter if it's time to do so
+        """
+        self._int_changes_not_persisted += 1
+        if self._int_changes_not_persisted >= self.int_changes_to_persist:
+            self.flush()
+        elif time.monotonic() - self._float_last_persist_time >= \
+        self.float_seconds_to_persist:
+            self.flush()
+
+
+class ProcessSafeScreenshotsCounter(LsdScreenshotsCounter):
+    """Counter which can be shared by many processes using one directory
+
+    Every process reserves numbers in blocks under the interprocess lock,
+    so processes don't wait for each other on every screenshot.
+    Numbers are unique, but screenshots made by different processes are not
+    ordered by the time of creation.
+    Changes of the number of screenshots in the dir are saved when a new
+    block is reserved and on flush(). Other processes may have changes
+    which are not saved yet, so number of the screenshots is recounted
+    only if no other process uses the directory, otherwise it's changed
+    only by the changes of every process.
+    """
+
+    STR_LOCK_FILENAME = ".screenshots_counter.lock"
+    # Every open counter holds a shared lock of this file
+    STR_USERS_FILENAME = ".screenshots_counter.users"
+    is_shared_between_processes = True
+
+    def __init__(self, int_block_size=100):
+        """Init counter, it starts working only after call of open(...)
+
+        Args:
+            int_block_size (int, optional): How many numbers to reserve \
+                for this process at once
+        """
+        super(ProcessSafeScreenshotsCounter, self).__init__()
+        self.int_block_size = int_block_size
+        self._lock = None
+        self._int_last_screenshot_num = 0
+        self._int_last_reserved_screenshot_num = 0
+        self._int_screenshots_in_the_dir = 0
+        self._int_screenshots_added_not_persisted = 0
+        self._int_users_fd = None
+
+    def open(
+            self,
+            str_path_dir_with_screenshots,
+            int_max_screenshot_num_on_disk=0,
+    ):
+        """Start counting screenshots in the given directory
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory with screenshots
+            int_max_screenshot_num_on_disk (int, optional): Max number of \
+                the screenshot which is already saved in the directory
+        """
+        # Imported here, so it's not loaded till a handler is created
+        from local_simple_database import LocalSimpleDatabase
+        self.str_path_dir_with_screenshots = str_path_dir_with_screenshots
+        self.LSD = LocalSimpleDatabase(str_path_dir_with_screenshots)
+        self._lock = InterprocessLock(os.path.join(
+            str_path_dir_with_screenshots, self.STR_LOCK_FILENAME))
+        if fcntl is not None:
+            self._int_users_fd = os.open(
+                os.path.join(
+                    str_path_dir_with_screenshots, self.STR_USERS_FILENAME),
+                os.O_RDWR | os.O_CREAT
+            )
+            fcntl.flock(self._int_users_fd, fcntl.LOCK_SH)
+        with self._lock:
+            self._reconcile_with_disk(int_max_screenshot_num_on_disk)
+            self._int_last_screenshot_num = \
+                self.LSD["int_last_screenshot_num"]
+            self._int_last_reserved_screenshot_num = \
+                self._int_last_screenshot_num
+            self._int_screenshots_in_the_dir = \
+                self.LSD["int_screenshots_in_the_dir"]
+            self._int_screenshots_added_not_persisted = 0
+
+    def get_last_screenshot_num(self):
+        """Get number of the last screenshot created by this process
+
+        Returns:
+            int: Number of the last screenshot
+        """
+        return self._int_last_screenshot_num
+
+    def increase_last_screenshot_num(self, int_step=1):
+        """Take next numbers from the reserved block, reserve new if needed
+
+        Args:
+            int_step (int, optional): How many numbers to take
+
+        Returns:
+            int: New number of the last screenshot
+        """
+        if self._int_last_screenshot_num + int_step > \
+        self._int_last_reserved_screenshot_num:
+            self._reserve_block_of_numbers(int_step)
+        self._int_last_screenshot_num += int_step
+        return self._int_last_screenshot_num
+
+    def get_screenshots_in_the_dir(self):
+        """Get number of the screenshots in the directory
+
+        Returns:
+            int: Number of the screenshots
+        """
+        return (
+            self._int_screenshots_in_the_dir +
+            self._int_screenshots_added_not_persisted
+        )
+
+    def set_screenshots_in_the_dir(self, int_screenshots):
+        """Set number of the screenshots in the directory
+
+        Args:
+            int_screenshots (int): Number of the screenshots
+        """
+        with self._lock:
+            self.LSD["int_screenshots_in_the_dir"] = int_screenshots
+            self._int_screenshots_in_the_dir = int_screenshots
+            self._int_screenshots_added_not_persisted = 0
+
+    def increase_screenshots_in_the_dir(self, int_step=1):
+        """Increase number of the screenshots in the directory
+
+        Args:
+            int_step (int, optional): How much to add to the number
+
+        Returns:
+            int: New number of the screenshots in the directory
+        """
+        self._int_screenshots_added_not_persisted += int_step
+        return self.get_screenshots_in_the_dir()
+
+    def recount_screenshots_in_the_dir(self, func_count_screenshots):
+        """Recount screenshots if no other process uses the directory
+
+        Screenshots are counted while holding the lock of the counter.
+
+        Args:
+            func_count_screenshots (function): Function without arguments \
+                which counts screenshots in the directory
+
+        Returns:
+            int: Number of the screenshots in the directory
+        """
+        with self._lock:
+            self._persist_screenshots_in_the_dir()
+            if self._is_the_only_user():
+                int_screenshots = func_count_screenshots()
+                self.LSD["int_screenshots_in_the_dir"] = int_screenshots
+                self._int_screenshots_in_the_dir = int_screenshots
+            else:
+                LOGGER.debug(
+                    "Directory is used by other processes, "
+                    "screenshots aren't recounted"
+                )
+        return self._int_screenshots_in_the_dir
+
+    def flush(self):
+        """Save changes of the number of screenshots in the dir
+        """
+        if self._lock is None or \
+        not self._int_screenshots_added_not_persisted:
+            return None
+        with self._lock:
+            self._persist_screenshots_in_the_dir()
+        return None
+
+    def close(self):
+        """Save changes and stop using the directory
+        """
+        self.flush()
+        if self._int_users_fd is not None:
+            # Closing of the file releases its lock
+            os.close(self._int_users_fd)
+            self._int_users_fd = None
+
+    def _is_the_only_user(self):
+        """Check if no other counter uses the directory, caller holds the lock
+
+        Returns:
+            bool: True if only this counter uses the directory
+        """
+        if self._int_users_fd is None:
+            return False
+        # Other counters check the users only under the same lock
+        fcntl.flock(self._int_users_fd, fcntl.LOCK_UN)
+        try:
+            fcntl.flock(self._int_users_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            is_the_only_user = True
+        except OSError:
+            is_the_only_user = False
+        fcntl.flock(self._int_users_fd, fcntl.LOCK_SH)
+        return is_the_only_user
+
+    def _reserve_block_of_numbers(self, int_min_size):
+        """Reserve next block of numbers for this process
+
+        Args:
+            int_min_size (int): Min number of numbers to reserve
+        """
+        int_block_size = max(self.int_block_size, int_min_size)
+        with self._lock:
+            int_last_screenshot_num = self.LSD["int_last_screenshot_num"]
+            self.LSD["int_last_screenshot_num"] = \
+                int_last_screenshot_num + int_block_size
+            self._persist_screenshots_in_the_dir()
+        LOGGER.debug(
+            "Reserved numbers for screenshots: %d - %d",
+            int_last_screenshot_num + 1,
+            int_last_screenshot_num + int_block_size
+        )
+        self._int_last_screenshot_num = int_last_screenshot_num
+        self._int_last_reserved_screenshot_num = \
+            int_last_screenshot_num + int_block_size
+
+    def _persist_screenshots_in_the_dir(self):
+        """Add local changes to the saved number, caller holds the lock
+        """
+        int_screenshots = \
+            self.LSD["int_screenshots_in_the_dir"] + \
+            self._int_screenshots_added_not_persisted
+        self.LSD["int_screenshots_in_the_dir"] = int_screenshots
+        self._int_screenshots_in_the_dir = int_screenshots
+        self._int_screenshots_added_not_persisted = 0
@@ -0,0 +1,393 @@
+"""File with the engine which deletes many screenshots fast"""
+# Standard library imports
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .class_background_writer import BackgroundWriter
+from .class_interprocess_lock import InterprocessLock
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+IS_DIR_FD_SUPPORTED = os.unlink in os.supports_dir_fd
+STR_TRASH_DIR_PREFIX = ".screenshots_trash_"
+# Lock file "<trash dir>.lock" is held by the process deleting the trash
+STR_TRASH_LOCK_EXTENSION = ".lock"
+# Without fcntl lock of the trash is considered stale only after it
+FLOAT_SECONDS_TO_CONSIDER_TRASH_LOCK_STALE = 3600.0
+
+
+class DeletionEngine(object):
+    """Engine which deletes many files in batches in a pool of threads
+
+    Files are unlinked relative to the descriptor of their directory
+    without checking if they exist first, so on network filesystems
+    deletion of every file is only one round trip and many of them
+    are in flight at the same time.
+    """
+
+    def __init__(self, int_threads=8, int_files_per_batch=256):
+        """Init engine, threads are started only for big deletions
+
+        Args:
+            int_threads (int, optional): Number of the threads which \
+                delete files
+            int_files_per_batch (int, optional): Number of the files \
+                deleted by one thread job
+
+        Raises:
+            SeleniumScreenshotsError: Wrong number of threads or batch size
+        """
+        if int_threads < 1:
+            raise SeleniumScreenshotsError(
+                "Number of the deletion threads should be positive")
+        if int_files_per_batch < 1:
+            raise SeleniumScreenshotsError(
+                "Number of the files per batch should be positive")
+        self.int_threads = int_threads
+        self.int_files_per_batch = int_files_per_batch
+        self.int_files_deleted = 0
+        self.float_seconds_spent = 0.0
+        self._lock = threading.Lock()
+        self._background_deleter = None
+
+    def delete_files(self, str_path_dir, list_files_names):
+        """Delete files in the directory, missing files are skipped
+
+        Args:
+            str_path_dir (str): Directory with the files
+            list_files_names (list): Names of the files relative to the \
+                directory, E.G. "<shard>/<name>"
+
+        Returns:
+            int: Number of the deleted files
+        """
+        float_start_time = time.monotonic()
+        list_tuples_dir_and_batch = self._split_files_in_batches(
+            str_path_dir, list_files_names)
+        if len(list_tuples_dir_and_batch) == 1:
+            int_files_deleted = \
+                self._delete_batch_of_files(*list_tuples_dir_and_batch[0])
+        else:
+            int_files_deleted = self._run_batches(
+                self._delete_batch_of_files,
+                list_tuples_dir_and_batch,
+                len(list_files_names)
+            )
+        self._add_to_stats(
+            int_files_deleted, time.monotonic() - float_start_time)
+        return int_files_deleted
+
+    def delete_in_background(self, str_path_dir, list_names):
+        """Move files and directories to trash and delete it in background
+
+        After the call the files are not in the directory anymore, as they
+        are only renamed, but the space is freed later.
+        Every name is renamed separately, so it's fast only for
+        directories (E.G. shards), moving of a file costs as much
+        as its unlinking.
+
+        Args:
+            str_path_dir (str): Directory with the files
+            list_names (list): Names of the files or directories \
+                relative to the directory, E.G. shards of the screenshots
+
+        Returns:
+            concurrent.futures.Future: Future which is done after deletion
+        """
+        str_path_trash_dir = os.path.join(
+            str_path_dir, STR_TRASH_DIR_PREFIX + uuid.uuid4().hex)
+        trash_lock = get_trash_lock(str_path_trash_dir)
+        trash_lock.acquire()
+        try:
+            os.mkdir(str_path_trash_dir)
+            int_batch = self.int_files_per_batch
+            list_tuples_dir_and_batch = [
+                (str_path_dir, list_names[int_start:int_start + int_batch])
+                for int_start in range(0, len(list_names), int_batch)
+            ]
+            self._run_batches(
+                lambda str_path_dir, list_batch: self._move_batch_to_trash(
+                    str_path_dir, list_batch, str_path_trash_dir),
+                list_tuples_dir_and_batch,
+                len(list_names)
+            )
+        except Exception:
+            # Files already moved to the trash are deleted on next start
+            trash_lock.release(is_to_remove_lock_file=True)
+            raise
+        return self._get_background_deleter().submit(
+            self._delete_trash_dir, str_path_trash_dir, trash_lock)
+
+    def delete_orphaned_trash(self, str_path_dir):
+        """Delete in background trash directories left after a crash
+
+        Trash which lock is held is still deleted by its process,
+        so it's skipped.
+
+        Args:
+            str_path_dir (str): Directory with the screenshots
+
+        Returns:
+            int: Number of the orphaned trash directories
+        """
+        with os.scandir(str_path_dir) as iter_entries:
+            list_paths_trash_dirs = [
+                dir_entry.path for dir_entry in iter_entries
+                if dir_entry.name.startswith(STR_TRASH_DIR_PREFIX) and
+                dir_entry.is_dir(follow_symlinks=False)
+            ]
+        int_orphaned_trash_dirs = 0
+        for str_path_trash_dir in list_paths_trash_dirs:
+            trash_lock = get_trash_lock(str_path_trash_dir)
+            if not trash_lock.acquire(is_blocking=False):
+                LOGGER.debug(
+                    "Trash is deleted by another process: %s",
+                    str_path_trash_dir
+                )
+                continue
+            self._get_background_deleter().submit(
+                self._delete_trash_dir, str_path_trash_dir, trash_lock)
+            int_orphaned_trash_dirs += 1
+        if int_orphaned_trash_dirs:
+            LOGGER.info(
+                "Delete orphaned trash directories: %d",
+                int_orphaned_trash_dirs
+            )
+        return int_orphaned_trash_dirs
+
+    def get_files_per_second(self):
+        """Get average speed of the deletion by this engine
+
+        Returns:
+            float: Number of the deleted files per second
+        """
+        with self._lock:
+            if not self.float_seconds_spent:
+                return 0.0
+            return self.int_files_deleted / self.float_seconds_spent
+
+    def flush(self, float_timeout=None):
+        """Wait till deletion in the background is finished
+
+        Args:
+            float_timeout (float, optional): Max seconds to wait
+
+        Returns:
+            bool: True if there is nothing left to delete in the background
+        """
+        if self._background_deleter is None:
+            return True
+        return self._background_deleter.flush(float_timeout=float_timeout)
+
+    def close(self):
+        """Finish deletion in the background and stop the thread
+        """
+        if self._background_deleter is not None:
+            self._background_deleter.close()
+
+    def _get_background_deleter(self):
+        """Get thread which deletes trash, start it on the first use
+
+        Returns:
+            BackgroundWriter: Background deleter
+        """
+        with self._lock:
+            if self._background_deleter is None:
+                self._background_deleter = BackgroundWriter(int_threads=1)
+            return self._background_deleter
+
+    def _split_files_in_batches(self, str_path_dir, list_files_names):
+        """Group files by their directories and split them in batches
+
+        Args:
+            str_path_dir (str): Directory with the files
+            list_files_names (list): Names of the files relative to it
+
+        Returns:
+            list: Tuples like (path to directory, list of files names)
+        """
+        dict_files_by_dir = {}
+        for str_file_name in list_files_names:
+            str_sub_dir, _, str_basename = str_file_name.rpartition("/")
+            dict_files_by_dir.setdefault(str_sub_dir, []).append(str_basename)
+        int_batch = self.int_files_per_batch
+        list_tuples_dir_and_batch = []
+        for str_sub_dir, list_dir_files in dict_files_by_dir.items():
+            str_path_sub_dir = os.path.join(str_path_dir, str_sub_dir)
+            for int_start in range(0, len(list_dir_files), int_batch):
+                list_tuples_dir_and_batch.append((
+                    str_path_sub_dir,
+                    list_dir_files[int_start:int_start + int_batch]
+                ))
+        return list_tuples_dir_and_batch or [(str_path_dir, [])]
+
+    def _run_batches(self, func_batch, list_tuples_dir_and_batch, int_files):
+        """Run function for every batch in the pool of threads
+
+        Args:
+            func_batch (callable): Function(path to dir, list of names)
+            list_tuples_dir_and_batch (list): Tuples like \
+                (path to directory, list of names)
+            int_files (int): Total number of the files in all batches
+
+        Returns:
+            int: Sum of the results of the function
+        """
+        int_result = 0
+        progress_bar = None
+        if int_files > 1000:
+            # Imported only when a big deletion really starts
+            from tqdm import tqdm
+            progress_bar = tqdm(total=int_files)
+        with ThreadPoolExecutor(
+                max_workers=max(
+                    1, min(self.int_threads, len(list_tuples_dir_and_batch))),
+                thread_name_prefix="selenium_screenshots_deleter",
+        ) as executor:
+            list_futures = [
+                executor.submit(func_batch, str_path_dir, list_batch)
+                for str_path_dir, list_batch in list_tuples_dir_and_batch
+            ]
+            for future, (_, list_batch) in zip(
+                    list_futures, list_tuples_dir_and_batch):
+                int_result += future.result()
+                if progress_bar is not None:
+                    progress_bar.update(len(list_batch))
+        if progress_bar is not None:
+            progress_bar.close()
+        return int_result
+
+    @staticmethod
+    def _delete_batch_of_files(str_path_dir, list_files_names):
+        """Delete files in one directory
+
+        Args:
+            str_path_dir (str): Directory with the files
+            list_files_names (list): Names of the files in the directory
+
+        Returns:
+            int: Number of the deleted files
+        """
+        int_dir_fd = None
+        if IS_DIR_FD_SUPPORTED:
+            try:
+                int_dir_fd = os.open(
+                    str_path_dir,
+                    os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+                )
+            except FileNotFoundError:
+                return 0
+        int_files_deleted = 0
+        try:
+            for str_file_name in list_files_names:
+                try:
+                    if int_dir_fd is None:
+                        os.unlink(os.path.join(str_path_dir, str_file_name))
+                    else:
+                        os.unlink(str_file_name, dir_fd=int_dir_fd)
+                    int_files_deleted += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as ex:
+                    LOGGER.warning(
+                        "Unable to delete screenshot: %s\n%s",
+                        os.path.join(str_path_dir, str_file_name), ex)
+        finally:
+            if int_dir_fd is not None:
+                os.close(int_dir_fd)
+        return int_files_deleted
+
+    @staticmethod
+    def _move_batch_to_trash(str_path_dir, list_names, str_path_trash_dir):
+        """Move files or directories to the trash directory
+
+        Args:
+            str_path_dir (str): Directory with the files
+            list_names (list): Names relative to the directory
+            str_path_trash_dir (str): Path to the trash directory
+
+        Returns:
+            int: Number of the moved files or directories
+        """
+        int_moved = 0
+        for str_name in list_names:
+            try:
+                os.rename(
+                    os.path.join(str_path_dir, str_name),
+                    os.path.join(
+                        str_path_trash_dir, str_name.replace("/", "_"))
+                )
+                int_moved += 1
+            except FileNotFoundError:
+                pass
+            except OSError as ex:
+                LOGGER.warning(
+                    "Unable to move to trash: %s\n%s", str_name, ex)
+        return int_moved
+
+    def _delete_trash_dir(self, str_path_trash_dir, trash_lock):
+        """Delete trash directory with everything in it
+
+        Args:
+            str_path_trash_dir (str): Path to the trash directory
+            trash_lock (InterprocessLock): Acquired lock of the trash, \
+                it's released and removed after deletion
+
+        Returns:
+            int: Number of the deleted files
+        """
+        float_start_time = time.monotonic()
+        try:
+            int_files_deleted = sum(
+                len(list_files_names)
+                for _, _, list_files_names in os.walk(str_path_trash_dir)
+            )
+            shutil.rmtree(str_path_trash_dir, ignore_errors=True)
+        finally:
+            trash_lock.release(is_to_remove_lock_file=True)
+        self._add_to_stats(
+            int_files_deleted, time.monotonic() - float_start_time)
+        return int_files_deleted
+
+    def _add_to_stats(self, int_files_deleted, float_seconds):
+        """Add finished deletion to the throughput statistics
+
+        Args:
+            int_files_deleted (int): Number of the deleted files
+            float_seconds (float): Seconds spent on deletion
+        """
+        with self._lock:
+            self.int_files_deleted += int_files_deleted
+            self.float_seconds_spent += float_seconds
+        if int_files_deleted > 1000:
+            LOGGER.info(
+                "Deleted files: %d in %.2f seconds (%.0f files per second)",
+                int_files_deleted,
+                float_seconds,
+                int_files_deleted / max(float_seconds, 1e-9)
+            )
+
+
+def get_trash_lock(str_path_trash_dir):
+    """Get lock held by the process which deletes the trash directory
+
+    Args:
+        str_path_trash_dir (str): Path to the trash directory
+
+    Returns:
+        InterprocessLock: Not acquired lock
+    """
+    return InterprocessLock(
+        str_path_trash_dir + STR_TRASH_LOCK_EXTENSION,
+        float_seconds_to_consider_stale=\
+            FLOAT_SECONDS_TO_CONSIDER_TRASH_LOCK_STALE,
+    )
@@ -0,0 +1,273 @@
+"""File with the storage which saves only changed tiles of the screenshots
+
+Every N-th screenshot (or one which changed too much) is a keyframe
+and is saved as a usual PNG. Other screenshots are saved as files
+"<number>_<description>.delta.npz" with only the tiles which differ
+from the last keyframe, so any of them needs only its keyframe
+to be restored.
+"""
+# Standard library imports
+import io
+import logging
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import STR_DELTA_EXTENSION
+from .func_perceptual_hash import import_numpy_and_pillow
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+# Modes which can be restored from RGBA without loss, others stay RGBA
+TUPLE_MODES_TO_RESTORE = ("RGBA", "RGB", "LA", "L")
+
+
+class DeltaStorage(object):
+    """Storage which compares every screenshot with the last keyframe
+
+    Screenshots are compared tile by tile with numpy,
+    only changed tiles are saved to the delta file.
+    """
+
+    str_extension = STR_DELTA_EXTENSION
+
+    def __init__(
+            self,
+            int_tile_size=32,
+            int_keyframe_interval=50,
+            float_max_changed_part=0.5,
+    ):
+        """Init storage, numpy and Pillow are needed to use it
+
+        Args:
+            int_tile_size (int, optional): Side of the compared tiles \
+                in pixels
+            int_keyframe_interval (int, optional): Every N-th screenshot \
+                is saved as a keyframe
+            float_max_changed_part (float, optional): If bigger part of \
+                the tiles is changed then screenshot is saved as a keyframe
+
+        Raises:
+            SeleniumScreenshotsError: Wrong settings of the storage
+        """
+        import_numpy_and_pillow()
+        if int_tile_size < 1 or int_keyframe_interval < 1:
+            raise SeleniumScreenshotsError(
+                "Tile size and keyframe interval should be positive")
+        if not 0.0 <= float_max_changed_part <= 1.0:
+            raise SeleniumScreenshotsError(
+                "Max changed part should be between 0.0 and 1.0")
+        self.int_tile_size = int_tile_size
+        self.int_keyframe_interval = int_keyframe_interval
+        self.float_max_changed_part = float_max_changed_part
+        self.int_keyframe_num = None
+        self._array_keyframe = None
+        self._tuple_keyframe_size = None
+        self._int_screenshots_since_keyframe = 0
+
+    def encode(self, bytes_png, int_screenshot_num):
+        """Get content to save for the screenshot, keyframe or delta
+
+        Screenshots should be encoded in order of their numbers.
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            tuple: (content of the file, extension of the file), \
+                extension is ".png" for keyframes
+        """
+        numpy, _ = import_numpy_and_pillow()
+        array_image, str_mode, tuple_size = get_padded_rgba_array(
+            bytes_png, self.int_tile_size)
+        if self._is_keyframe_needed(tuple_size):
+            return self._set_keyframe(
+                bytes_png, array_image, tuple_size, int_screenshot_num)
+        array_tiles = get_tiles_view(array_image, self.int_tile_size)
+        # Compare all tiles at once: (rows, columns) of changed flags
+        array_is_tile_changed = (
+            array_tiles !=
+            get_tiles_view(self._array_keyframe, self.int_tile_size)
+        ).any(axis=(2, 3, 4))
+        if array_is_tile_changed.mean() > self.float_max_changed_part:
+            return self._set_keyframe(
+                bytes_png, array_image, tuple_size, int_screenshot_num)
+        self._int_screenshots_since_keyframe += 1
+        bytes_io = io.BytesIO()
+        numpy.savez_compressed(
+            bytes_io,
+            # keyframe number, height, width, tile size, index of the mode
+            header=numpy.array(
+                (
+                    self.int_keyframe_num,
+                    tuple_size[0],
+                    tuple_size[1],
+                    self.int_tile_size,
+                    get_mode_index(str_mode),
+                ),
+                dtype=numpy.int64
+            ),
+            positions=numpy.argwhere(array_is_tile_changed).astype(
+                numpy.int32),
+            tiles=array_tiles[array_is_tile_changed],
+        )
+        LOGGER.debug(
+            "Changed tiles: %d of %d",
+            int(array_is_tile_changed.sum()), array_is_tile_changed.size
+        )
+        return bytes_io.getvalue(), self.str_extension
+
+    def reset(self):
+        """Forget the keyframe, so the next screenshot is a keyframe
+        """
+        self.int_keyframe_num = None
+        self._array_keyframe = None
+        self._tuple_keyframe_size = None
+        self._int_screenshots_since_keyframe = 0
+
+    def _is_keyframe_needed(self, tuple_size):
+        """Check if screenshot should be saved as keyframe before comparing
+
+        Args:
+            tuple_size (tuple): (height, width) of the screenshot
+
+        Returns:
+            bool: True if screenshot should be a keyframe
+        """
+        return \
+            self._array_keyframe is None or \
+            self._tuple_keyframe_size != tuple_size or \
+            self._int_screenshots_since_keyframe + 1 >= \
+            self.int_keyframe_interval
+
+    def _set_keyframe(
+            self,
+            bytes_png,
+            array_image,
+            tuple_size,
+            int_screenshot_num,
+    ):
+        """Remember screenshot as a new keyframe
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            array_image (numpy.ndarray): Padded RGBA screenshot
+            tuple_size (tuple): (height, width) of the screenshot
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            tuple: (content of the file, extension of the file)
+        """
+        self._tuple_keyframe_size = tuple_size
+        self.int_keyframe_num = int_screenshot_num
+        self._array_keyframe = array_image
+        self._int_screenshots_since_keyframe = 0
+        return bytes_png, ".png"
+
+
+def get_padded_rgba_array(bytes_png, int_tile_size):
+    """Decode image to RGBA array with sides padded to the tile size
+
+    Args:
+        bytes_png (bytes): PNG content of the image
+        int_tile_size (int): Side of the tiles
+
+    Returns:
+        tuple: (padded numpy.ndarray with shape (height, width, 4), \
+            mode of the image, (height, width) of the image)
+    """
+    numpy, Image = import_numpy_and_pillow()
+    with Image.open(io.BytesIO(bytes_png)) as image:
+        str_mode = image.mode
+        array_image = numpy.asarray(image.convert("RGBA"))
+    int_height, int_width = array_image.shape[:2]
+    return numpy.pad(
+        array_image,
+        (
+            (0, -int_height % int_tile_size),
+            (0, -int_width % int_tile_size),
+            (0, 0),
+        ),
+    ), str_mode, (int_height, int_width)
+
+
+def get_mode_index(str_mode):
+    """Get index of the image mode to save it in the delta file
+
+    Args:
+        str_mode (str): Mode of the image, E.G. "RGB"
+
+    Returns:
+        int: Index in TUPLE_MODES_TO_RESTORE, 0 (RGBA) for other modes
+    """
+    if str_mode in TUPLE_MODES_TO_RESTORE:
+        return TUPLE_MODES_TO_RESTORE.index(str_mode)
+    return 0
+
+
+def get_tiles_view(array_image, int_tile_size):
+    """Get view of the image as a grid of tiles without copying
+
+    Args:
+        array_image (numpy.ndarray): Padded image (height, width, channels)
+        int_tile_size (int): Side of the tiles
+
+    Returns:
+        numpy.ndarray: Array (rows, columns, tile, tile, channels)
+    """
+    int_height, int_width, int_channels = array_image.shape
+    return array_image.reshape(
+        int_height // int_tile_size, int_tile_size,
+        int_width // int_tile_size, int_tile_size,
+        int_channels,
+    ).swapaxes(1, 2)
+
+
+def get_keyframe_num_of_delta(bytes_delta):
+    """Get number of the keyframe needed to restore screenshot
+
+    Args:
+        bytes_delta (bytes): Content of the delta file
+
+    Returns:
+        int: Number of the keyframe screenshot
+    """
+    numpy, _ = import_numpy_and_pillow()
+    with numpy.load(io.BytesIO(bytes_delta), allow_pickle=False) as npz:
+        return int(npz["header"][0])
+
+
+def materialize_delta(bytes_keyframe_png, bytes_delta):
+    """Restore full screenshot from its keyframe and delta
+
+    Args:
+        bytes_keyframe_png (bytes): PNG content of the keyframe
+        bytes_delta (bytes): Content of the delta file
+
+    Raises:
+        SeleniumScreenshotsError: Keyframe doesn't match the delta
+
+    Returns:
+        bytes: PNG content of the screenshot
+    """
+    numpy, Image = import_numpy_and_pillow()
+    with numpy.load(io.BytesIO(bytes_delta), allow_pickle=False) as npz:
+        _, int_height, int_width, int_tile_size, int_mode_index = \
+            (int(x) for x in npz["header"])
+        array_positions = npz["positions"]
+        array_tiles = npz["tiles"]
+    array_image, _, tuple_keyframe_size = \
+        get_padded_rgba_array(bytes_keyframe_png, int_tile_size)
+    if tuple_keyframe_size != (int_height, int_width):
+        raise SeleniumScreenshotsError(
+            "Keyframe has another size than the screenshot")
+    get_tiles_view(array_image, int_tile_size)[
+        array_positions[:, 0], array_positions[:, 1]] = array_tiles
+    image = Image.fromarray(
+        array_image[:int_height, :int_width], "RGBA"
+    ).convert(TUPLE_MODES_TO_RESTORE[int_mode_index])
+    bytes_io = io.BytesIO()
+    image.save(bytes_io, format="PNG")
+    return bytes_io.getvalue()
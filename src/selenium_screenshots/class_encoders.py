@@ -0,0 +1,135 @@
+"""File with encoders which convert screenshots before saving them"""
+# Standard library imports
+import io
+import logging
+
+# Third party imports
+
+# Local imports
+from .additional import import_optional_module
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class PngEncoder(object):
+    """Encoder which re-compresses PNG from the webdriver
+
+    All encoders can be pickled, so they can be run in a process pool.
+    To create your own encoder override str_extension and _save_image(...).
+    """
+
+    str_extension = ".png"
+
+    def __init__(self, int_compress_level=9, float_scale=1.0):
+        """Init encoder, Pillow is needed to use it
+
+        Args:
+            int_compress_level (int, optional): zlib compression level 0-9
+            float_scale (float, optional): Scale of the saved image, \
+                E.G. 0.5 to save image two times smaller
+        """
+        import_optional_module("PIL.Image")
+        self.int_compress_level = int_compress_level
+        self.float_scale = float_scale
+
+    def encode(self, bytes_png):
+        """Convert PNG content from the webdriver to the format to save
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+
+        Returns:
+            bytes: Content of the screenshot file to save
+        """
+        Image = import_optional_module("PIL.Image")
+        with Image.open(io.BytesIO(bytes_png)) as image:
+            image.load()
+            if self.float_scale != 1.0:
+                image = image.resize(
+                    (
+                        max(1, int(image.width * self.float_scale)),
+                        max(1, int(image.height * self.float_scale)),
+                    ),
+                    Image.LANCZOS
+                )
+            bytes_io = io.BytesIO()
+            self._save_image(image, bytes_io)
+        return bytes_io.getvalue()
+
+    def _save_image(self, image, bytes_io):
+        """Save image in the format of this encoder
+
+        Args:
+            image (PIL.Image.Image): Image to save
+            bytes_io (io.BytesIO): Where to save the image
+        """
+        image.save(
+            bytes_io,
+            format="PNG",
+            compress_level=self.int_compress_level,
+        )
+
+
+class JpegEncoder(PngEncoder):
+    """Encoder which saves screenshots as JPEG"""
+
+    str_extension = ".jpg"
+
+    def __init__(self, int_quality=85, float_scale=1.0):
+        """Init encoder, Pillow is needed to use it
+
+        Args:
+            int_quality (int, optional): JPEG quality 1-95
+            float_scale (float, optional): Scale of the saved image, \
+                E.G. 0.5 to save image two times smaller
+        """
+        super(JpegEncoder, self).__init__(float_scale=float_scale)
+        self.int_quality = int_quality
+
+    def _save_image(self, image, bytes_io):
+        """Save image as JPEG, transparency is dropped
+
+        Args:
+            image (PIL.Image.Image): Image to save
+            bytes_io (io.BytesIO): Where to save the image
+        """
+        image.convert("RGB").save(
+            bytes_io,
+            format="JPEG",
+            quality=self.int_quality,
+        )
+
+
+class WebpEncoder(PngEncoder):
+    """Encoder which saves screenshots as WebP"""
+
+    str_extension = ".webp"
+
+    def __init__(self, is_lossless=True, int_quality=80, float_scale=1.0):
+        """Init encoder, Pillow is needed to use it
+
+        Args:
+            is_lossless (bool, optional): Flag if to use lossless WebP
+            int_quality (int, optional): Quality 0-100, for lossless WebP \
+                it's how much effort to spend on compression
+            float_scale (float, optional): Scale of the saved image, \
+                E.G. 0.5 to save image two times smaller
+        """
+        super(WebpEncoder, self).__init__(float_scale=float_scale)
+        self.is_lossless = is_lossless
+        self.int_quality = int_quality
+
+    def _save_image(self, image, bytes_io):
+        """Save image as WebP
+
+        Args:
+            image (PIL.Image.Image): Image to save
+            bytes_io (io.BytesIO): Where to save the image
+        """
+        image.save(
+            bytes_io,
+            format="WEBP",
+            lossless=self.is_lossless,
+            quality=self.int_quality,
+        )
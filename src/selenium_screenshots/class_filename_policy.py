@@ -0,0 +1,121 @@
+"""File with the policy which makes filenames from descriptions"""
+# Standard library imports
+import re
+import logging
+import functools
+import unicodedata
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+# Dots separate extension and slashes separate shards, so they are forbidden
+STR_NEVER_ALLOWED_CHARACTERS = "./\\\x00"
+TUPLE_UNICODE_NORMALIZATIONS = ("", "NFC", "NFKC", "NFD", "NFKD")
+
+
+class FilenamePolicy(object):
+    """Policy which replaces forbidden characters in the screenshots names
+
+    Letters, digits and "_" are always allowed. Sanitized descriptions
+    are cached, as the same descriptions are used again and again.
+    """
+
+    def __init__(
+            self,
+            str_allowed_characters="",
+            str_replacement="_",
+            str_unicode_normalization="",
+            is_ascii_only=False,
+            is_to_limit_bytes=False,
+            int_cache_size=1024,
+    ):
+        """Init policy, by default every not alphanumeric char becomes "_"
+
+        Args:
+            str_allowed_characters (str, optional): Other characters to \
+                keep, E.G. "-+". Dots and slashes can't be allowed.
+            str_replacement (str, optional): Replacement of the \
+                forbidden characters
+            str_unicode_normalization (str, optional): Unicode \
+                normalization to apply first: "NFC", "NFKC", "NFD", "NFKD"
+            is_ascii_only (bool, optional): Flag if to replace not ASCII \
+                letters and digits too
+            is_to_limit_bytes (bool, optional): Flag if max length of the \
+                filename is in bytes of UTF-8 rather than in characters. \
+                Most filesystems limit names to 255 bytes.
+            int_cache_size (int, optional): Number of the sanitized \
+                descriptions to remember
+
+        Raises:
+            SeleniumScreenshotsError: Wrong settings of the policy
+        """
+        for str_char in str_allowed_characters + str_replacement:
+            if str_char in STR_NEVER_ALLOWED_CHARACTERS:
+                raise SeleniumScreenshotsError(
+                    "Character can't be used in screenshots names: %r" %
+                    str_char
+                )
+        if str_unicode_normalization not in TUPLE_UNICODE_NORMALIZATIONS:
+            raise SeleniumScreenshotsError(
+                "Unknown unicode normalization: %s, allowed: %s" % (
+                    str_unicode_normalization, TUPLE_UNICODE_NORMALIZATIONS))
+        self.str_allowed_characters = str_allowed_characters
+        self.str_replacement = str_replacement
+        self.str_unicode_normalization = str_unicode_normalization
+        self.is_ascii_only = is_ascii_only
+        self.is_to_limit_bytes = is_to_limit_bytes
+        str_allowed = "_" + str_allowed_characters
+        # Table for the fast path when the text is ASCII only
+        self._dict_ascii_table = str.maketrans({
+            chr(int_code): str_replacement
+            for int_code in range(128)
+            if not (chr(int_code).isalnum() or chr(int_code) in str_allowed)
+        })
+        # \w is the same as str.isalnum() or "_"
+        self._re_forbidden_characters = re.compile(
+            "[^%s%s]" % (
+                "A-Za-z0-9" if is_ascii_only else "\\w",
+                re.escape(str_allowed)
+            )
+        )
+        self.sanitize = functools.lru_cache(maxsize=int_cache_size)(
+            self._sanitize)
+
+    def truncate(self, str_filename, int_max_length):
+        """Cut filename to the max length in characters or bytes
+
+        Args:
+            str_filename (str): Filename to cut
+            int_max_length (int): Max length of the filename
+
+        Returns:
+            str: Cut filename
+        """
+        if not self.is_to_limit_bytes:
+            return str_filename[:int_max_length]
+        bytes_filename = str_filename.encode("utf-8")
+        if len(bytes_filename) <= int_max_length:
+            return str_filename
+        # Character cut in the middle is dropped
+        return bytes_filename[:int_max_length].decode("utf-8", "ignore")
+
+    def _sanitize(self, str_text):
+        """Replace forbidden characters in the text
+
+        Args:
+            str_text (str): Text to sanitize, E.G. screenshot description
+
+        Returns:
+            str: Text which can be used in the filename
+        """
+        if self.str_unicode_normalization:
+            str_text = unicodedata.normalize(
+                self.str_unicode_normalization, str_text)
+        if str_text.isascii():
+            return str_text.translate(self._dict_ascii_table)
+        return self._re_forbidden_characters.sub(
+            self.str_replacement, str_text)
@@ -0,0 +1,83 @@
+"""File with the recorder which keeps the last screenshots in memory"""
+# Standard library imports
+import logging
+import threading
+from collections import deque
+
+# Third party imports
+
+# Local imports
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class FlightRecorder(object):
+    """Recorder which keeps the last N screenshots only in memory
+
+    Screenshots are saved to the directory with proper numbers only when
+    dump() is called or an exception happens inside the "with" block.
+    """
+
+    def __init__(self, screenshots_handler, int_max_frames=50):
+        """Init recorder with empty ring buffer
+
+        Args:
+            screenshots_handler (Screenshots): Handler to get and save \
+                screenshots with
+            int_max_frames (int, optional): Max number of the screenshots \
+                to keep in memory
+        """
+        self.screenshots_handler = screenshots_handler
+        self.int_max_frames = int_max_frames
+        self._deque_frames = deque(maxlen=int_max_frames)
+        self._lock = threading.Lock()
+
+    def record(self, str_description=""):
+        """Take a screenshot from the webdriver and keep it in memory
+
+        If there are already int_max_frames screenshots then the oldest one
+        is forgotten.
+
+        Args:
+            str_description (str, optional): description to add in the \
+                screenshot name when it's saved
+        """
+        bytes_png = self.screenshots_handler._get_png_from_webdriver()
+        with self._lock:
+            self._deque_frames.append((bytes_png, str_description))
+
+    def dump(self):
+        """Save all screenshots kept in memory and forget them
+
+        Returns:
+            list or concurrent.futures.Future: Paths to the new screenshots \
+                or future with them if screenshots are saved in the background
+        """
+        with self._lock:
+            list_tuples_png_and_description = list(self._deque_frames)
+            self._deque_frames.clear()
+        LOGGER.info(
+            "Dump screenshots from the flight recorder: %d",
+            len(list_tuples_png_and_description)
+        )
+        return self.screenshots_handler.save_screenshots(
+            list_tuples_png_and_description)
+
+    def clear(self):
+        """Forget all screenshots kept in memory
+        """
+        with self._lock:
+            self._deque_frames.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._deque_frames)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.dump()
+        return False
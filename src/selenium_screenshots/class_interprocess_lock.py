@@ -0,0 +1,162 @@
+"""File with the lock which works between processes and threads"""
+# Standard library imports
+import os
+import time
+import errno
+import logging
+import threading
+
+# Third party imports
+
+# Local imports
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not a POSIX system, lock files created with O_EXCL are used instead
+    fcntl = None
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class InterprocessLock(object):
+    """Lock based on a lock file which works between processes and threads
+
+    fcntl.flock is used if available, otherwise lock is an existence of
+    the lock file created with O_CREAT | O_EXCL flags.
+    """
+
+    def __init__(
+            self,
+            str_path_lock_file,
+            float_seconds_to_consider_stale=60.0,
+            float_poll_interval=0.001,
+    ):
+        """Init lock, it isn't acquired here
+
+        Args:
+            str_path_lock_file (str): Path to the lock file
+            float_seconds_to_consider_stale (float, optional): Lock file \
+                older than this is considered to be left by a crashed \
+                process. Used only if fcntl is not available.
+            float_poll_interval (float, optional): Seconds between \
+                attempts to acquire the lock
+        """
+        self.str_path_lock_file = str_path_lock_file
+        self.float_seconds_to_consider_stale = float_seconds_to_consider_stale
+        self.float_poll_interval = float_poll_interval
+        self._thread_lock = threading.Lock()
+        self._int_fd = None
+
+    def acquire(self, is_blocking=True, float_timeout=None):
+        """Acquire the lock
+
+        Args:
+            is_blocking (bool, optional): Wait till the lock is free
+            float_timeout (float, optional): Max seconds to wait
+
+        Returns:
+            bool: True if the lock was acquired
+        """
+        if not is_blocking:
+            is_acquired = self._thread_lock.acquire(False)
+        elif float_timeout is None:
+            is_acquired = self._thread_lock.acquire()
+        else:
+            is_acquired = self._thread_lock.acquire(timeout=float_timeout)
+        if not is_acquired:
+            return False
+        float_deadline = None
+        if float_timeout is not None:
+            float_deadline = time.monotonic() + float_timeout
+        while True:
+            if self._try_to_acquire_file_lock():
+                return True
+            if not is_blocking or (
+                    float_deadline is not None and
+                    time.monotonic() >= float_deadline
+            ):
+                self._thread_lock.release()
+                return False
+            time.sleep(self.float_poll_interval)
+
+    def release(self, is_to_remove_lock_file=False):
+        """Release the lock
+
+        Args:
+            is_to_remove_lock_file (bool, optional): Remove lock file \
+                while the lock is still held, E.G. if it's not needed \
+                anymore. Lock file is always removed without fcntl.
+        """
+        if fcntl is not None:
+            if is_to_remove_lock_file:
+                try:
+                    os.remove(self.str_path_lock_file)
+                except OSError:
+                    LOGGER.warning(
+                        "Unable to remove lock file: %s",
+                        self.str_path_lock_file
+                    )
+            fcntl.flock(self._int_fd, fcntl.LOCK_UN)
+            os.close(self._int_fd)
+        else:
+            os.close(self._int_fd)
+            try:
+                os.remove(self.str_path_lock_file)
+            except OSError:
+                LOGGER.warning(
+                    "Unable to remove lock file: %s", self.str_path_lock_file)
+        self._int_fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def _try_to_acquire_file_lock(self):
+        """Make one attempt to acquire the file lock
+
+        Returns:
+            bool: True if the lock was acquired
+        """
+        if fcntl is not None:
+            int_fd = os.open(self.str_path_lock_file, os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(int_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(int_fd)
+                return False
+            self._int_fd = int_fd
+            return True
+        try:
+            self._int_fd = os.open(
+                self.str_path_lock_file,
+                os.O_RDWR | os.O_CREAT | os.O_EXCL
+            )
+            return True
+        except OSError as ex:
+            if ex.errno != errno.EEXIST:
+                raise
+        self._remove_lock_file_if_stale()
+        return False
+
+    def _remove_lock_file_if_stale(self):
+        """Remove lock file if it was left by a crashed process
+        """
+        try:
+            float_lock_age = \
+                time.time() - os.path.getmtime(self.str_path_lock_file)
+        except OSError:
+            return None
+        if float_lock_age > self.float_seconds_to_consider_stale:
+            LOGGER.warning(
+                "Remove stale lock file: %s", self.str_path_lock_file)
+            try:
+                os.remove(self.str_path_lock_file)
+            except OSError:
+                pass
+        return None
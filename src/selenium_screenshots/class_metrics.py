@@ -0,0 +1,247 @@
+"""File with metrics which measure phases of the screenshots creation"""
+# Standard library imports
+import time
+import bisect
+import socket
+import logging
+import threading
+import contextlib
+
+# Third party imports
+
+# Local imports
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+# Shared timer used when metrics are disabled, so they cost almost nothing
+NULL_PHASE_TIMER = contextlib.nullcontext()
+TUPLE_DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class ScreenshotsMetrics(object):
+    """Interface of the metrics, by default all measurements are dropped
+
+    Phases measured by Screenshots: create_screenshot, capture (webdriver),
+    crop, name, encode, write, counter, rotate, delete.
+    Counters: screenshots_created, bytes_written, files_deleted,
+    files_evicted (deleted by rotation or retention policy).
+    """
+
+    def observe_seconds(self, str_phase, float_seconds):
+        """Save duration of the phase
+
+        Args:
+            str_phase (str): Name of the phase
+            float_seconds (float): Duration in seconds
+        """
+
+    def increase_counter(self, str_counter, int_value=1):
+        """Increase counter
+
+        Args:
+            str_counter (str): Name of the counter
+            int_value (int, optional): Value to add
+        """
+
+
+class PhaseTimer(object):
+    """Context manager which saves duration of the phase to the metrics"""
+
+    __slots__ = ("metrics", "str_phase", "float_start_time")
+
+    def __init__(self, metrics, str_phase):
+        self.metrics = metrics
+        self.str_phase = str_phase
+        self.float_start_time = 0.0
+
+    def __enter__(self):
+        self.float_start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe_seconds(
+            self.str_phase, time.perf_counter() - self.float_start_time)
+
+
+class CallbackMetrics(ScreenshotsMetrics):
+    """Metrics which pass every measurement to the callback"""
+
+    def __init__(self, func_callback):
+        """Init metrics with the callback
+
+        Args:
+            func_callback (callable): Function like \
+                func(str_kind, str_name, value), where str_kind is \
+                "phase" (value in seconds) or "counter"
+        """
+        self.func_callback = func_callback
+
+    def observe_seconds(self, str_phase, float_seconds):
+        self.func_callback("phase", str_phase, float_seconds)
+
+    def increase_counter(self, str_counter, int_value=1):
+        self.func_callback("counter", str_counter, int_value)
+
+
+class StatsdMetrics(ScreenshotsMetrics):
+    """Metrics which are sent to StatsD over UDP
+
+    Phases are sent as timers in milliseconds, counters as counters.
+    Errors of sending are ignored, so metrics never break screenshots.
+    """
+
+    def __init__(
+            self,
+            str_host="127.0.0.1",
+            int_port=8125,
+            str_prefix="selenium_screenshots",
+    ):
+        """Init metrics with the address of StatsD
+
+        Args:
+            str_host (str, optional): Host of StatsD
+            int_port (int, optional): UDP port of StatsD
+            str_prefix (str, optional): Prefix of the metrics names
+        """
+        self.tuple_address = (str_host, int_port)
+        self.str_prefix = str_prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def observe_seconds(self, str_phase, float_seconds):
+        self._send("%s.%s:%.3f|ms" % (
+            self.str_prefix, str_phase, float_seconds * 1000))
+
+    def increase_counter(self, str_counter, int_value=1):
+        self._send("%s.%s:%d|c" % (self.str_prefix, str_counter, int_value))
+
+    def close(self):
+        """Close the socket
+        """
+        self._socket.close()
+
+    def _send(self, str_message):
+        """Send one message to StatsD
+
+        Args:
+            str_message (str): Message in StatsD format
+        """
+        try:
+            self._socket.sendto(str_message.encode(), self.tuple_address)
+        except OSError as ex:
+            LOGGER.debug("Unable to send metric to StatsD: %s", ex)
+
+
+class HistogramMetrics(ScreenshotsMetrics):
+    """Metrics which are kept in memory as histograms and counters
+
+    They can be exported in the text format of Prometheus.
+    """
+
+    def __init__(self, tuple_buckets=TUPLE_DEFAULT_BUCKETS):
+        """Init empty histograms
+
+        Args:
+            tuple_buckets (tuple, optional): Upper bounds of the buckets \
+                of the histograms in seconds
+        """
+        self.tuple_buckets = tuple(sorted(tuple_buckets))
+        self._lock = threading.Lock()
+        # {phase: [count in every bucket..., count above all buckets]}
+        self._dict_buckets_counts_by_phase = {}
+        self._dict_seconds_by_phase = {}
+        self._dict_value_by_counter = {}
+
+    def observe_seconds(self, str_phase, float_seconds):
+        int_bucket = bisect.bisect_left(self.tuple_buckets, float_seconds)
+        with self._lock:
+            list_buckets_counts = self._dict_buckets_counts_by_phase.get(
+                str_phase)
+            if list_buckets_counts is None:
+                list_buckets_counts = [0] * (len(self.tuple_buckets) + 1)
+                self._dict_buckets_counts_by_phase[str_phase] = \
+                    list_buckets_counts
+            list_buckets_counts[int_bucket] += 1
+            self._dict_seconds_by_phase[str_phase] = \
+                self._dict_seconds_by_phase.get(str_phase, 0.0) + \
+                float_seconds
+
+    def increase_counter(self, str_counter, int_value=1):
+        with self._lock:
+            self._dict_value_by_counter[str_counter] = \
+                self._dict_value_by_counter.get(str_counter, 0) + int_value
+
+    def get_summary(self):
+        """Get number of measurements and total time of every phase
+
+        Returns:
+            dict: {"phases": {phase: {"count": int, "seconds": float}}, \
+                "counters": {counter: int}}
+        """
+        with self._lock:
+            return {
+                "phases": {
+                    str_phase: {
+                        "count": sum(list_buckets_counts),
+                        "seconds": self._dict_seconds_by_phase[str_phase],
+                    }
+                    for str_phase, list_buckets_counts
+                    in self._dict_buckets_counts_by_phase.items()
+                },
+                "counters": dict(self._dict_value_by_counter),
+            }
+
+    def get_prometheus_text(self, str_prefix="selenium_screenshots"):
+        """Get all metrics in the text format of Prometheus
+
+        Args:
+            str_prefix (str, optional): Prefix of the metrics names
+
+        Returns:
+            str: Metrics ready to be served on /metrics
+        """
+        list_lines = []
+        str_histogram = str_prefix + "_phase_seconds"
+        with self._lock:
+            if self._dict_buckets_counts_by_phase:
+                list_lines.append("# TYPE %s histogram" % str_histogram)
+            for str_phase, list_buckets_counts in sorted(
+                    self._dict_buckets_counts_by_phase.items()):
+                int_cumulative_count = 0
+                for str_bound, int_count in zip(
+                        [repr(float(x)) for x in self.tuple_buckets] +
+                        ["+Inf"],
+                        list_buckets_counts
+                ):
+                    int_cumulative_count += int_count
+                    list_lines.append('%s_bucket{phase="%s",le="%s"} %d' % (
+                        str_histogram, str_phase, str_bound,
+                        int_cumulative_count))
+                list_lines.append('%s_sum{phase="%s"} %r' % (
+                    str_histogram, str_phase,
+                    self._dict_seconds_by_phase[str_phase]))
+                list_lines.append('%s_count{phase="%s"} %d' % (
+                    str_histogram, str_phase, int_cumulative_count))
+            for str_counter, int_value in sorted(
+                    self._dict_value_by_counter.items()):
+                str_name = "%s_%s_total" % (str_prefix, str_counter)
+                list_lines.append("# TYPE %s counter" % str_name)
+                list_lines.append("%s %d" % (str_name, int_value))
+        return "\n".join(list_lines) + "\n"
+
+
+def get_phase_timer(metrics, str_phase):
+    """Get context manager which measures the phase
+
+    Args:
+        metrics (ScreenshotsMetrics): Metrics or None if they are disabled
+        str_phase (str): Name of the phase
+
+    Returns:
+        object: Context manager
+    """
+    if metrics is None:
+        return NULL_PHASE_TIMER
+    return PhaseTimer(metrics, str_phase)
@@ -0,0 +1,176 @@
+"""File with the storage which saves screenshots to S3 compatible storage"""
+# Standard library imports
+import logging
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import import_optional_module
+from .additional import is_screenshot_filename
+from .class_storage import ScreenshotsStorage
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+# Max number of the keys in one DeleteObjects request of S3
+INT_MAX_KEYS_PER_DELETE = 1000
+TUPLE_MISSING_OBJECT_ERROR_CODES = ("404", "NoSuchKey", "NotFound")
+
+
+class ObjectStoreStorage(ScreenshotsStorage):
+    """Storage which saves screenshots as objects in S3, MinIO, etc.
+
+    Screenshots are deleted by bulk requests in a pool of threads,
+    the client keeps a pool of connections of the same size.
+    """
+
+    def __init__(
+            self,
+            str_bucket,
+            str_prefix="",
+            client=None,
+            str_endpoint_url="",
+            int_max_connections=16,
+    ):
+        """Init storage, boto3 is needed if the client is not given
+
+        Args:
+            str_bucket (str): Name of the bucket
+            str_prefix (str, optional): Prefix of the keys, E.G. "run42/"
+            client (object, optional): Client of S3 like boto3 client. \
+                By default it's created from the environment of boto3.
+            str_endpoint_url (str, optional): URL of S3 compatible \
+                storage for the default client, E.G. "http://minio:9000"
+            int_max_connections (int, optional): Size of the connections \
+                pool and max number of the requests at the same time
+
+        Raises:
+            SeleniumScreenshotsError: Wrong number of the connections
+        """
+        if int_max_connections < 1:
+            raise SeleniumScreenshotsError(
+                "Number of the connections should be positive")
+        self.str_bucket = str_bucket
+        self.str_prefix = str_prefix
+        self.int_max_connections = int_max_connections
+        if client is None:
+            boto3 = import_optional_module("boto3", str_extra="s3")
+            botocore_config = import_optional_module(
+                "botocore.config", str_extra="s3")
+            client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=str_endpoint_url or None,
+                config=botocore_config.Config(
+                    max_pool_connections=int_max_connections),
+            )
+        self.client = client
+
+    def open(self, str_path_dir_with_screenshots):
+        pass
+
+    def put(self, str_name, bytes_content):
+        self.client.put_object(
+            Bucket=self.str_bucket,
+            Key=self.str_prefix + str_name,
+            Body=bytes_content,
+            ContentType=mimetypes.guess_type(str_name)[0] or
+            "application/octet-stream",
+        )
+        return self.get_location(str_name)
+
+    def get(self, str_name):
+        try:
+            dict_response = self.client.get_object(
+                Bucket=self.str_bucket, Key=self.str_prefix + str_name)
+        except Exception as ex:
+            if is_missing_object_error(ex):
+                return None
+            raise
+        return dict_response["Body"].read()
+
+    def stat(self, str_name):
+        try:
+            dict_response = self.client.head_object(
+                Bucket=self.str_bucket, Key=self.str_prefix + str_name)
+        except Exception as ex:
+            if is_missing_object_error(ex):
+                return None
+            raise
+        return \
+            dict_response["ContentLength"], \
+            dict_response["LastModified"].timestamp()
+
+    def list(self):
+        dict_kwargs = {"Bucket": self.str_bucket, "Prefix": self.str_prefix}
+        while True:
+            dict_response = self.client.list_objects_v2(**dict_kwargs)
+            for dict_object in dict_response.get("Contents", []):
+                str_name = dict_object["Key"][len(self.str_prefix):]
+                if "/" not in str_name and is_screenshot_filename(str_name):
+                    yield \
+                        str_name, \
+                        dict_object["Size"], \
+                        dict_object["LastModified"].timestamp()
+            if not dict_response.get("IsTruncated"):
+                break
+            dict_kwargs["ContinuationToken"] = \
+                dict_response["NextContinuationToken"]
+
+    def delete(self, list_names):
+        list_keys = [self.str_prefix + str_name for str_name in list_names]
+        list_batches = [
+            list_keys[int_start:int_start + INT_MAX_KEYS_PER_DELETE]
+            for int_start in range(0, len(list_keys), INT_MAX_KEYS_PER_DELETE)
+        ]
+        if len(list_batches) <= 1:
+            return sum(map(self._delete_batch_of_keys, list_batches))
+        with ThreadPoolExecutor(
+                max_workers=min(self.int_max_connections, len(list_batches)),
+                thread_name_prefix="selenium_screenshots_deleter",
+        ) as executor:
+            return sum(executor.map(self._delete_batch_of_keys, list_batches))
+
+    def get_location(self, str_name):
+        return "s3://%s/%s%s" % (self.str_bucket, self.str_prefix, str_name)
+
+    def _delete_batch_of_keys(self, list_keys):
+        """Delete objects by one request
+
+        S3 doesn't report missing objects, so they are counted as deleted.
+
+        Args:
+            list_keys (list): Keys of the objects
+
+        Returns:
+            int: Number of the deleted objects
+        """
+        dict_response = self.client.delete_objects(
+            Bucket=self.str_bucket,
+            Delete={
+                "Objects": [{"Key": str_key} for str_key in list_keys],
+                "Quiet": True,
+            },
+        )
+        list_errors = dict_response.get("Errors", [])
+        for dict_error in list_errors:
+            LOGGER.warning(
+                "Unable to delete screenshot: %s\n%s",
+                dict_error.get("Key"), dict_error.get("Message")
+            )
+        return len(list_keys) - len(list_errors)
+
+
+def is_missing_object_error(ex):
+    """Check if the error of the client means that there is no object
+
+    Args:
+        ex (Exception): Error raised by the client
+
+    Returns:
+        bool: True if the object doesn't exist
+    """
+    dict_response = getattr(ex, "response", None) or {}
+    return str(dict_response.get("Error", {}).get("Code")) in \
+        TUPLE_MISSING_OBJECT_ERROR_CODES
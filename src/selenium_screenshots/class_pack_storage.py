@@ -0,0 +1,396 @@
+"""File with the storage which appends screenshots to tar packs
+
+Screenshots are appended to uncompressed tar files "pack_<N>.tar"
+in the directory of the screenshots, a new pack is started when the
+current one reaches the max size. Every pack is a valid tar archive
+at any moment, so packs can be uploaded or unpacked with usual tools.
+Names of the deleted screenshots are kept in "pack_<N>.tar.deleted"
+till all screenshots of the pack are deleted, then the pack is removed.
+Screenshot which wasn't written completely, E.G. because of a crash,
+is dropped on open and the next screenshot overwrites it.
+"""
+# Standard library imports
+import os
+import time
+import logging
+import tarfile
+import threading
+from collections import OrderedDict
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import get_screenshot_num_from_name
+from .additional import is_screenshot_filename
+from .class_storage import ScreenshotsStorage
+from .class_interprocess_lock import InterprocessLock
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+STR_PACK_PREFIX = "pack_"
+STR_PACK_EXTENSION = ".tar"
+STR_DELETED_NAMES_EXTENSION = ".deleted"
+STR_PACKS_LOCK_FILENAME = ".screenshots_packs.lock"
+# Two empty blocks mark the end of a tar archive
+BYTES_END_OF_ARCHIVE = b"\0" * tarfile.BLOCKSIZE * 2
+
+
+class PackStorage(ScreenshotsStorage):
+    """Storage which appends screenshots to size bounded tar packs
+
+    Central index {name: place in the pack} is kept in memory and is
+    rebuilt from headers of the packs on open, so any screenshot is
+    read with one seek. Only one handler can use the packs
+    of a directory at the same time, it's checked by a lock file.
+    """
+
+    def __init__(self, int_max_pack_bytes=256 * 1024 * 1024):
+        """Init storage, it starts working only after call of open(...)
+
+        Args:
+            int_max_pack_bytes (int, optional): Max size of one pack, \
+                bigger screenshots get a pack of their own
+
+        Raises:
+            SeleniumScreenshotsError: Max size of the pack is not positive
+        """
+        if int_max_pack_bytes < 1:
+            raise SeleniumScreenshotsError(
+                "Max size of the pack should be positive")
+        self.int_max_pack_bytes = int_max_pack_bytes
+        self.str_path_dir_with_screenshots = ""
+        self._lock = threading.Lock()
+        # {name: (pack name, offset of the data, size, mtime)}
+        self._dict_entry_by_name = OrderedDict()
+        self._dict_name_by_num = {}
+        # {pack name: set of names of not deleted screenshots}
+        self._dict_names_by_pack = OrderedDict()
+        self._int_last_pack_num = 0
+        self._file_current_pack = None
+        self._str_current_pack_name = ""
+        self._int_current_pack_end = 0
+        self._packs_lock = None
+
+    def open(self, str_path_dir_with_screenshots):
+        """Read headers of all packs in the directory
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory of the handler
+
+        Raises:
+            SeleniumScreenshotsError: Packs are used by another handler
+        """
+        # Lock file is never considered stale, as it's held while
+        # the storage is open, not for a short time
+        packs_lock = InterprocessLock(
+            os.path.join(
+                str_path_dir_with_screenshots, STR_PACKS_LOCK_FILENAME),
+            float_seconds_to_consider_stale=float("inf"),
+        )
+        if not packs_lock.acquire(is_blocking=False):
+            raise SeleniumScreenshotsError(
+                "Packs in the directory are used by another handler: %s" %
+                str_path_dir_with_screenshots
+            )
+        self._packs_lock = packs_lock
+        self.str_path_dir_with_screenshots = str_path_dir_with_screenshots
+        list_tuples_num_and_pack = sorted(
+            (get_pack_num(str_filename), str_filename)
+            for str_filename in os.listdir(str_path_dir_with_screenshots)
+            if get_pack_num(str_filename) is not None
+        )
+        for int_pack_num, str_pack_name in list_tuples_num_and_pack:
+            self._load_pack(str_pack_name)
+            self._int_last_pack_num = int_pack_num
+        LOGGER.debug(
+            "Loaded packs: %d with screenshots: %d",
+            len(list_tuples_num_and_pack), len(self._dict_entry_by_name)
+        )
+
+    def put(self, str_name, bytes_content):
+        tarinfo = tarfile.TarInfo(str_name)
+        tarinfo.size = len(bytes_content)
+        # Float time would need an additional header for every screenshot
+        tarinfo.mtime = int(time.time())
+        tarinfo.mode = 0o644
+        bytes_header = tarinfo.tobuf(
+            format=tarfile.PAX_FORMAT, encoding="utf-8")
+        int_padding = -len(bytes_content) % tarfile.BLOCKSIZE
+        with self._lock:
+            if self._file_current_pack is None or (
+                    self._int_current_pack_end + len(bytes_header) +
+                    len(bytes_content) + int_padding +
+                    len(BYTES_END_OF_ARCHIVE) > self.int_max_pack_bytes and
+                    self._dict_names_by_pack[self._str_current_pack_name]
+            ):
+                self._start_new_pack()
+            file_pack = self._file_current_pack
+            # End of the archive is overwritten by the new screenshot
+            file_pack.seek(self._int_current_pack_end)
+            file_pack.write(bytes_header)
+            file_pack.write(bytes_content)
+            file_pack.write(b"\0" * int_padding)
+            file_pack.write(BYTES_END_OF_ARCHIVE)
+            file_pack.flush()
+            self._add_entry(
+                str_name,
+                self._str_current_pack_name,
+                self._int_current_pack_end + len(bytes_header),
+                len(bytes_content),
+                tarinfo.mtime,
+            )
+            self._int_current_pack_end += \
+                len(bytes_header) + len(bytes_content) + int_padding
+        return self.get_location(str_name)
+
+    def get(self, str_name):
+        with self._lock:
+            tuple_entry = self._dict_entry_by_name.get(str_name)
+        if tuple_entry is None:
+            return None
+        str_pack_name, int_offset, int_size, _ = tuple_entry
+        try:
+            with open(self._get_pack_path(str_pack_name), "rb") as file_pack:
+                file_pack.seek(int_offset)
+                return file_pack.read(int_size)
+        except FileNotFoundError:
+            return None
+
+    def stat(self, str_name):
+        with self._lock:
+            tuple_entry = self._dict_entry_by_name.get(str_name)
+        if tuple_entry is None:
+            return None
+        return tuple_entry[2], tuple_entry[3]
+
+    def list(self):
+        with self._lock:
+            list_tuples_entries = list(self._dict_entry_by_name.items())
+        for str_name, (_, _, int_size, float_mtime) in list_tuples_entries:
+            yield str_name, int_size, float_mtime
+
+    def delete(self, list_names):
+        int_deleted = 0
+        dict_deleted_names_by_pack = {}
+        with self._lock:
+            for str_name in list_names:
+                tuple_entry = self._dict_entry_by_name.pop(str_name, None)
+                if tuple_entry is None:
+                    continue
+                self._dict_name_by_num.pop(
+                    get_screenshot_num_from_name(str_name), None)
+                self._dict_names_by_pack[tuple_entry[0]].discard(str_name)
+                dict_deleted_names_by_pack.setdefault(
+                    tuple_entry[0], []).append(str_name)
+                int_deleted += 1
+            for str_pack_name, list_pack_deleted_names in \
+            dict_deleted_names_by_pack.items():
+                if self._dict_names_by_pack[str_pack_name]:
+                    self._save_deleted_names(
+                        str_pack_name, list_pack_deleted_names)
+                else:
+                    self._delete_pack(str_pack_name)
+        return int_deleted
+
+    def get_location(self, str_name):
+        with self._lock:
+            tuple_entry = self._dict_entry_by_name.get(str_name)
+        str_pack_name = \
+            tuple_entry[0] if tuple_entry else self._str_current_pack_name
+        return self._get_pack_path(str_pack_name) + "/" + str_name
+
+    def get_name_by_num(self, int_screenshot_num):
+        with self._lock:
+            return self._dict_name_by_num.get(int_screenshot_num)
+
+    def get_packs_names(self):
+        """Get names of the packs with not deleted screenshots
+
+        Returns:
+            list: Names of the packs from the oldest one
+        """
+        with self._lock:
+            return list(self._dict_names_by_pack)
+
+    def close(self):
+        with self._lock:
+            if self._file_current_pack is not None:
+                self._file_current_pack.close()
+                self._file_current_pack = None
+            if self._packs_lock is not None:
+                self._packs_lock.release()
+                self._packs_lock = None
+
+    def _load_pack(self, str_pack_name):
+        """Add screenshots from the headers of the pack to the index
+
+        Args:
+            str_pack_name (str): Name of the pack file
+        """
+        str_pack_path = self._get_pack_path(str_pack_name)
+        set_deleted_names = set()
+        try:
+            with open(str_pack_path + STR_DELETED_NAMES_EXTENSION,
+                      encoding="utf-8") as file_deleted_names:
+                set_deleted_names = set(file_deleted_names.read().split("\n"))
+        except FileNotFoundError:
+            pass
+        self._dict_names_by_pack[str_pack_name] = set()
+        int_pack_size = os.path.getsize(str_pack_path)
+        int_pack_end = 0
+        try:
+            with tarfile.open(str_pack_path, "r:") as tar_pack:
+                while True:
+                    try:
+                        tarinfo = tar_pack.next()
+                    except tarfile.ReadError:
+                        # Only padding of the last screenshot is missing
+                        break
+                    if tarinfo is None:
+                        break
+                    if tarinfo.offset_data + tarinfo.size > int_pack_size:
+                        # Next screenshot overwrites header of this one
+                        LOGGER.warning(
+                            "Pack is truncated, screenshot is dropped: %s",
+                            str_pack_path + "/" + tarinfo.name
+                        )
+                        break
+                    if tarinfo.isfile() and \
+                    is_screenshot_filename(tarinfo.name) and \
+                    tarinfo.name not in set_deleted_names:
+                        self._add_entry(
+                            tarinfo.name,
+                            str_pack_name,
+                            tarinfo.offset_data,
+                            tarinfo.size,
+                            tarinfo.mtime,
+                        )
+                    int_pack_end = tar_pack.offset
+        except tarfile.ReadError as ex:
+            LOGGER.warning(
+                "Unable to read pack, it's skipped: %s\n%s", str_pack_path, ex)
+            self._dict_names_by_pack.pop(str_pack_name)
+            return None
+        if not self._dict_names_by_pack[str_pack_name]:
+            self._delete_pack(str_pack_name)
+            return None
+        # Keep appending to the last pack if there is space in it
+        self._close_current_pack()
+        if int_pack_end < self.int_max_pack_bytes:
+            self._file_current_pack = open(str_pack_path, "r+b")
+            self._str_current_pack_name = str_pack_name
+            self._int_current_pack_end = int_pack_end
+        return None
+
+    def _add_entry(
+            self,
+            str_name,
+            str_pack_name,
+            int_offset,
+            int_size,
+            float_mtime,
+    ):
+        """Add screenshot to the central index
+
+        Args:
+            str_name (str): Name of the screenshot
+            str_pack_name (str): Name of the pack with it
+            int_offset (int): Offset of the content in the pack
+            int_size (int): Size of the content
+            float_mtime (float): Time of the saving
+        """
+        tuple_old_entry = self._dict_entry_by_name.pop(str_name, None)
+        if tuple_old_entry is not None:
+            self._dict_names_by_pack[tuple_old_entry[0]].discard(str_name)
+        self._dict_entry_by_name[str_name] = \
+            (str_pack_name, int_offset, int_size, float_mtime)
+        self._dict_names_by_pack[str_pack_name].add(str_name)
+        int_screenshot_num = get_screenshot_num_from_name(str_name)
+        if int_screenshot_num is not None:
+            self._dict_name_by_num[int_screenshot_num] = str_name
+
+    def _start_new_pack(self):
+        """Close the current pack and create the next one
+        """
+        self._close_current_pack()
+        self._int_last_pack_num += 1
+        str_pack_name = "%s%06d%s" % (
+            STR_PACK_PREFIX, self._int_last_pack_num, STR_PACK_EXTENSION)
+        self._file_current_pack = \
+            open(self._get_pack_path(str_pack_name), "w+b")
+        self._str_current_pack_name = str_pack_name
+        self._int_current_pack_end = 0
+        self._dict_names_by_pack[str_pack_name] = set()
+        LOGGER.debug("Started new pack: %s", str_pack_name)
+
+    def _close_current_pack(self):
+        """Close file of the current pack, next screenshot starts a new one
+        """
+        if self._file_current_pack is not None:
+            self._file_current_pack.close()
+        self._file_current_pack = None
+        self._str_current_pack_name = ""
+        self._int_current_pack_end = 0
+
+    def _save_deleted_names(self, str_pack_name, list_deleted_names):
+        """Append names of the deleted screenshots to the file of the pack
+
+        Args:
+            str_pack_name (str): Name of the pack
+            list_deleted_names (list): Names of the deleted screenshots
+        """
+        with open(
+                self._get_pack_path(str_pack_name) +
+                STR_DELETED_NAMES_EXTENSION,
+                "a",
+                encoding="utf-8",
+        ) as file_deleted_names:
+            file_deleted_names.write("\n".join(list_deleted_names) + "\n")
+
+    def _delete_pack(self, str_pack_name):
+        """Delete pack without screenshots and its deleted names
+
+        Args:
+            str_pack_name (str): Name of the pack
+        """
+        if str_pack_name == self._str_current_pack_name:
+            self._close_current_pack()
+        self._dict_names_by_pack.pop(str_pack_name, None)
+        str_pack_path = self._get_pack_path(str_pack_name)
+        for str_path in (
+                str_pack_path, str_pack_path + STR_DELETED_NAMES_EXTENSION):
+            try:
+                os.remove(str_path)
+            except FileNotFoundError:
+                pass
+        LOGGER.debug("Deleted pack: %s", str_pack_name)
+
+    def _get_pack_path(self, str_pack_name):
+        """Get path to the pack
+
+        Args:
+            str_pack_name (str): Name of the pack
+
+        Returns:
+            str: Path to the pack
+        """
+        return os.path.join(self.str_path_dir_with_screenshots, str_pack_name)
+
+
+def get_pack_num(str_filename):
+    """Get number of the pack from its filename like "pack_<N>.tar"
+
+    Args:
+        str_filename (str): Name of the file
+
+    Returns:
+        int: Number of the pack or None if it's not a pack
+    """
+    if not str_filename.startswith(STR_PACK_PREFIX) or \
+    not str_filename.endswith(STR_PACK_EXTENSION):
+        return None
+    str_pack_num = str_filename[len(STR_PACK_PREFIX):-len(STR_PACK_EXTENSION)]
+    if not str_pack_num.isdigit():
+        return None
+    return int(str_pack_num)
@@ -0,0 +1,86 @@
+"""File with the LRU cache of hashes of the recent screenshots"""
+# Standard library imports
+import hashlib
+import logging
+from collections import OrderedDict
+
+# Third party imports
+
+# Local imports
+
+try:
+    import xxhash
+except ImportError:
+    # Optional, blake2b from the standard library is used instead
+    xxhash = None
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class RecentContentHashes(object):
+    """Bounded LRU mapping from content hash to path of the screenshot
+
+    Caller should not use the object from many threads at the same time.
+    """
+
+    def __init__(self, int_max_hashes=128):
+        """Init empty cache
+
+        Args:
+            int_max_hashes (int, optional): Max number of hashes to keep
+        """
+        self.int_max_hashes = int_max_hashes
+        self._dict_path_by_hash = OrderedDict()
+
+    @staticmethod
+    def get_content_hash(bytes_content):
+        """Get hash of the content of a screenshot
+
+        Non-cryptographic xxh3 is used if xxhash is installed, as it's
+        many times faster on big screenshots. Hashes are kept only
+        in memory, so they are never compared between the algorithms.
+
+        Args:
+            bytes_content (bytes): Content of the screenshot
+
+        Returns:
+            bytes: 16 bytes hash of the content
+        """
+        if xxhash is not None:
+            return xxhash.xxh3_128_digest(bytes_content)
+        return hashlib.blake2b(bytes_content, digest_size=16).digest()
+
+    def get_path(self, bytes_content_hash):
+        """Get path to the recent screenshot with the same content
+
+        Args:
+            bytes_content_hash (bytes): Hash of the content
+
+        Returns:
+            str: Path to the screenshot or None if there is no such one
+        """
+        str_screenshot_path = self._dict_path_by_hash.get(bytes_content_hash)
+        if str_screenshot_path is not None:
+            self._dict_path_by_hash.move_to_end(bytes_content_hash)
+        return str_screenshot_path
+
+    def add(self, bytes_content_hash, str_screenshot_path):
+        """Remember path to the screenshot with given content hash
+
+        Args:
+            bytes_content_hash (bytes): Hash of the content
+            str_screenshot_path (str): Path to the screenshot
+        """
+        self._dict_path_by_hash[bytes_content_hash] = str_screenshot_path
+        self._dict_path_by_hash.move_to_end(bytes_content_hash)
+        while len(self._dict_path_by_hash) > self.int_max_hashes:
+            self._dict_path_by_hash.popitem(last=False)
+
+    def discard(self, bytes_content_hash):
+        """Forget screenshot with given content hash
+
+        Args:
+            bytes_content_hash (bytes): Hash of the content
+        """
+        self._dict_path_by_hash.pop(bytes_content_hash, None)
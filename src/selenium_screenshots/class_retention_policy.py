@@ -0,0 +1,172 @@
+"""File with the policy which decides what old screenshots to delete"""
+# Standard library imports
+import time
+import heapq
+import logging
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import STR_DELTA_EXTENSION
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class RetentionPolicy(object):
+    """Policy which decides what old screenshots to delete
+
+    Known screenshots are kept in a heap by number, so the oldest one is
+    found in O(1) and after every new screenshot only a few old ones are
+    deleted, instead of deleting half of the directory at once.
+    To create your own policy override method _is_to_delete_oldest(...).
+    """
+
+    def __init__(
+            self,
+            int_max_screenshots=None,
+            int_max_total_bytes=None,
+            float_max_age_seconds=None,
+            int_max_deletions_per_screenshot=8,
+            is_to_delete_in_background=False,
+    ):
+        """Init policy, screenshots exceeding any of the limits are deleted
+
+        Args:
+            int_max_screenshots (int, optional): Keep only the last N \
+                screenshots
+            int_max_total_bytes (int, optional): Max total size of the \
+                screenshots in bytes
+            float_max_age_seconds (float, optional): Max age of the \
+                screenshots in seconds
+            int_max_deletions_per_screenshot (int, optional): Max number \
+                of the old screenshots to delete after a new one is created
+            is_to_delete_in_background (bool, optional): Flag if to delete \
+                old screenshots in a background thread
+
+        Raises:
+            SeleniumScreenshotsError: No limit was set
+        """
+        if int_max_screenshots is None and int_max_total_bytes is None \
+        and float_max_age_seconds is None:
+            raise SeleniumScreenshotsError(
+                "At least one limit should be set for the retention policy")
+        if int_max_deletions_per_screenshot < 1:
+            raise SeleniumScreenshotsError(
+                "Max number of deletions per screenshot should be positive")
+        self.int_max_screenshots = int_max_screenshots
+        self.int_max_total_bytes = int_max_total_bytes
+        self.float_max_age_seconds = float_max_age_seconds
+        self.int_max_deletions_per_screenshot = \
+            int_max_deletions_per_screenshot
+        self.is_to_delete_in_background = is_to_delete_in_background
+        self.int_total_bytes = 0
+        # Heap with tuples (num, name, size, mtime)
+        self._list_heap_screenshots = []
+
+    def load_screenshots(self, iter_screenshots_rows):
+        """Forget all known screenshots and load the given ones
+
+        Args:
+            iter_screenshots_rows (iterable): Tuples like \
+                (name, num, description, size, mtime)
+        """
+        self._list_heap_screenshots = [
+            (int_num, str_name, int_size, float_mtime)
+            for str_name, int_num, _, int_size, float_mtime
+            in iter_screenshots_rows
+        ]
+        heapq.heapify(self._list_heap_screenshots)
+        self.int_total_bytes = sum(
+            tuple_screenshot[2]
+            for tuple_screenshot in self._list_heap_screenshots
+        )
+
+    def add_screenshot(
+            self,
+            str_screenshot_name,
+            int_screenshot_num,
+            int_size,
+            float_mtime,
+    ):
+        """Add a new screenshot to the known ones
+
+        Args:
+            str_screenshot_name (str): Name of the screenshot file
+            int_screenshot_num (int): Number of the screenshot
+            int_size (int): Size of the screenshot file in bytes
+            float_mtime (float): Time of the last modification of the file
+        """
+        heapq.heappush(
+            self._list_heap_screenshots,
+            (int_screenshot_num, str_screenshot_name, int_size, float_mtime)
+        )
+        self.int_total_bytes += int_size
+
+    def pop_screenshots_to_delete(self, float_now=None):
+        """Get names of the oldest screenshots which should be deleted
+
+        Returned screenshots are forgotten by the policy.
+        Delta can't be restored without its keyframe, which is older,
+        so deltas which become the oldest screenshots are deleted too.
+
+        Args:
+            float_now (float, optional): Current time, by default time.time()
+
+        Returns:
+            list: Names of the screenshots to delete
+        """
+        if float_now is None:
+            float_now = time.time()
+        list_screens_names_to_delete = []
+        while (
+                self._list_heap_screenshots and
+                len(list_screens_names_to_delete) <
+                self.int_max_deletions_per_screenshot and
+                self._is_to_delete_oldest(
+                    self._list_heap_screenshots[0], float_now)
+        ):
+            _, str_screen_name, int_size, _ = \
+                heapq.heappop(self._list_heap_screenshots)
+            self.int_total_bytes -= int_size
+            list_screens_names_to_delete.append(str_screen_name)
+        while (
+                self._list_heap_screenshots and
+                self._list_heap_screenshots[0][1].endswith(
+                    STR_DELTA_EXTENSION)
+        ):
+            _, str_screen_name, int_size, _ = \
+                heapq.heappop(self._list_heap_screenshots)
+            self.int_total_bytes -= int_size
+            list_screens_names_to_delete.append(str_screen_name)
+        return list_screens_names_to_delete
+
+    def count_screenshots(self):
+        """Count screenshots known by the policy
+
+        Returns:
+            int: Number of the screenshots
+        """
+        return len(self._list_heap_screenshots)
+
+    def _is_to_delete_oldest(self, tuple_oldest_screenshot, float_now):
+        """Check if the oldest known screenshot should be deleted
+
+        Args:
+            tuple_oldest_screenshot (tuple): (num, name, size, mtime)
+            float_now (float): Current time
+
+        Returns:
+            bool: True if the oldest screenshot should be deleted
+        """
+        if self.int_max_screenshots is not None and \
+        len(self._list_heap_screenshots) > self.int_max_screenshots:
+            return True
+        if self.int_max_total_bytes is not None and \
+        self.int_total_bytes > self.int_max_total_bytes:
+            return True
+        if self.float_max_age_seconds is not None and \
+        float_now - tuple_oldest_screenshot[3] > self.float_max_age_seconds:
+            return True
+        return False
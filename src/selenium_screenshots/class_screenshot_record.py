@@ -0,0 +1,55 @@
+"""File with the lightweight record of one saved screenshot"""
+# Standard library imports
+
+# Third party imports
+
+# Local imports
+
+
+class ScreenshotRecord(object):
+    """Information about one saved screenshot
+
+    Records use __slots__, so millions of them can be processed
+    one by one without much memory.
+    """
+
+    __slots__ = (
+        "int_num",
+        "str_description",
+        "str_path",
+        "int_size",
+        "float_mtime",
+    )
+
+    def __init__(
+            self,
+            int_num,
+            str_description,
+            str_path,
+            int_size,
+            float_mtime,
+    ):
+        """Init record
+
+        Args:
+            int_num (int): Number of the screenshot
+            str_description (str): Description of the screenshot
+            str_path (str): Path to the screenshot or its location \
+                in the storage
+            int_size (int): Size of the screenshot in bytes
+            float_mtime (float): Time of the last modification
+        """
+        self.int_num = int_num
+        self.str_description = str_description
+        self.str_path = str_path
+        self.int_size = int_size
+        self.float_mtime = float_mtime
+
+    def __repr__(self):
+        return "ScreenshotRecord(%d, %r, %r, %d, %f)" % (
+            self.int_num,
+            self.str_description,
+            self.str_path,
+            self.int_size,
+            self.float_mtime,
+        )
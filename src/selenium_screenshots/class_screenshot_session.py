@@ -0,0 +1,175 @@
+"""File with the session which captures screenshots from many webdrivers"""
+# Standard library imports
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import char_if_strict
+from .additional import get_png_from_webdriver
+from .additional import bind_methods_without_validation
+from .class_screenshots import Screenshots
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class ScreenshotSession(object):
+    """Session which captures screenshots from many webdrivers at once
+
+    All webdrivers share one directory, one counter and one index,
+    so there are no many handlers racing on the same counter files.
+    Name of the webdriver is added before the description of the screenshot:
+    "<number>_<webdriver name>_<description>".
+    """
+
+    @char_if_strict
+    def __init__(
+            self,
+            webdrivers=None,
+            str_path_dir_with_screenshots="screenshots",
+            int_capture_threads=8,
+            **kwargs
+    ):
+        """Init session with one handler for all webdrivers
+
+        Args:
+            webdrivers (dict or list, optional): {name: webdriver, ...} or \
+                list of webdrivers which get names "driver<i>"
+            str_path_dir_with_screenshots (str, optional): \
+                Path to directory where to save screenshots.
+            int_capture_threads (int, optional): Max number of the \
+                webdrivers to get screenshots from at the same time
+            **kwargs: Other arguments for Screenshots(...), \
+                E.G. str_validation_mode
+
+        Raises:
+            SeleniumScreenshotsError: Wrong number of the capture threads
+        """
+        if int_capture_threads < 1:
+            raise SeleniumScreenshotsError(
+                "Number of the capture threads should be positive")
+        self.screenshots_handler = Screenshots(
+            None,
+            str_path_dir_with_screenshots=str_path_dir_with_screenshots,
+            **kwargs
+        )
+        if self.screenshots_handler.str_validation_mode == "off":
+            bind_methods_without_validation(self)
+        self._lock = threading.Lock()
+        self._dict_webdriver_by_name = OrderedDict()
+        self._executor = ThreadPoolExecutor(
+            max_workers=int_capture_threads,
+            thread_name_prefix="selenium_screenshots_capture",
+        )
+        if isinstance(webdrivers, dict):
+            for str_name, webdriver in webdrivers.items():
+                self.add_webdriver(str_name, webdriver)
+        elif webdrivers is not None:
+            for int_driver_num, webdriver in enumerate(webdrivers):
+                self.add_webdriver("driver%d" % int_driver_num, webdriver)
+
+    @char_if_strict
+    def add_webdriver(self, str_name, webdriver):
+        """Add webdriver to the session
+
+        Args:
+            str_name (str): Name of the webdriver to add in screenshots names
+            webdriver (selenium.webdriver): Selenium Webdriver
+
+        Raises:
+            SeleniumScreenshotsError: Webdriver with this name already added
+        """
+        with self._lock:
+            if str_name in self._dict_webdriver_by_name:
+                raise SeleniumScreenshotsError(
+                    "Webdriver with name %s is already in the session" %
+                    str_name
+                )
+            self._dict_webdriver_by_name[str_name] = webdriver
+
+    @char_if_strict
+    def remove_webdriver(self, str_name):
+        """Remove webdriver from the session, webdriver itself is not closed
+
+        Args:
+            str_name (str): Name of the webdriver
+        """
+        with self._lock:
+            self._dict_webdriver_by_name.pop(str_name, None)
+
+    def get_webdrivers_names(self):
+        """Get names of all webdrivers in the session
+
+        Returns:
+            list: Names of the webdrivers in order of adding
+        """
+        with self._lock:
+            return list(self._dict_webdriver_by_name)
+
+    @char_if_strict
+    def capture_all(self, str_description=""):
+        """Capture screenshots from all webdrivers and wait till they saved
+
+        Screenshots are taken from webdrivers at the same time in threads,
+        numbers for all of them are reserved at once.
+
+        Args:
+            str_description (str, optional): description to add in the \
+                screenshots names after names of the webdrivers
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            dict: {webdriver name: path to the new screenshot, ...}
+        """
+        with self._lock:
+            list_tuples_name_and_driver = \
+                list(self._dict_webdriver_by_name.items())
+        if not list_tuples_name_and_driver:
+            return {}
+        list_bytes_png = list(self._executor.map(
+            lambda tuple_name_and_driver:
+            get_png_from_webdriver(tuple_name_and_driver[1]),
+            list_tuples_name_and_driver
+        ))
+        list_tuples_png_and_description = [
+            (
+                bytes_png,
+                "%s_%s" % (str_name, str_description)
+                if str_description else str_name
+            )
+            for (str_name, _), bytes_png
+            in zip(list_tuples_name_and_driver, list_bytes_png)
+        ]
+        list_screenshots_paths = self.screenshots_handler.save_screenshots(
+            list_tuples_png_and_description)
+        if isinstance(list_screenshots_paths, Future):
+            list_screenshots_paths = list_screenshots_paths.result()
+        LOGGER.debug(
+            "Captured screenshots from webdrivers: %d",
+            len(list_screenshots_paths)
+        )
+        return {
+            str_name: str_screenshot_path
+            for (str_name, _), str_screenshot_path
+            in zip(list_tuples_name_and_driver, list_screenshots_paths)
+        }
+
+    def close(self):
+        """Stop capture threads and close the handler, webdrivers stay open
+        """
+        self._executor.shutdown()
+        self.screenshots_handler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,19 +1,55 @@
 """Main file of this python package with the class Screenshots"""
 # Standard library imports
 import os
+import copy
+import time
+import fnmatch
+import shutil
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Third party imports
-from tqdm import tqdm
-from local_simple_database import LocalSimpleDatabase
-from char import char
 
 # Local imports
 from .exceptions import SeleniumScreenshotsError
-from .additional import delete_from_file_name_forbidden_characters
+from .additional import char_if_strict
+from .additional import get_max_screenshot_num
+from .additional import get_screenshot_num_from_name
+from .additional import get_screenshot_description_from_name
+from .additional import is_screenshot_filename
+from .additional import get_png_from_webdriver
+from .additional import TUPLE_VALIDATION_MODES
+from .additional import STR_DEFAULT_VALIDATION_MODE
+from .additional import bind_methods_without_validation
+from .additional import STR_DELTA_EXTENSION
+from .func_shards import get_shard_name
+from .func_shards import iter_screenshots_dir_entries
+from .func_shards import is_shard_dir_name
+from .func_external_sort import iter_sorted_by_runs
+from .class_counters import LsdScreenshotsCounter
+from .class_interprocess_lock import InterprocessLock
+from .class_background_writer import BackgroundWriter
+from .class_deletion_engine import DeletionEngine
+from .class_metrics import get_phase_timer
+from .class_filename_policy import FilenamePolicy
+from .class_delta_storage import get_keyframe_num_of_delta
+from .class_delta_storage import materialize_delta
+from .func_crop import get_regions_of_elements
+from .func_crop import crop_png_to_regions
+from .class_screenshots_index import ScreenshotsIndex
+from .class_screenshot_record import ScreenshotRecord
+from .class_retention_policy import RetentionPolicy
+from .class_recent_content_hashes import RecentContentHashes
+from .class_bk_tree import BKTree
+from .class_flight_recorder import FlightRecorder
+from .func_perceptual_hash import get_small_grayscale_image
+from .func_perceptual_hash import get_difference_hashes
 
 
 LOGGER = logging.getLogger("selenium_screenshots")
+STR_ROTATION_LOCK_FILENAME = ".screenshots_rotation.lock"
+TUPLE_DEDUP_MODES = ("", "skip", "hardlink")
 
 
 class Screenshots(object):
@@ -23,13 +59,30 @@ class Screenshots(object):
         SeleniumScreenshotsError: Main Exception of this python package
     """
 
-    @char
+    @char_if_strict
     def __init__(
             self,
             webdriver,
             str_path_dir_with_screenshots="screenshots",
             int_screenshots_to_delete_half=9999,
             int_max_length_of_filename=50,
+            int_writer_threads=0,
+            int_max_pending_screenshots=64,
+            counter=None,
+            is_to_use_index=False,
+            retention_policy=None,
+            int_max_total_bytes=0,
+            str_dedup_mode="",
+            int_dedup_cache_size=128,
+            encoder=None,
+            int_encoder_processes=0,
+            int_shard_size=0,
+            int_deletion_threads=8,
+            metrics=None,
+            str_validation_mode="",
+            filename_policy=None,
+            delta_storage=None,
+            storage=None,
     ):
         """Init object for handling screenshots
 
@@ -40,68 +93,585 @@ class Screenshots(object):
             int_screenshots_to_delete_half (int, optional): Number of the \
                 screenshots in the directory when delete half of them
             int_max_length_of_filename (int, optional): \
-                Max length of the filename for new screenshot file
+                Max length of the filename for new screenshot file \
+                without extension, in characters or in bytes \
+                depending on the filename policy
+            int_writer_threads (int, optional): Number of the background \
+                threads which save screenshots. If 0 then screenshots \
+                are saved in the calling thread.
+            int_max_pending_screenshots (int, optional): Max number of the \
+                screenshots waiting to be saved in the background
+            counter (LsdScreenshotsCounter, optional): Counter which keeps \
+                numbers of the screenshots. By default every change is \
+                saved to LocalSimpleDatabase right away, \
+                use MemoryScreenshotsCounter to save changes in batches.
+            is_to_use_index (bool, optional): Flag if to keep index of \
+                the screenshots in SQLite, so counting, rotation and \
+                deletion don't need to list the directory.
+            retention_policy (RetentionPolicy, optional): Policy which \
+                deletes a few oldest screenshots after every new one. \
+                If set then int_screenshots_to_delete_half is not used. \
+                Handler uses a copy of it, so it can be shared.
+            int_max_total_bytes (int, optional): Max total size of the \
+                screenshots in the directory, oldest screenshots are \
+                deleted first. Handler uses a copy of the retention policy \
+                with this byte limit.
+            str_dedup_mode (str, optional): What to do if a new screenshot \
+                is the same as one of the recent ones. "" - save it anyway, \
+                "skip" - don't save it and return path to the existing one, \
+                "hardlink" - save it as a hardlink to the existing one.
+            int_dedup_cache_size (int, optional): Number of the recent \
+                screenshots to compare a new one with
+            encoder (PngEncoder, optional): Encoder which converts PNG \
+                from the webdriver before saving, E.G. WebpEncoder() \
+                or JpegEncoder(). By default PNG is saved as it is.
+            int_encoder_processes (int, optional): Number of the processes \
+                which encode screenshots. If 0 then screenshots are encoded \
+                in the thread which saves them.
+            int_shard_size (int, optional): If > 0 then screenshot number N \
+                is saved in the subdirectory "<N // int_shard_size>", \
+                so directories don't become too big. \
+                Use migrate_screenshots_layout(...) for existing screenshots.
+            int_deletion_threads (int, optional): Number of the threads \
+                which delete many screenshots at once
+            metrics (ScreenshotsMetrics, optional): Metrics which get \
+                durations of the phases (capture, encode, write, ...) \
+                and counters, E.G. HistogramMetrics() or StatsdMetrics()
+            str_validation_mode (str, optional): "strict" - check types \
+                of the arguments on every call, "off" - don't check them, \
+                so methods aren't called through the wrapper. By default \
+                it's taken from SELENIUM_SCREENSHOTS_VALIDATION on import. \
+                If it's "off" on import then methods are never checked.
+            filename_policy (FilenamePolicy, optional): Policy which \
+                replaces forbidden characters in descriptions and cuts \
+                long filenames. By default every not alphanumeric \
+                character becomes "_".
+            delta_storage (DeltaStorage, optional): Storage which saves \
+                only tiles changed since the last keyframe. \
+                Use materialize(...) to get full screenshots back. \
+                Can't be used with encoder or deduplication.
+            storage (ScreenshotsStorage, optional): Storage of the \
+                screenshots files, E.G. PackStorage() to append them to \
+                tar packs. By default every screenshot is a file in the \
+                directory. Can't be used with shards.
         """
+        if int_shard_size < 0:
+            raise SeleniumScreenshotsError("Shard size can't be negative")
+        if storage is not None and int_shard_size:
+            raise SeleniumScreenshotsError(
+                "Shards can't be used with a storage")
+        if str_dedup_mode not in TUPLE_DEDUP_MODES:
+            raise SeleniumScreenshotsError(
+                "Unknown dedup mode: %s, allowed modes: %s" % (
+                    str_dedup_mode, TUPLE_DEDUP_MODES))
+        if delta_storage is not None and (encoder or str_dedup_mode):
+            raise SeleniumScreenshotsError(
+                "Delta storage can't be used with encoder or deduplication")
+        self.str_validation_mode = \
+            str_validation_mode or STR_DEFAULT_VALIDATION_MODE
+        if self.str_validation_mode not in TUPLE_VALIDATION_MODES:
+            raise SeleniumScreenshotsError(
+                "Unknown validation mode: %s, allowed modes: %s" % (
+                    str_validation_mode, TUPLE_VALIDATION_MODES))
+        if self.str_validation_mode == "off":
+            bind_methods_without_validation(self)
+        elif STR_DEFAULT_VALIDATION_MODE == "off":
+            LOGGER.warning(
+                "Validation was switched off on import, "
+                "arguments of the handler aren't checked"
+            )
         self.webdriver = webdriver
         self.str_path_dir_with_screenshots = \
             os.path.abspath(str_path_dir_with_screenshots)
-        self.LSD = LocalSimpleDatabase(self.str_path_dir_with_screenshots)
         self.int_screenshots_to_delete_half = int_screenshots_to_delete_half
         self.int_max_length_of_filename = int_max_length_of_filename
+        self.filename_policy = filename_policy or FilenamePolicy()
+        self.int_shard_size = int_shard_size
+        self.metrics = metrics
+        self.int_bytes_written = 0
+        self.str_dedup_mode = str_dedup_mode
+        self._recent_content_hashes = \
+            RecentContentHashes(int_max_hashes=int_dedup_cache_size)
+        # {(screenshot_name, hash_size): perceptual_hash, ...}
+        self._dict_perceptual_hash_by_key = {}
+        # Lock for numbering and counting of the screenshots
+        self._lock = threading.RLock()
+        self._rotation_lock = InterprocessLock(os.path.join(
+            self.str_path_dir_with_screenshots, STR_ROTATION_LOCK_FILENAME))
+        self.encoder = encoder
+        self._encoder_pool = None
+        self.delta_storage = delta_storage
+        self.storage = storage
+        # Deltas are created one by one in order of numbers
+        self._delta_lock = threading.Lock()
+        self._str_delta_keyframe_path = None
+        # Keyframe can be chosen for deletion before it's deleted
+        self._is_delta_keyframe_deleted = False
+        if encoder is not None and int_encoder_processes > 0:
+            # Imported here, as multiprocessing is slow to import
+            from concurrent.futures import ProcessPoolExecutor
+            self._encoder_pool = \
+                ProcessPoolExecutor(max_workers=int_encoder_processes)
+        self.deletion_engine = DeletionEngine(int_threads=int_deletion_threads)
+        self._writer = None
+        if int_writer_threads > 0:
+            self._writer = BackgroundWriter(
+                int_threads=int_writer_threads,
+                int_max_pending_jobs=int_max_pending_screenshots,
+            )
         # Create directory for the screenshots
         if not os.path.exists(str_path_dir_with_screenshots):
-            os.makedirs(str_path_dir_with_screenshots)
+            # Directory can be created by another process at the same time
+            os.makedirs(str_path_dir_with_screenshots, exist_ok=True)
             LOGGER.info(
                 "Created directory for the screenshots: %s",
                 str_path_dir_with_screenshots
             )
-        self.LSD["int_screenshots_in_the_dir"] = \
-            self._count_screenshots_in_the_directory()
+        # Trash of the handlers which crashed during deletion in background
+        self.deletion_engine.delete_orphaned_trash(
+            self.str_path_dir_with_screenshots)
+        if storage is not None:
+            storage.open(self.str_path_dir_with_screenshots)
+        self.index = None
+        if is_to_use_index:
+            self.index = ScreenshotsIndex(self.str_path_dir_with_screenshots)
+            if self.index.is_new:
+                self._rebuild_index_from_directory()
+            int_max_screenshot_num_on_disk = \
+                self.index.get_max_screenshot_num()
+            int_screenshots_in_the_dir = self.index.count_screenshots()
+        else:
+            list_screens_names = self._get_names_of_all_screenshots()
+            int_max_screenshot_num_on_disk = \
+                get_max_screenshot_num(list_screens_names)
+            int_screenshots_in_the_dir = len(list_screens_names)
+        if counter is None:
+            counter = LsdScreenshotsCounter()
+        self.counter = counter
+        self.counter.open(
+            self.str_path_dir_with_screenshots,
+            int_max_screenshot_num_on_disk=int_max_screenshot_num_on_disk,
+        )
+        self.LSD = self.counter.LSD
+        if self.counter.is_shared_between_processes:
+            # Other processes can save screenshots right now
+            self.counter.recount_screenshots_in_the_dir(
+                self._count_screenshots_in_the_directory)
+        else:
+            self.counter.set_screenshots_in_the_dir(int_screenshots_in_the_dir)
+        #####
+        # Prepare policy to delete old screenshots
+        if retention_policy is not None:
+            # Policy keeps screenshots of the handler, so every handler
+            # has its own copy and the policy of the caller can be shared
+            retention_policy = copy.copy(retention_policy)
+        if int_max_total_bytes > 0:
+            if retention_policy is None:
+                retention_policy = RetentionPolicy(
+                    int_max_total_bytes=int_max_total_bytes)
+            else:
+                retention_policy.int_max_total_bytes = int_max_total_bytes
+        self.retention_policy = retention_policy
+        self._deleter = None
+        if self.retention_policy is not None:
+            self._reload_retention_policy()
+            if self.retention_policy.is_to_delete_in_background:
+                self._deleter = BackgroundWriter(
+                    int_threads=1,
+                    int_max_pending_jobs=int_max_pending_screenshots,
+                )
 
-    @char
-    def create_screenshot(self, str_description=""):
+    @char_if_strict
+    def create_screenshot(
+            self,
+            str_description="",
+            element=None,
+            tuple_region=None,
+    ):
         """Create a new screenshot with given description
 
+        Only getting of the screenshot from the webdriver is done in the
+        calling thread if background writer threads are used.
+
         Args:
             str_description (str): description to add in the screenshot name.
+            element (selenium.webdriver.remote.webelement.WebElement, \
+                optional): Element of the page to crop from the screenshot
+            tuple_region (tuple, optional): Region to crop from the \
+                screenshot (x, y, width, height) in pixels of the screenshot
 
         Raises:
             SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str or concurrent.futures.Future: Path to the new screenshot \
+                or future with it if screenshots are saved in the background
         """
-        str_filename = self._create_name_for_screenshot(str_description)
-        str_screenshot_path = os.path.join(
-            self.str_path_dir_with_screenshots, str_filename)
-        LOGGER.debug("Create screenshot in path: %s", str_screenshot_path)
-        #####
-        # Try to create screenshot
-        try:
-            self.webdriver.get_screenshot_as_file(str_screenshot_path)
-        except Exception as ex:
-            LOGGER.error(
-                "Unable to create screenshot with name: %s", str_filename)
-            raise SeleniumScreenshotsError(str(ex))
-        self.LSD["int_last_screenshot_num"] += 1
-        self.LSD["int_screenshots_in_the_dir"] += 1
-        # Delete screenshots if there are too many of them
-        if self.LSD["int_screenshots_in_the_dir"] > \
-        self.int_screenshots_to_delete_half:
-            self._remove_old_screenshots_if_there_are_too_much()
+        with get_phase_timer(self.metrics, "create_screenshot"):
+            if element is None and tuple_region is None:
+                return self.save_screenshot(
+                    self._get_png_from_webdriver(), str_description)
+            tuple_region = get_regions_of_elements(
+                self.webdriver,
+                [element if tuple_region is None else tuple_region]
+            )[0]
+            bytes_png = self._get_png_from_webdriver()
+            if self._writer is None:
+                return self._save_cropped_screenshot(
+                    bytes_png, tuple_region, str_description)
+            return self._writer.submit(
+                self._save_cropped_screenshot,
+                bytes_png,
+                tuple_region,
+                str_description,
+            )
+
+    @char_if_strict
+    def create_element_screenshots(
+            self,
+            list_elements_or_regions,
+            str_description="",
+    ):
+        """Create screenshots of many elements from one capture
+
+        Screenshot is taken from the webdriver only once and all
+        elements are cropped from it, then crops are saved as a batch.
+
+        Args:
+            list_elements_or_regions (list): Elements of the page or \
+                regions (x, y, width, height) in pixels of the screenshot
+            str_description (str, optional): description to add in the \
+                screenshots names, number of the element is added to it
 
-    @char
-    def delete_all_screenshots(self):
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            list or concurrent.futures.Future: Paths to the new screenshots \
+                or future with them if screenshots are saved in the background
+        """
+        list_regions = get_regions_of_elements(
+            self.webdriver, list_elements_or_regions)
+        bytes_png = self._get_png_from_webdriver()
+        list_descriptions = [
+            "%s_element%d" % (str_description, int_element)
+            if str_description else "element%d" % int_element
+            for int_element in range(len(list_regions))
+        ]
+        if self._writer is None:
+            return self._save_cropped_screenshots(
+                bytes_png, list_regions, list_descriptions)
+        return self._writer.submit(
+            self._save_cropped_screenshots,
+            bytes_png,
+            list_regions,
+            list_descriptions,
+        )
+
+    @char_if_strict
+    def capture_burst(
+            self,
+            int_frames,
+            float_interval=0.0,
+            str_description="",
+    ):
+        """Capture many screenshots in a tight loop and save them after
+
+        Screenshots are only taken from the webdriver in the loop,
+        numbers for all of them are reserved at once when saving.
+
+        Args:
+            int_frames (int): Number of the screenshots to capture
+            float_interval (float, optional): Min seconds between starts \
+                of two captures
+            str_description (str, optional): description to add in the \
+                screenshots names, number of the frame is added to it
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            list or concurrent.futures.Future: Paths to the new screenshots \
+                or future with them if screenshots are saved in the background
+        """
+        list_tuples_png_and_description = []
+        float_next_capture_time = time.monotonic()
+        for int_frame in range(int_frames):
+            float_time_to_wait = float_next_capture_time - time.monotonic()
+            if float_time_to_wait > 0:
+                time.sleep(float_time_to_wait)
+            float_next_capture_time = time.monotonic() + float_interval
+            list_tuples_png_and_description.append((
+                self._get_png_from_webdriver(),
+                "%s_frame%d" % (str_description, int_frame)
+                if str_description else "frame%d" % int_frame
+            ))
+        return self.save_screenshots(list_tuples_png_and_description)
+
+    @char_if_strict
+    def flight_recorder(self, int_max_frames=50):
+        """Create recorder which keeps the last screenshots only in memory
+
+        Args:
+            int_max_frames (int, optional): Max number of the screenshots \
+                to keep in memory
+
+        Returns:
+            FlightRecorder: Recorder of the screenshots
+        """
+        return FlightRecorder(self, int_max_frames=int_max_frames)
+
+    def save_screenshot(self, bytes_png, str_description=""):
+        """Save already captured screenshot as a new screenshot file
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            str_description (str, optional): description to add in the \
+                screenshot name.
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str or concurrent.futures.Future: Path to the new screenshot \
+                or future with it if screenshots are saved in the background
+        """
+        if self._writer is None:
+            return self._save_screenshot(bytes_png, str_description)
+        return self._writer.submit(
+            self._save_screenshot, bytes_png, str_description)
+
+    def save_screenshots(self, list_tuples_png_and_description):
+        """Save already captured screenshots as new screenshot files
+
+        Args:
+            list_tuples_png_and_description (list): Tuples like \
+                (bytes_png, str_description)
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            list or concurrent.futures.Future: Paths to the new screenshots \
+                or future with them if screenshots are saved in the background
+        """
+        if self._writer is None:
+            return self._save_screenshots_batch(
+                list_tuples_png_and_description)
+        return self._writer.submit(
+            self._save_screenshots_batch, list_tuples_png_and_description)
+
+    def flush(self, float_timeout=None):
+        """Wait till all screenshots saving in the background are saved
+
+        Args:
+            float_timeout (float, optional): Max seconds to wait
+
+        Returns:
+            bool: True if there are no more screenshots waiting to be saved
+        """
+        is_flushed = True
+        if self._writer is not None:
+            is_flushed = self._writer.flush(float_timeout=float_timeout)
+        if self._deleter is not None:
+            is_flushed = \
+                self._deleter.flush(float_timeout=float_timeout) and is_flushed
+        is_flushed = self.deletion_engine.flush(
+            float_timeout=float_timeout) and is_flushed
+        return is_flushed
+
+    def close(self):
+        """Save all pending screenshots and stop the background writer
+        """
+        if self._writer is not None:
+            self._writer.close()
+        if self._deleter is not None:
+            self._deleter.close()
+        self.deletion_engine.close()
+        if self._encoder_pool is not None:
+            self._encoder_pool.shutdown()
+        with self._lock:
+            self.counter.close()
+        if self.index is not None:
+            self.index.close()
+        if self.storage is not None:
+            self.storage.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_total_bytes(self):
+        """Get total size of the screenshots in the directory
+
+        Size is known without walking the directory if retention policy
+        or index is used.
+
+        Returns:
+            int: Total size of the screenshots in bytes
+        """
+        self.flush()
+        if self.retention_policy is not None:
+            with self._lock:
+                return self.retention_policy.int_total_bytes
+        if self.index is not None:
+            return self.index.get_total_bytes()
+        return sum(
+            tuple_row[3]
+            for tuple_row in self._scan_directory_for_screenshots_rows()
+        )
+
+    def rebuild_index(self):
+        """Rebuild index of the screenshots from the files in the directory
+
+        Raises:
+            SeleniumScreenshotsError: Index is not used by this handler
+
+        Returns:
+            int: Number of the screenshots in the directory
+        """
+        if self.index is None:
+            raise SeleniumScreenshotsError(
+                "Index isn't used, please init Screenshots with "
+                "is_to_use_index=True")
+        self.flush()
+        int_screenshots_in_the_dir = self._rebuild_index_from_directory()
+        with self._lock:
+            self.counter.recount_screenshots_in_the_dir(
+                self.index.count_screenshots)
+        return int_screenshots_in_the_dir
+
+    @char_if_strict
+    def materialize(self, int_screenshot_num):
+        """Get full content of the screenshot with given number
+
+        Screenshots saved as deltas are restored from their keyframes.
+
+        Args:
+            int_screenshot_num (int): Number of the screenshot
+
+        Raises:
+            SeleniumScreenshotsError: Screenshot or its keyframe not found
+
+        Returns:
+            bytes: Content of the screenshot file, PNG for deltas
+        """
+        str_screen_name = self._get_screenshot_name_by_num(int_screenshot_num)
+        bytes_content = self._read_screenshot_file(str_screen_name)
+        if bytes_content is None:
+            raise SeleniumScreenshotsError(
+                "There is no screenshot with number %d" % int_screenshot_num)
+        if not str_screen_name.endswith(STR_DELTA_EXTENSION):
+            return bytes_content
+        int_keyframe_num = get_keyframe_num_of_delta(bytes_content)
+        bytes_keyframe_png = self._read_screenshot_file(
+            self._get_screenshot_name_by_num(int_keyframe_num))
+        if bytes_keyframe_png is None:
+            raise SeleniumScreenshotsError(
+                "Keyframe %d of the screenshot %d was deleted" % (
+                    int_keyframe_num, int_screenshot_num))
+        return materialize_delta(bytes_keyframe_png, bytes_content)
+
+    def iter_screenshots(
+            self,
+            float_since=None,
+            float_until=None,
+            str_description_glob="",
+            int_batch_size=10000,
+    ):
+        """Iterate over saved screenshots ordered by number
+
+        Screenshots are read from the index by batches if it's used,
+        otherwise the directory (or the storage) is scanned once and
+        sorted batches are merged from temporary files,
+        so memory doesn't depend on the number of the screenshots.
+
+        Arguments are checked here instead of char, as timestamps
+        can be given as int too.
+
+        Args:
+            float_since (float, optional): Timestamp, only screenshots \
+                modified at this time or later
+            float_until (float, optional): Timestamp, only screenshots \
+                modified before this time
+            str_description_glob (str, optional): Shell-style pattern \
+                of the descriptions, E.G. "login*"
+            int_batch_size (int, optional): Max number of the screenshots \
+                kept in memory at once
+
+        Raises:
+            SeleniumScreenshotsError: Wrong type of the argument \
+                or size of the batch is not positive
+
+        Returns:
+            iterator: ScreenshotRecord objects with number, description, \
+                path, size and mtime of every screenshot
+        """
+        for str_name, timestamp in (
+                ("float_since", float_since), ("float_until", float_until)):
+            if timestamp is not None and (
+                    not isinstance(timestamp, (int, float)) or
+                    isinstance(timestamp, bool)
+            ):
+                raise SeleniumScreenshotsError(
+                    "%s should be a timestamp, got: %r" % (
+                        str_name, timestamp))
+        if not isinstance(str_description_glob, str) or \
+        not isinstance(int_batch_size, int):
+            raise SeleniumScreenshotsError(
+                "Pattern should be str and size of the batch should be int")
+        if int_batch_size < 1:
+            raise SeleniumScreenshotsError(
+                "Size of the batch should be positive")
+        if float_since is not None:
+            float_since = float(float_since)
+        if float_until is not None:
+            float_until = float(float_until)
+        self.flush()
+        return self._iter_screenshots_records(
+            float_since, float_until, str_description_glob, int_batch_size)
+
+    @char_if_strict
+    def delete_all_screenshots(self, is_to_delete_in_background=False):
         """Delete all screenshots in the dir
+
+        Args:
+            is_to_delete_in_background (bool, optional): Flag if to only \
+                move screenshots to a hidden trash directory and delete it \
+                in a background thread. Shards are moved at once, \
+                but in the flat layout every file is moved separately, \
+                which takes as long as deleting it.
         """
+        self.flush()
         list_screens_names = self._get_names_of_all_screenshots()
         LOGGER.info(
             "Delete all screenshots in the directory: %s",
             self.str_path_dir_with_screenshots
         )
         LOGGER.info("---> Screenshots to delete: %d", len(list_screens_names))
-        self._delete_list_of_screenshots(list_screens_names)
+        if not is_to_delete_in_background or self.storage is not None:
+            int_screenshots_deleted = \
+                self._delete_list_of_screenshots(list_screens_names)
+        else:
+            # Move whole shards instead of screenshots in them
+            list_names_to_move = sorted({
+                str_screen_name.split("/")[0]
+                if is_shard_dir_name(str_screen_name.split("/")[0])
+                else str_screen_name
+                for str_screen_name in list_screens_names
+            })
+            self.deletion_engine.delete_in_background(
+                self.str_path_dir_with_screenshots, list_names_to_move)
+            if self.index is not None:
+                self.index.remove_screenshots(list_screens_names)
+            int_screenshots_deleted = len(list_screens_names)
         # Save new number of screenshots in the dir
-        self._update_number_of_screenshots_in_the_dir()
+        self._update_number_of_screenshots_in_the_dir(int_screenshots_deleted)
+        self._reload_retention_policy()
 
-    @char
+    @char_if_strict
     def delete_not_unique_screenshots(
             self,
             is_to_delete_screenshots_without_description=False
@@ -112,18 +682,38 @@ class Screenshots(object):
             is_to_delete_screenshots_without_description (bool, optional): \
                 Flag if to delete screenshots without description.
         """
+        self.flush()
+        if self.index is not None:
+            list_screens_names_to_delete = \
+                self.index.get_names_of_not_unique_screenshots(
+                    is_to_include_screenshots_without_description=\
+                        is_to_delete_screenshots_without_description
+                )
+            if list_screens_names_to_delete:
+                list_screens_names_to_delete = \
+                    self._get_names_without_needed_keyframes(
+                        self.index.get_names_of_all_screenshots(),
+                        list_screens_names_to_delete,
+                    )
+            int_screenshots_deleted = self._delete_list_of_screenshots(
+                list_screens_names_to_delete)
+            self._update_number_of_screenshots_in_the_dir(
+                int_screenshots_deleted)
+            self._reload_retention_policy()
+            return None
         list_screens_names = self._get_names_of_all_screenshots()
         # Save descriptions of screens by name in the dictionary
         dict_screen_name_by_screen_descr = {}
         list_screens_without_description = []
-
+        # The newest screenshot for every description is kept
+        list_screens_names.sort(
+            key=lambda str_name: get_screenshot_num_from_name(str_name) or 0)
         for str_screen_name in list_screens_names:
             if "_" not in str_screen_name:
                 list_screens_without_description.append(str_screen_name)
                 continue
-            str_screen_descr = str_screen_name.replace(".png", "")
-            # delete screenshot number from screenshot description
-            str_screen_descr = "_".join(str_screen_descr.split("_")[1:])
+            str_screen_descr = \
+                get_screenshot_description_from_name(str_screen_name)
             dict_screen_name_by_screen_descr[str_screen_descr] = \
                 str_screen_name
         # Delete not unique screens
@@ -137,100 +727,912 @@ class Screenshots(object):
         set_screens_names_to_delete = \
             set(list_screens_names) - set(list_names_unique_screens)
 
-        self._delete_list_of_screenshots(list(set_screens_names_to_delete))
+        int_screenshots_deleted = self._delete_list_of_screenshots(
+            self._get_names_without_needed_keyframes(
+                list_screens_names, list(set_screens_names_to_delete)))
         # Save new number of screenshots in the dir
-        self._update_number_of_screenshots_in_the_dir()
+        self._update_number_of_screenshots_in_the_dir(int_screenshots_deleted)
+        self._reload_retention_policy()
+        return None
+
+    @char_if_strict
+    def delete_near_duplicate_screenshots(
+            self,
+            int_max_hamming_distance=4,
+            int_hash_size=8,
+    ):
+        """Delete screenshots which look almost the same as older ones
+
+        Screenshots are compared by perceptual difference hashes, so
+        screenshots differing only by a blinking cursor or a clock are
+        considered the same. The oldest screenshot of similar ones is kept.
+        Needs numpy and Pillow to be installed.
 
-    @char
+        Args:
+            int_max_hamming_distance (int, optional): Max number of \
+                different bits in hashes of similar screenshots
+            int_hash_size (int, optional): Side of the hash in bits
+
+        Returns:
+            int: Number of the deleted screenshots
+        """
+        self.flush()
+        list_screens_names = self._get_names_of_all_screenshots()
+        if self.index is None:
+            list_screens_names = \
+                self._sort_screenshots_by_num(list_screens_names)
+        dict_hash_by_name = self._get_perceptual_hashes(
+            list_screens_names, int_hash_size)
+        #####
+        # Keep screenshot if there is no similar one among kept ones
+        bk_tree_kept_screens = BKTree()
+        list_screens_names_to_delete = []
+        for str_screen_name in list_screens_names:
+            int_hash = dict_hash_by_name.get(str_screen_name)
+            if int_hash is None:
+                continue
+            if bk_tree_kept_screens.find(int_hash, int_max_hamming_distance):
+                list_screens_names_to_delete.append(str_screen_name)
+            else:
+                bk_tree_kept_screens.add(int_hash, str_screen_name)
+        list_screens_names_to_delete = \
+            self._get_names_without_needed_keyframes(
+                list_screens_names, list_screens_names_to_delete)
+        LOGGER.info(
+            "Near duplicate screenshots to delete: %d",
+            len(list_screens_names_to_delete)
+        )
+        int_screenshots_deleted = \
+            self._delete_list_of_screenshots(list_screens_names_to_delete)
+        for str_screen_name in list_screens_names_to_delete:
+            self._dict_perceptual_hash_by_key.pop(
+                (str_screen_name, int_hash_size), None)
+        self._update_number_of_screenshots_in_the_dir(int_screenshots_deleted)
+        self._reload_retention_policy()
+        return len(list_screens_names_to_delete)
+
+    @char_if_strict
     def _delete_list_of_screenshots(self, list_screenshots_names_to_del):
         """Delete list of screenshots from the directory
 
         Args:
             list_screenshots_names_to_del (list): Names of screenshots
+
+        Returns:
+            int: Number of the deleted screenshots
         """
-        iter_screens_names = list_screenshots_names_to_del
-        if len(list_screenshots_names_to_del) > 1000:
-            iter_screens_names = tqdm(iter_screens_names)
-        for str_screen_name in iter_screens_names:
-            str_screenshot_path = os.path.join(
-                self.str_path_dir_with_screenshots, str_screen_name)
-            if not os.path.exists(str_screenshot_path):
-                continue
-            try:
-                os.remove(str_screenshot_path)
-            except Exception as ex:
-                LOGGER.warning(
-                    "Unable to delete screenshot: %s\n%s",
-                    str_screenshot_path, ex)
+        with get_phase_timer(self.metrics, "delete"):
+            if self.storage is not None:
+                int_files_deleted = \
+                    self.storage.delete(list_screenshots_names_to_del)
+            else:
+                int_files_deleted = self.deletion_engine.delete_files(
+                    self.str_path_dir_with_screenshots,
+                    list_screenshots_names_to_del
+                )
+        self._increase_metric("files_deleted", int_files_deleted)
+        if self.index is not None:
+            self.index.remove_screenshots(list_screenshots_names_to_del)
+        if self.int_shard_size:
+            self._delete_empty_shards(list_screenshots_names_to_del)
+        return int_files_deleted
 
-    @char
-    def _create_name_for_screenshot(self, str_description):
+    @char_if_strict
+    def _create_name_for_screenshot(
+            self,
+            str_description,
+            int_screenshot_num=None,
+            str_extension="",
+    ):
         """Create name for the new screenshot like "<number>_<description>"
 
         Args:
             str_description (str): string which to add in screenshot name
+            int_screenshot_num (int, optional): Number of the new \
+                screenshot. By default the one after the last number.
+            str_extension (str, optional): Extension of the file. \
+                By default it's set by the encoder.
 
         Returns:
             str: Name for the screenshot
         """
         # Get number for new screenshot
-        int_new_screenshot_num = self.LSD["int_last_screenshot_num"] + 1
+        int_new_screenshot_num = int_screenshot_num
+        if int_new_screenshot_num is None:
+            int_new_screenshot_num = \
+                self.counter.get_last_screenshot_num() + 1
         LOGGER.debug("Number for new screenshot: %d", int_new_screenshot_num)
         str_filename = str(int_new_screenshot_num)
         if str_description:
-            str_filename += "_" + str_description
+            # Sanitized descriptions are cached by the policy
+            str_filename += \
+                "_" + self.filename_policy.sanitize(str_description)
         # If the filename is too long then cut it
-        if len(str_filename) > self.int_max_length_of_filename:
-            str_filename = str_filename[:self.int_max_length_of_filename]
-        # Delete forbidden characters
-        str_filename_filtered = \
-            delete_from_file_name_forbidden_characters(str_filename)
+        str_filename_filtered = self.filename_policy.truncate(
+            str_filename, self.int_max_length_of_filename)
         LOGGER.debug(
             "Created a name for new screenshot: %s", str_filename_filtered)
-        return str_filename_filtered + ".png"
+        if str_extension:
+            str_filename_filtered += str_extension
+        elif self.encoder is None:
+            str_filename_filtered += ".png"
+        else:
+            str_filename_filtered += self.encoder.str_extension
+        if not self.int_shard_size:
+            return str_filename_filtered
+        return get_shard_name(int_new_screenshot_num, self.int_shard_size) + \
+            "/" + str_filename_filtered
+
+    def _save_screenshot(self, bytes_png, str_description):
+        """Save PNG content of the screenshot as a new screenshot file
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            str_description (str): description to add in the screenshot name.
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str: Path to the new screenshot
+        """
+        if self.delta_storage is not None:
+            return self._save_delta_screenshot(bytes_png, str_description)
+        bytes_content_hash = None
+        str_same_screenshot_path = None
+        if self.str_dedup_mode:
+            bytes_content_hash = \
+                RecentContentHashes.get_content_hash(bytes_png)
+            str_same_screenshot_path = \
+                self._get_path_of_same_screenshot(bytes_content_hash)
+            if str_same_screenshot_path is not None and \
+            self.str_dedup_mode == "skip":
+                LOGGER.debug(
+                    "Same screenshot already exists: %s",
+                    str_same_screenshot_path
+                )
+                return str_same_screenshot_path
+        with get_phase_timer(self.metrics, "counter"), self._lock:
+            int_screenshot_num = self.counter.increase_last_screenshot_num()
+        with get_phase_timer(self.metrics, "name"):
+            str_filename = self._create_name_for_screenshot(
+                str_description, int_screenshot_num=int_screenshot_num)
+        str_screenshot_path = self._get_screenshot_path(str_filename)
+        LOGGER.debug("Create screenshot in path: %s", str_screenshot_path)
+        # Hardlink takes no new space on the disk
+        int_size = 0
+        if str_same_screenshot_path is None or not self._link_screenshot_file(
+                str_filename, str_same_screenshot_path):
+            if self.encoder is not None:
+                bytes_png = self._encode_screenshots([bytes_png])[0]
+            self._write_screenshot_file(str_filename, bytes_png)
+            int_size = len(bytes_png)
+        if bytes_content_hash is not None:
+            with self._lock:
+                self._recent_content_hashes.add(
+                    bytes_content_hash, str_screenshot_path)
+        self._register_new_screenshots(
+            [(str_filename, int_screenshot_num, int_size)])
+        self._increase_metric("screenshots_created")
+        return str_screenshot_path
+
+    def _save_screenshots_batch(self, list_tuples_png_and_description):
+        """Save many screenshots with numbers reserved at once
+
+        Deduplication is not used for batches.
+
+        Args:
+            list_tuples_png_and_description (list): Tuples like \
+                (bytes_png, str_description)
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            list: Paths to the new screenshots in the given order
+        """
+        if not list_tuples_png_and_description:
+            return []
+        if self.delta_storage is not None:
+            return [
+                self._save_delta_screenshot(bytes_png, str_description)
+                for bytes_png, str_description
+                in list_tuples_png_and_description
+            ]
+        int_screenshots = len(list_tuples_png_and_description)
+        if self.encoder is not None:
+            tuple_bytes_png, tuple_descriptions = \
+                zip(*list_tuples_png_and_description)
+            list_tuples_png_and_description = list(zip(
+                self._encode_screenshots(list(tuple_bytes_png)),
+                tuple_descriptions
+            ))
+        with get_phase_timer(self.metrics, "counter"), self._lock:
+            int_last_screenshot_num = \
+                self.counter.increase_last_screenshot_num(int_screenshots)
+        int_first_screenshot_num = \
+            int_last_screenshot_num - int_screenshots + 1
+        list_new_screenshots = []
+        list_screenshots_paths = []
+        for int_screenshot_num, (bytes_png, str_description) in enumerate(
+                list_tuples_png_and_description, int_first_screenshot_num):
+            with get_phase_timer(self.metrics, "name"):
+                str_filename = self._create_name_for_screenshot(
+                    str_description, int_screenshot_num=int_screenshot_num)
+            self._write_screenshot_file(str_filename, bytes_png)
+            str_screenshot_path = self._get_screenshot_path(str_filename)
+            list_new_screenshots.append(
+                (str_filename, int_screenshot_num, len(bytes_png)))
+            list_screenshots_paths.append(str_screenshot_path)
+        LOGGER.debug(
+            "Saved batch of screenshots: %d", len(list_screenshots_paths))
+        self._register_new_screenshots(list_new_screenshots)
+        self._increase_metric("screenshots_created", int_screenshots)
+        return list_screenshots_paths
+
+    def _save_delta_screenshot(self, bytes_png, str_description):
+        """Save screenshot as keyframe or as tiles changed since it
+
+        Args:
+            bytes_png (bytes): PNG content of the screenshot
+            str_description (str): description to add in the screenshot name.
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            str: Path to the new screenshot
+        """
+        with self._delta_lock:
+            if self._str_delta_keyframe_path is not None and (
+                    self._is_delta_keyframe_deleted or
+                    not self._is_screenshot_existing(
+                        self._str_delta_keyframe_path)
+            ):
+                LOGGER.debug("Keyframe was deleted, start a new one")
+                self.delta_storage.reset()
+                self._str_delta_keyframe_path = None
+                self._is_delta_keyframe_deleted = False
+            with get_phase_timer(self.metrics, "counter"), self._lock:
+                int_screenshot_num = \
+                    self.counter.increase_last_screenshot_num()
+            try:
+                with get_phase_timer(self.metrics, "encode"):
+                    bytes_content, str_extension = \
+                        self.delta_storage.encode(
+                            bytes_png, int_screenshot_num)
+            except SeleniumScreenshotsError:
+                raise
+            except Exception as ex:
+                raise SeleniumScreenshotsError(
+                    "Unable to encode screenshot: %s" % ex)
+            with get_phase_timer(self.metrics, "name"):
+                str_filename = self._create_name_for_screenshot(
+                    str_description,
+                    int_screenshot_num=int_screenshot_num,
+                    str_extension=str_extension,
+                )
+            self._write_screenshot_file(str_filename, bytes_content)
+            str_screenshot_path = self._get_screenshot_path(str_filename)
+            if str_extension != STR_DELTA_EXTENSION:
+                self._str_delta_keyframe_path = str_screenshot_path
+        self._register_new_screenshots(
+            [(str_filename, int_screenshot_num, len(bytes_content))])
+        self._increase_metric("screenshots_created")
+        return str_screenshot_path
+
+    @staticmethod
+    def _get_names_without_needed_keyframes(
+            list_screens_names,
+            list_screens_names_to_delete,
+    ):
+        """Remove keyframes of the kept deltas from the names to delete
+
+        Delta needs the last keyframe saved before it, so such keyframe
+        is kept while any of its deltas is kept.
+
+        Args:
+            list_screens_names (list): Names of all screenshots \
+                ordered by number
+            list_screens_names_to_delete (list): Names of the \
+                screenshots to delete
+
+        Returns:
+            list: Names of the screenshots to delete in the given order
+        """
+        set_screens_names_to_delete = set(list_screens_names_to_delete)
+        set_needed_keyframes_names = set()
+        str_keyframe_name = None
+        for str_screen_name in list_screens_names:
+            if not str_screen_name.endswith(STR_DELTA_EXTENSION):
+                str_keyframe_name = str_screen_name
+            elif str_keyframe_name is not None and \
+            str_screen_name not in set_screens_names_to_delete:
+                set_needed_keyframes_names.add(str_keyframe_name)
+        return [
+            str_screen_name
+            for str_screen_name in list_screens_names_to_delete
+            if str_screen_name not in set_needed_keyframes_names
+        ]
+
+    def _forget_delta_keyframe_if_deleted(self, list_screens_names):
+        """Start new keyframe if the current one is going to be deleted
+
+        Args:
+            list_screens_names (list): Names of the screenshots to delete
+        """
+        str_keyframe_path = self._str_delta_keyframe_path
+        if str_keyframe_path is None:
+            return None
+        if any(
+                self._get_screenshot_path(str_screen_name) ==
+                str_keyframe_path
+                for str_screen_name in list_screens_names
+        ):
+            self._is_delta_keyframe_deleted = True
+        return None
+
+    def _get_screenshot_name_by_num(self, int_screenshot_num):
+        """Find name of the screenshot with given number
+
+        Without index only the directory (or shard) of the number is listed.
+
+        Args:
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            str: Name of the screenshot or None if it's not found
+        """
+        if self.index is not None:
+            return self.index.get_screenshot_name_by_num(int_screenshot_num)
+        if self.storage is not None:
+            return self.storage.get_name_by_num(int_screenshot_num)
+        str_path_dir = self.str_path_dir_with_screenshots
+        str_name_prefix = ""
+        if self.int_shard_size:
+            str_name_prefix = get_shard_name(
+                int_screenshot_num, self.int_shard_size) + "/"
+            str_path_dir = os.path.join(str_path_dir, str_name_prefix)
+        try:
+            with os.scandir(str_path_dir) as iter_entries:
+                for dir_entry in iter_entries:
+                    if is_screenshot_filename(dir_entry.name) and \
+                    get_screenshot_num_from_name(dir_entry.name) == \
+                    int_screenshot_num:
+                        return str_name_prefix + dir_entry.name
+        except FileNotFoundError:
+            pass
+        return None
+
+    def _read_screenshot_file(self, str_screen_name):
+        """Read content of the screenshot with given name
+
+        Args:
+            str_screen_name (str): Name of the screenshot or None
+
+        Returns:
+            bytes: Content of the screenshot or None if it's not found
+        """
+        if str_screen_name is None:
+            return None
+        if self.storage is not None:
+            return self.storage.get(str_screen_name)
+        try:
+            with open(os.path.join(
+                    self.str_path_dir_with_screenshots, str_screen_name),
+                    "rb") as file_handle:
+                return file_handle.read()
+        except FileNotFoundError:
+            return None
+
+    def _save_cropped_screenshot(
+            self,
+            bytes_png,
+            tuple_region,
+            str_description,
+    ):
+        """Crop region from the screenshot and save it
+
+        Args:
+            bytes_png (bytes): PNG content of the whole screenshot
+            tuple_region (tuple): (x, y, width, height) in pixels
+            str_description (str): description to add in the screenshot name.
+
+        Returns:
+            str: Path to the new screenshot
+        """
+        return self._save_screenshot(
+            self._crop_screenshot(bytes_png, [tuple_region])[0],
+            str_description
+        )
+
+    def _save_cropped_screenshots(
+            self,
+            bytes_png,
+            list_regions,
+            list_descriptions,
+    ):
+        """Crop regions from the screenshot and save them as a batch
+
+        Args:
+            bytes_png (bytes): PNG content of the whole screenshot
+            list_regions (list): Regions (x, y, width, height) in pixels
+            list_descriptions (list): Descriptions of the crops
+
+        Returns:
+            list: Paths to the new screenshots in the given order
+        """
+        return self._save_screenshots_batch(list(zip(
+            self._crop_screenshot(bytes_png, list_regions),
+            list_descriptions
+        )))
+
+    def _crop_screenshot(self, bytes_png, list_regions):
+        """Crop regions from the screenshot decoding it only once
+
+        Args:
+            bytes_png (bytes): PNG content of the whole screenshot
+            list_regions (list): Regions (x, y, width, height) in pixels
+
+        Raises:
+            SeleniumScreenshotsError: Unable to crop screenshot
+
+        Returns:
+            list: PNG contents of the crops in the same order
+        """
+        try:
+            with get_phase_timer(self.metrics, "crop"):
+                return crop_png_to_regions(bytes_png, list_regions)
+        except SeleniumScreenshotsError:
+            raise
+        except Exception as ex:
+            raise SeleniumScreenshotsError(
+                "Unable to crop screenshot: %s" % ex)
+
+    def _encode_screenshots(self, list_bytes_png):
+        """Encode screenshots with the encoder, in processes if possible
+
+        Args:
+            list_bytes_png (list): PNG contents of the screenshots
+
+        Raises:
+            SeleniumScreenshotsError: Unable to encode screenshot
+
+        Returns:
+            list: Encoded contents of the screenshots in the same order
+        """
+        try:
+            with get_phase_timer(self.metrics, "encode"):
+                if self._encoder_pool is None:
+                    return [
+                        self.encoder.encode(bytes_png)
+                        for bytes_png in list_bytes_png
+                    ]
+                return list(self._encoder_pool.map(
+                    self.encoder.encode, list_bytes_png))
+        except SeleniumScreenshotsError:
+            raise
+        except Exception as ex:
+            raise SeleniumScreenshotsError(
+                "Unable to encode screenshot: %s" % ex)
+
+    def _get_png_from_webdriver(self):
+        """Get screenshot from the webdriver as PNG content
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+
+        Returns:
+            bytes: PNG content of the screenshot
+        """
+        with get_phase_timer(self.metrics, "capture"):
+            return get_png_from_webdriver(self.webdriver)
+
+    def _link_screenshot_file(self, str_filename, str_same_screenshot_path):
+        """Create screenshot as a hardlink to the same screenshot
+
+        Args:
+            str_filename (str): Name of the new screenshot
+            str_same_screenshot_path (str): Path to the existing \
+                screenshot with the same content
+
+        Returns:
+            bool: True if hardlink was created. Storages always \
+                save the content, so it's False for them.
+        """
+        if self.storage is not None:
+            return False
+        str_screenshot_path = os.path.join(
+            self.str_path_dir_with_screenshots, str_filename)
+        try:
+            self._create_shard_if_missing(
+                str_screenshot_path,
+                os.link,
+                str_same_screenshot_path,
+                str_screenshot_path,
+            )
+        except OSError as ex:
+            LOGGER.debug(
+                "Unable to hardlink screenshot, write it instead: %s", ex)
+            return False
+        return True
+
+    def _write_screenshot_file(self, str_filename, bytes_png):
+        """Write screenshot file
+
+        Args:
+            str_filename (str): Name of the new screenshot
+            bytes_png (bytes): Content of the screenshot
+
+        Raises:
+            SeleniumScreenshotsError: Main exception of this python package
+        """
+        str_screenshot_path = os.path.join(
+            self.str_path_dir_with_screenshots, str_filename)
+        #####
+        # Try to create screenshot
+        try:
+            with get_phase_timer(self.metrics, "write"):
+                if self.storage is not None:
+                    self.storage.put(str_filename, bytes_png)
+                else:
+                    self._create_shard_if_missing(
+                        str_screenshot_path,
+                        self._write_bytes_to_file,
+                        str_screenshot_path,
+                        bytes_png,
+                    )
+        except OSError as ex:
+            LOGGER.error(
+                "Unable to create screenshot with name: %s", str_filename)
+            raise SeleniumScreenshotsError(str(ex))
+        with self._lock:
+            self.int_bytes_written += len(bytes_png)
+        self._increase_metric("bytes_written", len(bytes_png))
+        return None
+
+    def _get_screenshot_path(self, str_filename):
+        """Get path to the screenshot or its location in the storage
+
+        Args:
+            str_filename (str): Name of the screenshot
+
+        Returns:
+            str: Path to the screenshot
+        """
+        if self.storage is not None:
+            return self.storage.get_location(str_filename)
+        return os.path.join(self.str_path_dir_with_screenshots, str_filename)
+
+    def _is_screenshot_existing(self, str_screenshot_path):
+        """Check if the screenshot with given path still exists
+
+        Args:
+            str_screenshot_path (str): Path to the screenshot
+
+        Returns:
+            bool: True if the screenshot exists
+        """
+        if self.storage is not None:
+            # Locations in storages end with the name of the screenshot
+            return self.storage.stat(
+                str_screenshot_path.rsplit("/", 1)[-1]) is not None
+        return os.path.exists(str_screenshot_path)
+
+    def _increase_metric(self, str_counter, int_value=1):
+        """Increase counter of the metrics if they are used
+
+        Args:
+            str_counter (str): Name of the counter
+            int_value (int, optional): Value to add
+        """
+        if self.metrics is not None:
+            self.metrics.increase_counter(str_counter, int_value)
+
+    def _create_shard_if_missing(
+            self,
+            str_screenshot_path,
+            func_create_file,
+            *args
+    ):
+        """Create file, if its shard doesn't exist then create it and retry
+
+        Shard is created only on the first failure, so there is no
+        additional check for every new screenshot.
+
+        Args:
+            str_screenshot_path (str): Path to the new screenshot
+            func_create_file (callable): Function which creates the file
+            *args: Arguments of the function
+        """
+        try:
+            func_create_file(*args)
+        except FileNotFoundError:
+            if not self.int_shard_size:
+                raise
+            os.makedirs(os.path.dirname(str_screenshot_path), exist_ok=True)
+            func_create_file(*args)
+
+    @staticmethod
+    def _write_bytes_to_file(str_path, bytes_content):
+        """Write content to the file with given path
+
+        Args:
+            str_path (str): Path to the file
+            bytes_content (bytes): Content of the file
+        """
+        with open(str_path, "wb") as file_handle:
+            file_handle.write(bytes_content)
+
+    def _delete_empty_shards(self, list_screens_names):
+        """Delete shards of the given screenshots if they are empty now
+
+        Args:
+            list_screens_names (list): Names of the deleted screenshots
+        """
+        for str_shard_name in {
+                str_screen_name.rsplit("/", 1)[0]
+                for str_screen_name in list_screens_names
+                if "/" in str_screen_name
+        }:
+            try:
+                os.rmdir(os.path.join(
+                    self.str_path_dir_with_screenshots, str_shard_name))
+            except OSError:
+                # Shard is not empty or already deleted
+                pass
+
+    def _delete_whole_shards(self, list_screens_names_to_delete):
+        """Delete at once shards where all files are to delete
+
+        Shard is deleted as a whole only if the names to delete cover
+        every entry in it, E.G. not numbered files or screenshots saved
+        by another process into an older shard are not lost.
+
+        Args:
+            list_screens_names_to_delete (list): Names of the oldest \
+                screenshots sorted by number
+
+        Returns:
+            list: Names of the screenshots which are still to delete
+        """
+        if not self.int_shard_size or not list_screens_names_to_delete:
+            return list_screens_names_to_delete
+        # Shard of the last screenshot can still get new screenshots
+        str_last_shard_name = list_screens_names_to_delete[-1].split("/")[0]
+        dict_names_by_shard = {}
+        for str_screen_name in list_screens_names_to_delete:
+            if "/" in str_screen_name and \
+            str_screen_name.split("/")[0] != str_last_shard_name:
+                dict_names_by_shard.setdefault(
+                    str_screen_name.split("/")[0], set()
+                ).add(str_screen_name.split("/", 1)[1])
+        set_shards_names = set()
+        for str_shard_name, set_names_in_shard in \
+        dict_names_by_shard.items():
+            str_path_shard = os.path.join(
+                self.str_path_dir_with_screenshots, str_shard_name)
+            try:
+                set_entries_names = set(os.listdir(str_path_shard))
+            except OSError:
+                continue
+            if set_entries_names <= set_names_in_shard:
+                shutil.rmtree(str_path_shard, ignore_errors=True)
+                set_shards_names.add(str_shard_name)
+        list_names_in_whole_shards = []
+        list_other_names = []
+        for str_screen_name in list_screens_names_to_delete:
+            if str_screen_name.split("/")[0] in set_shards_names:
+                list_names_in_whole_shards.append(str_screen_name)
+            else:
+                list_other_names.append(str_screen_name)
+        if self.index is not None:
+            self.index.remove_screenshots(list_names_in_whole_shards)
+        LOGGER.debug("Deleted whole shards: %d", len(set_shards_names))
+        return list_other_names
+
+    def _get_path_of_same_screenshot(self, bytes_content_hash):
+        """Get path to the recent screenshot with the same content
+
+        Args:
+            bytes_content_hash (bytes): Hash of the content
+
+        Returns:
+            str: Path to the screenshot or None if there is no such one
+        """
+        with self._lock:
+            str_screenshot_path = \
+                self._recent_content_hashes.get_path(bytes_content_hash)
+        if str_screenshot_path is None:
+            return None
+        # Screenshot could be already deleted
+        if not self._is_screenshot_existing(str_screenshot_path):
+            with self._lock:
+                self._recent_content_hashes.discard(bytes_content_hash)
+            return None
+        return str_screenshot_path
+
+    def _register_new_screenshots(self, list_new_screenshots):
+        """Update counters, index and delete old screenshots if necessary
+
+        Args:
+            list_new_screenshots (list): Tuples like (name, num, size)
+        """
+        float_mtime = time.time()
+        if self.index is not None:
+            self.index.add_screenshots([
+                (
+                    str_filename,
+                    int_screenshot_num,
+                    get_screenshot_description_from_name(str_filename),
+                    int_size,
+                    float_mtime,
+                )
+                for str_filename, int_screenshot_num, int_size
+                in list_new_screenshots
+            ])
+        list_screens_names_to_delete = []
+        is_rotation_needed = False
+        with self._lock:
+            with get_phase_timer(self.metrics, "counter"):
+                int_screenshots_in_the_dir = \
+                    self.counter.increase_screenshots_in_the_dir(
+                        len(list_new_screenshots))
+            if self.retention_policy is not None:
+                for str_filename, int_screenshot_num, int_size in \
+                list_new_screenshots:
+                    self.retention_policy.add_screenshot(
+                        str_filename,
+                        int_screenshot_num,
+                        int_size,
+                        float_mtime,
+                    )
+                    list_screens_names_to_delete += \
+                        self.retention_policy.pop_screenshots_to_delete()
+                if list_screens_names_to_delete:
+                    self.counter.increase_screenshots_in_the_dir(
+                        -len(list_screens_names_to_delete))
+                    self._forget_delta_keyframe_if_deleted(
+                        list_screens_names_to_delete)
+            else:
+                is_rotation_needed = int_screenshots_in_the_dir > \
+                    self.int_screenshots_to_delete_half
+        # Listing and deletion are done without the lock of the handler,
+        # so writer threads and flush() don't wait for the rotation
+        if is_rotation_needed:
+            self._remove_old_screenshots_if_there_are_too_much()
+        if list_screens_names_to_delete:
+            self._delete_screenshots_by_retention_policy(
+                list_screens_names_to_delete)
+
+    def _delete_screenshots_by_retention_policy(
+            self,
+            list_screens_names_to_delete,
+    ):
+        """Delete screenshots chosen by the retention policy
+
+        Args:
+            list_screens_names_to_delete (list): Names of the screenshots
+        """
+        LOGGER.debug(
+            "Delete old screenshots: %s", list_screens_names_to_delete)
+        self._increase_metric(
+            "files_evicted", len(list_screens_names_to_delete))
+        if self._deleter is None:
+            with get_phase_timer(self.metrics, "rotate"):
+                self._delete_list_of_screenshots(list_screens_names_to_delete)
+        else:
+            self._deleter.submit(
+                self._delete_list_of_screenshots,
+                list_screens_names_to_delete
+            )
+
+    def _reload_retention_policy(self):
+        """Load all screenshots in the directory to the retention policy
+        """
+        if self.retention_policy is None:
+            return None
+        if self.index is not None:
+            list_screenshots_rows = self.index.get_all_screenshots_rows()
+        else:
+            list_screenshots_rows = \
+                list(self._scan_directory_for_screenshots_rows())
+        with self._lock:
+            self.retention_policy.load_screenshots(list_screenshots_rows)
+        return None
 
     def _remove_old_screenshots_if_there_are_too_much(self):
         """Delete most old screenshots if there are too much of them
+
+        Only one process at a time deletes old screenshots, others skip it.
+        """
+        if not self._rotation_lock.acquire(is_blocking=False):
+            LOGGER.debug("Old screenshots are deleted by another process")
+            return None
+        try:
+            with get_phase_timer(self.metrics, "rotate"):
+                self._delete_oldest_half_of_screenshots()
+        finally:
+            self._rotation_lock.release()
+        return None
+
+    def _delete_oldest_half_of_screenshots(self):
+        """Delete oldest half of the screenshots if there are too much of them
         """
         # Check if there are too much screenshots
-        list_screens_names = self._get_names_of_all_screenshots()
-        if len(list_screens_names) < self.int_screenshots_to_delete_half:
-            self.LSD["int_screenshots_in_the_dir"] = len(list_screens_names)
+        if self.index is not None:
+            int_screenshots_in_the_dir = self.index.count_screenshots()
+        else:
+            list_screens_names = self._get_names_of_all_screenshots()
+            int_screenshots_in_the_dir = len(list_screens_names)
+        if int_screenshots_in_the_dir < self.int_screenshots_to_delete_half:
+            self._update_number_of_screenshots_in_the_dir()
             return None
+        int_screens_to_delete = self.int_screenshots_to_delete_half // 2
+        # Deltas after the deleted screenshots are deleted with them,
+        # as their keyframes are deleted
+        if self.index is not None:
+            list_screens_names_to_delete = \
+                self.index.get_names_of_oldest_screenshots(
+                    int_screens_to_delete)
+            if list_screens_names_to_delete:
+                list_screens_names_to_delete += \
+                    self.index.get_names_of_deltas_after(
+                        get_screenshot_num_from_name(
+                            list_screens_names_to_delete[-1]))
+        else:
+            list_screens_names_sorted = \
+                self._sort_screenshots_by_num(list_screens_names)
+            while (
+                    int_screens_to_delete < len(list_screens_names_sorted) and
+                    list_screens_names_sorted[int_screens_to_delete].endswith(
+                        STR_DELTA_EXTENSION)
+            ):
+                int_screens_to_delete += 1
+            list_screens_names_to_delete = \
+                list_screens_names_sorted[:int_screens_to_delete]
+        self._forget_delta_keyframe_if_deleted(list_screens_names_to_delete)
+        # Delete old screenshots
+        int_screens_to_delete = len(list_screens_names_to_delete)
+        self._increase_metric("files_evicted", int_screens_to_delete)
+        list_names_not_in_whole_shards = \
+            self._delete_whole_shards(list_screens_names_to_delete)
+        int_screenshots_deleted = \
+            int_screens_to_delete - len(list_names_not_in_whole_shards) + \
+            self._delete_list_of_screenshots(list_names_not_in_whole_shards)
+        LOGGER.info("Were deleted screenshots: %d", int_screenshots_deleted)
+        #####
+        # Save new number of screenshots in the dir
+        self._update_number_of_screenshots_in_the_dir(int_screenshots_deleted)
+        return None
+
+    @staticmethod
+    def _sort_screenshots_by_num(list_screens_names):
+        """Sort names of the screenshots by their numbers
+
+        Screenshots with wrong names are skipped.
+
+        Args:
+            list_screens_names (list): Names of the screenshots
+
+        Returns:
+            list: Names of the screenshots sorted by number
+        """
         # Create dictionary {screenshot_num: screenshot_filename, ...}
         dict_screen_name_by_num = {}
         for str_screenshot_name in list_screens_names:
-            try:
-                int_screen_num = int(str_screenshot_name.split("_")[0])
-            except ValueError:
+            int_screen_num = get_screenshot_num_from_name(str_screenshot_name)
+            if int_screen_num is None:
                 LOGGER.warning(
                     "Wrong filename of the screenshot: %s",
                     str_screenshot_name
                 )
                 continue
             dict_screen_name_by_num[int_screen_num] = str_screenshot_name
-        # Create sorted list with screenshot's numbers
-        list_sorted_screenshot_numbers = sorted(dict_screen_name_by_num)
-        int_screens_to_delete = self.int_screenshots_to_delete_half // 2
-        int_screens_deleted = 0
-        # Delete old screenshots
-        for int_screen_num_to_del in  \
-        list_sorted_screenshot_numbers[:int_screens_to_delete]:
-            str_screen_name = dict_screen_name_by_num[int_screen_num_to_del]
-            str_screenshot_path = os.path.join(
-                self.str_path_dir_with_screenshots, str_screen_name)
-            LOGGER.debug("Delete screenshot: %s", str_screen_name)
-            try:
-                os.remove(str_screenshot_path)
-                int_screens_deleted += 1
-            except OSError:
-                LOGGER.warning(
-                    "Unable to delete screenshot: %s", str_screenshot_path)
-        LOGGER.info("Were deleted screenshots: %d", int_screens_to_delete)
-        #####
-        # Save new number of screenshots in the dir
-        self._update_number_of_screenshots_in_the_dir()
-        return None
+        return [
+            dict_screen_name_by_num[int_screen_num]
+            for int_screen_num in sorted(dict_screen_name_by_num)
+        ]
 
     def _get_names_of_all_screenshots(self):
         """Get list with names of all screenshots
@@ -238,10 +1640,23 @@ class Screenshots(object):
         Returns:
             list: Names of all screenshots
         """
+        if self.index is not None:
+            return self.index.get_names_of_all_screenshots()
+        if self.storage is not None:
+            return [
+                str_screen_name
+                for str_screen_name, _, _ in self.storage.list()
+            ]
+        if self.int_shard_size:
+            return [
+                str_screen_name
+                for str_screen_name, _ in iter_screenshots_dir_entries(
+                    self.str_path_dir_with_screenshots, is_sharded=True)
+            ]
         list_screenshots_names = [
             filename
             for filename in os.listdir(self.str_path_dir_with_screenshots)
-            if ".png" in filename
+            if is_screenshot_filename(filename)
         ]
         return list_screenshots_names
 
@@ -251,10 +1666,236 @@ class Screenshots(object):
         Returns:
             int: Number of the screenshots
         """
+        if self.index is not None:
+            return self.index.count_screenshots()
         return len(self._get_names_of_all_screenshots())
 
-    def _update_number_of_screenshots_in_the_dir(self):
+    def _update_number_of_screenshots_in_the_dir(
+            self,
+            int_screenshots_deleted=0,
+    ):
         """Save new number of the screenshots in the dirs
+
+        Deleted screenshots are subtracted first, so the number is right
+        even if the counter can't recount screenshots as the directory
+        is used by other processes.
+
+        Args:
+            int_screenshots_deleted (int, optional): Number of the \
+                screenshots deleted by this handler
         """
-        list_screens_names = self._get_names_of_all_screenshots()
-        self.LSD["int_screenshots_in_the_dir"] = len(list_screens_names)
+        if self.counter.is_shared_between_processes:
+            # Screenshots are counted under the lock of the counter
+            func_count_screenshots = self._count_screenshots_in_the_directory
+        else:
+            int_screenshots_in_the_dir = \
+                self._count_screenshots_in_the_directory()
+            func_count_screenshots = lambda: int_screenshots_in_the_dir
+        with self._lock:
+            self.counter.increase_screenshots_in_the_dir(
+                -int_screenshots_deleted)
+            self.counter.recount_screenshots_in_the_dir(
+                func_count_screenshots)
+            # After deletion numbers on the disk can't restore the last one
+            self.counter.flush()
+
+    def _get_perceptual_hashes(self, list_screens_names, int_hash_size):
+        """Get perceptual hashes of the screenshots, compute missing ones
+
+        Computed hashes are cached in the index if it's used,
+        otherwise in memory of this handler.
+
+        Args:
+            list_screens_names (list): Names of the screenshots
+            int_hash_size (int): Side of the hash in bits
+
+        Returns:
+            dict: {screenshot_name: int_hash, ...} for readable screenshots
+        """
+        if self.index is not None:
+            dict_cached_hash_by_name = \
+                self.index.get_perceptual_hashes(int_hash_size)
+        else:
+            dict_cached_hash_by_name = {
+                str_name: int_hash
+                for (str_name, int_size), int_hash in
+                self._dict_perceptual_hash_by_key.items()
+                if int_size == int_hash_size
+            }
+        list_names_to_hash = [
+            str_name for str_name in list_screens_names
+            if str_name not in dict_cached_hash_by_name
+        ]
+        # Decoding of images mostly releases GIL, so threads are enough
+        with ThreadPoolExecutor() as executor:
+            list_small_images = list(executor.map(
+                lambda str_name: self._get_small_image_or_none(
+                    str_name, int_hash_size),
+                list_names_to_hash
+            ))
+        list_names_hashed = [
+            str_name
+            for str_name, array_image in
+            zip(list_names_to_hash, list_small_images)
+            if array_image is not None
+        ]
+        dict_new_hash_by_name = dict(zip(
+            list_names_hashed,
+            get_difference_hashes([
+                array_image for array_image in list_small_images
+                if array_image is not None
+            ])
+        ))
+        LOGGER.debug(
+            "Computed perceptual hashes: %d", len(dict_new_hash_by_name))
+        dict_cached_hash_by_name.update(dict_new_hash_by_name)
+        if self.index is not None:
+            self.index.add_perceptual_hashes(
+                int_hash_size, dict_new_hash_by_name)
+        else:
+            # Keep in memory hashes only of existing screenshots
+            self._dict_perceptual_hash_by_key = {
+                (str_name, int_hash_size): dict_cached_hash_by_name[str_name]
+                for str_name in list_screens_names
+                if str_name in dict_cached_hash_by_name
+            }
+        return dict_cached_hash_by_name
+
+    def _get_small_image_or_none(self, str_screen_name, int_hash_size):
+        """Read screenshot as small grayscale image for perceptual hash
+
+        Args:
+            str_screen_name (str): Name of the screenshot
+            int_hash_size (int): Side of the hash in bits
+
+        Returns:
+            numpy.ndarray: Small image or None if screenshot is unreadable
+        """
+        try:
+            if self.storage is not None:
+                bytes_or_path_image = self.storage.get(str_screen_name)
+                if bytes_or_path_image is None:
+                    return None
+            else:
+                bytes_or_path_image = os.path.join(
+                    self.str_path_dir_with_screenshots, str_screen_name)
+            return get_small_grayscale_image(
+                bytes_or_path_image, int_hash_size=int_hash_size)
+        except SeleniumScreenshotsError:
+            raise
+        except Exception as ex:
+            LOGGER.warning(
+                "Unable to read screenshot: %s\n%s", str_screen_name, ex)
+            return None
+
+    def _rebuild_index_from_directory(self):
+        """Fill index with all screenshots found in the directory
+
+        Returns:
+            int: Number of the screenshots in the directory
+        """
+        list_screenshots_rows = \
+            list(self._scan_directory_for_screenshots_rows())
+        self.index.replace_all_screenshots(list_screenshots_rows)
+        LOGGER.info(
+            "Index rebuilt with screenshots: %d", len(list_screenshots_rows))
+        return len(list_screenshots_rows)
+
+    def _iter_screenshots_records(
+            self,
+            float_since,
+            float_until,
+            str_description_glob,
+            int_batch_size,
+    ):
+        """Iterate over records of the screenshots ordered by number
+
+        Args:
+            float_since (float): Min mtime or None
+            float_until (float): Mtime before which screenshots were saved
+            str_description_glob (str): Pattern of the descriptions
+            int_batch_size (int): Max number of the rows in memory
+
+        Yields:
+            ScreenshotRecord: Record of the screenshot
+        """
+        def is_row_matching(tuple_row):
+            return \
+                (float_since is None or tuple_row[4] >= float_since) and \
+                (float_until is None or tuple_row[4] < float_until) and \
+                (not str_description_glob or
+                 fnmatch.fnmatchcase(tuple_row[2], str_description_glob))
+
+        if self.index is not None:
+            iter_rows = filter(
+                is_row_matching,
+                self.index.iter_screenshots_rows(
+                    float_since, float_until, int_batch_size),
+            )
+        else:
+            iter_rows = self._iter_scanned_screenshots_rows(
+                is_row_matching, int_batch_size)
+        for str_screen_name, int_num, str_descr, int_size, float_mtime in \
+        iter_rows:
+            yield ScreenshotRecord(
+                int_num,
+                str_descr,
+                self._get_screenshot_path(str_screen_name),
+                int_size,
+                float_mtime,
+            )
+
+    def _iter_scanned_screenshots_rows(self, is_row_matching, int_batch_size):
+        """Iterate over screenshots in the directory ordered by number
+
+        Directory is scanned once, rows are sorted by batches which
+        are saved to temporary files and merged.
+
+        Args:
+            is_row_matching (function): Filter of the rows
+            int_batch_size (int): Max number of the rows in memory
+
+        Returns:
+            iterator: Tuples like (name, num, description, size, mtime)
+        """
+        def get_key(tuple_row):
+            return tuple_row[1], tuple_row[0]
+
+        return iter_sorted_by_runs(
+            filter(
+                is_row_matching, self._scan_directory_for_screenshots_rows()),
+            get_key,
+            int_batch_size,
+        )
+
+    def _scan_directory_for_screenshots_rows(self):
+        """Iterate over all screenshots files in the directory
+
+        Yields:
+            tuple: (name, num, description, size, mtime)
+        """
+        if self.storage is not None:
+            for str_screen_name, int_size, float_mtime in self.storage.list():
+                yield (
+                    str_screen_name,
+                    get_screenshot_num_from_name(str_screen_name) or 0,
+                    get_screenshot_description_from_name(str_screen_name),
+                    int_size,
+                    float_mtime,
+                )
+            return None
+        for str_screen_name, dir_entry in iter_screenshots_dir_entries(
+                self.str_path_dir_with_screenshots,
+                is_sharded=bool(self.int_shard_size),
+        ):
+            stat_result = dir_entry.stat()
+            # Screenshots with wrong names are deleted first on rotation
+            int_screenshot_num = \
+                get_screenshot_num_from_name(str_screen_name) or 0
+            yield (
+                str_screen_name,
+                int_screenshot_num,
+                get_screenshot_description_from_name(str_screen_name),
+                stat_result.st_size,
+                stat_result.st_mtime,
+            )
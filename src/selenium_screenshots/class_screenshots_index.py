@@ -0,0 +1,407 @@
+"""File with the persistent index of the screenshots in the directory"""
+# Standard library imports
+import os
+import logging
+import threading
+
+# Third party imports
+
+# Local imports
+from .additional import STR_DELTA_EXTENSION
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class ScreenshotsIndex(object):
+    """Index of the screenshots in the directory saved in SQLite database
+
+    For every screenshot it keeps: number, description, size and mtime,
+    so counting, rotation and deduplication don't need to list the dir.
+    Index can be used by many threads and processes at the same time.
+    """
+
+    STR_INDEX_FILENAME = ".screenshots_index.sqlite3"
+
+    def __init__(self, str_path_dir_with_screenshots):
+        """Open (and create if necessary) index for the given directory
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory with screenshots
+        """
+        self.str_path_index_file = os.path.join(
+            str_path_dir_with_screenshots, self.STR_INDEX_FILENAME)
+        self.is_new = not os.path.exists(self.str_path_index_file)
+        self._lock = threading.Lock()
+        # Imported here, so it's not loaded if index is not used
+        import sqlite3
+        self._connection = sqlite3.connect(
+            self.str_path_index_file,
+            timeout=30.0,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS screenshots ("
+                "name TEXT PRIMARY KEY, "
+                "num INTEGER NOT NULL, "
+                "description TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "mtime REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS screenshots_by_num "
+                "ON screenshots (num)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS screenshots_by_description "
+                "ON screenshots (description, num)"
+            )
+            # Hashes are saved as hex strings as they can be > 64 bits
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS perceptual_hashes ("
+                "name TEXT NOT NULL, "
+                "hash_size INTEGER NOT NULL, "
+                "hash TEXT NOT NULL, "
+                "PRIMARY KEY (name, hash_size))"
+            )
+
+    def add_screenshot(
+            self,
+            str_screenshot_name,
+            int_screenshot_num,
+            str_description,
+            int_size,
+            float_mtime,
+    ):
+        """Add a new screenshot to the index
+
+        Args:
+            str_screenshot_name (str): Name of the screenshot file
+            int_screenshot_num (int): Number of the screenshot
+            str_description (str): Description of the screenshot
+            int_size (int): Size of the screenshot file in bytes
+            float_mtime (float): Time of the last modification of the file
+        """
+        self.add_screenshots([(
+            str_screenshot_name,
+            int_screenshot_num,
+            str_description,
+            int_size,
+            float_mtime,
+        )])
+
+    def add_screenshots(self, list_screenshots_rows):
+        """Add many new screenshots to the index in one transaction
+
+        Args:
+            list_screenshots_rows (list): Tuples like \
+                (name, num, description, size, mtime)
+        """
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO screenshots "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    list_screenshots_rows
+                )
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def remove_screenshots(self, list_screenshots_names):
+        """Remove screenshots with given names from the index
+
+        Args:
+            list_screenshots_names (list): Names of the screenshots
+        """
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "DELETE FROM screenshots WHERE name = ?",
+                    ((str_name,) for str_name in list_screenshots_names)
+                )
+                self._connection.executemany(
+                    "DELETE FROM perceptual_hashes WHERE name = ?",
+                    ((str_name,) for str_name in list_screenshots_names)
+                )
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def replace_all_screenshots(self, iter_screenshots_rows):
+        """Replace content of the index in one transaction
+
+        Args:
+            iter_screenshots_rows (iterable): Tuples like \
+                (name, num, description, size, mtime)
+        """
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.execute("DELETE FROM screenshots")
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO screenshots "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    iter_screenshots_rows
+                )
+                self._connection.execute(
+                    "DELETE FROM perceptual_hashes WHERE name NOT IN "
+                    "(SELECT name FROM screenshots)"
+                )
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def count_screenshots(self):
+        """Count screenshots in the index
+
+        Returns:
+            int: Number of the screenshots
+        """
+        return self._fetch_one_value("SELECT COUNT(*) FROM screenshots")
+
+    def get_max_screenshot_num(self):
+        """Get max number of the screenshots in the index
+
+        Returns:
+            int: Max number of the screenshots or 0 if index is empty
+        """
+        return self._fetch_one_value(
+            "SELECT COALESCE(MAX(num), 0) FROM screenshots")
+
+    def get_total_bytes(self):
+        """Get total size of the screenshots in the index
+
+        Returns:
+            int: Total size of the screenshots in bytes
+        """
+        return self._fetch_one_value(
+            "SELECT COALESCE(SUM(size), 0) FROM screenshots")
+
+    def get_names_of_all_screenshots(self):
+        """Get names of all screenshots in the index
+
+        Returns:
+            list: Names of all screenshots ordered by number
+        """
+        return self._fetch_names("SELECT name FROM screenshots ORDER BY num")
+
+    def get_all_screenshots_rows(self):
+        """Get all screenshots in the index ordered by number
+
+        Returns:
+            list: Tuples like (name, num, description, size, mtime)
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT name, num, description, size, mtime "
+                "FROM screenshots ORDER BY num"
+            ).fetchall()
+
+    def iter_screenshots_rows(
+            self,
+            float_since=None,
+            float_until=None,
+            int_batch_size=1000,
+    ):
+        """Iterate over screenshots ordered by number, batch by batch
+
+        Every batch is a separate query which starts after the last row,
+        so the index isn't locked while rows are processed.
+
+        Args:
+            float_since (float, optional): Min mtime of the screenshots
+            float_until (float, optional): Mtime before which \
+                the screenshots were saved
+            int_batch_size (int, optional): Number of rows in one query
+
+        Yields:
+            tuple: (name, num, description, size, mtime)
+        """
+        str_query = \
+            "SELECT name, num, description, size, mtime FROM screenshots " \
+            "WHERE (num, name) > (?, ?)"
+        tuple_params = ()
+        if float_since is not None:
+            str_query += " AND mtime >= ?"
+            tuple_params += (float_since,)
+        if float_until is not None:
+            str_query += " AND mtime < ?"
+            tuple_params += (float_until,)
+        str_query += " ORDER BY num, name LIMIT ?"
+        # Numbers of the screenshots are never negative
+        tuple_last_key = (-1, "")
+        while True:
+            with self._lock:
+                list_rows = self._connection.execute(
+                    str_query,
+                    tuple_last_key + tuple_params + (int_batch_size,)
+                ).fetchall()
+            yield from list_rows
+            if len(list_rows) < int_batch_size:
+                break
+            tuple_last_key = (list_rows[-1][1], list_rows[-1][0])
+
+    def get_screenshot_name_by_num(self, int_screenshot_num):
+        """Get name of the screenshot with given number
+
+        Args:
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            str: Name of the screenshot or None if there is no one
+        """
+        list_names = self._fetch_names(
+            "SELECT name FROM screenshots WHERE num = ? LIMIT 1",
+            (int_screenshot_num,)
+        )
+        return list_names[0] if list_names else None
+
+    def get_names_of_oldest_screenshots(self, int_screenshots):
+        """Get names of the screenshots with the smallest numbers
+
+        Args:
+            int_screenshots (int): How many names to get
+
+        Returns:
+            list: Names of the oldest screenshots
+        """
+        return self._fetch_names(
+            "SELECT name FROM screenshots ORDER BY num LIMIT ?",
+            (int_screenshots,)
+        )
+
+    def get_names_of_deltas_after(self, int_screenshot_num):
+        """Get names of the deltas saved right after the given screenshot
+
+        Deltas are returned up to the next keyframe, so these are
+        the deltas which need the given screenshot or the older ones.
+
+        Args:
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            list: Names of the deltas ordered by number
+        """
+        return self._fetch_names(
+            "SELECT name FROM screenshots WHERE num > ? AND "
+            "num < COALESCE((SELECT MIN(num) FROM screenshots "
+            "WHERE num > ? AND name NOT LIKE ?), num + 1) ORDER BY num",
+            (
+                int_screenshot_num,
+                int_screenshot_num,
+                "%" + STR_DELTA_EXTENSION,
+            )
+        )
+
+    def get_names_of_not_unique_screenshots(
+            self,
+            is_to_include_screenshots_without_description=False,
+    ):
+        """Get names of the screenshots with the same description
+
+        The newest screenshot for every description is considered unique.
+
+        Args:
+            is_to_include_screenshots_without_description (bool, optional): \
+                Flag if to add screenshots without description
+
+        Returns:
+            list: Names of not unique screenshots
+        """
+        str_query = (
+            "SELECT name FROM screenshots WHERE description != '' AND "
+            "num NOT IN (SELECT MAX(num) FROM screenshots "
+            "WHERE description != '' GROUP BY description)"
+        )
+        if is_to_include_screenshots_without_description:
+            str_query += " OR description = ''"
+        return self._fetch_names(str_query)
+
+    def get_perceptual_hashes(self, int_hash_size):
+        """Get all saved perceptual hashes of the given size
+
+        Args:
+            int_hash_size (int): Side of the hash in bits
+
+        Returns:
+            dict: {screenshot_name: int_hash, ...}
+        """
+        with self._lock:
+            return {
+                str_name: int(str_hash, 16)
+                for str_name, str_hash in self._connection.execute(
+                    "SELECT name, hash FROM perceptual_hashes "
+                    "WHERE hash_size = ?",
+                    (int_hash_size,)
+                )
+            }
+
+    def add_perceptual_hashes(self, int_hash_size, dict_hash_by_name):
+        """Save perceptual hashes of the screenshots
+
+        Args:
+            int_hash_size (int): Side of the hash in bits
+            dict_hash_by_name (dict): {screenshot_name: int_hash, ...}
+        """
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO perceptual_hashes "
+                    "VALUES (?, ?, ?)",
+                    (
+                        (str_name, int_hash_size, "%x" % int_hash)
+                        for str_name, int_hash in dict_hash_by_name.items()
+                    )
+                )
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self):
+        """Close connection to the index
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _fetch_one_value(self, str_query, tuple_params=()):
+        """Run query which returns one value
+
+        Args:
+            str_query (str): SQL query
+            tuple_params (tuple, optional): Parameters of the query
+
+        Returns:
+            object: Value returned by the query
+        """
+        with self._lock:
+            return self._connection.execute(
+                str_query, tuple_params).fetchone()[0]
+
+    def _fetch_names(self, str_query, tuple_params=()):
+        """Run query which returns names of the screenshots
+
+        Args:
+            str_query (str): SQL query
+            tuple_params (tuple, optional): Parameters of the query
+
+        Returns:
+            list: Names of the screenshots
+        """
+        with self._lock:
+            return [
+                tuple_row[0]
+                for tuple_row in self._connection.execute(
+                    str_query, tuple_params)
+            ]
@@ -0,0 +1,234 @@
+"""File with the interface of the storages of the screenshots files"""
+# Standard library imports
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Third party imports
+
+# Local imports
+from .additional import get_screenshot_num_from_name
+from .additional import is_screenshot_filename
+from .class_deletion_engine import DeletionEngine
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+class ScreenshotsStorage(object):
+    """Interface of the storage which keeps contents of the screenshots
+
+    Screenshots are stored by names like "<number>_<description>.png".
+    Numbers, locks and the index of the handler are still kept in
+    the directory of the screenshots on the local disk.
+    To create your own storage override all methods except get_name_by_num.
+    """
+
+    def open(self, str_path_dir_with_screenshots):
+        """Start working with the directory of the screenshots
+
+        Args:
+            str_path_dir_with_screenshots (str): Directory of the handler
+        """
+        raise NotImplementedError
+
+    def put(self, str_name, bytes_content):
+        """Save the screenshot
+
+        Args:
+            str_name (str): Name of the screenshot
+            bytes_content (bytes): Content of the screenshot
+
+        Returns:
+            str: Location of the saved screenshot
+        """
+        raise NotImplementedError
+
+    def get(self, str_name):
+        """Read content of the screenshot
+
+        Args:
+            str_name (str): Name of the screenshot
+
+        Returns:
+            bytes: Content of the screenshot or None if there is no one
+        """
+        raise NotImplementedError
+
+    def stat(self, str_name):
+        """Get size and modification time of the screenshot
+
+        Args:
+            str_name (str): Name of the screenshot
+
+        Returns:
+            tuple: (size in bytes, mtime) or None if there is no screenshot
+        """
+        raise NotImplementedError
+
+    def list(self):
+        """Iterate over all screenshots in the storage
+
+        Yields:
+            tuple: (name, size in bytes, mtime)
+        """
+        raise NotImplementedError
+
+    def delete(self, list_names):
+        """Delete screenshots, missing ones are skipped
+
+        Args:
+            list_names (list): Names of the screenshots
+
+        Returns:
+            int: Number of the deleted screenshots
+        """
+        raise NotImplementedError
+
+    def get_location(self, str_name):
+        """Get location of the screenshot to show to the user
+
+        Args:
+            str_name (str): Name of the screenshot
+
+        Returns:
+            str: Path or URL which ends with "/<name>"
+        """
+        raise NotImplementedError
+
+    def get_name_by_num(self, int_screenshot_num):
+        """Find name of the screenshot with given number
+
+        Args:
+            int_screenshot_num (int): Number of the screenshot
+
+        Returns:
+            str: Name of the screenshot or None if it's not found
+        """
+        for str_name, _, _ in self.list():
+            if get_screenshot_num_from_name(str_name) == int_screenshot_num:
+                return str_name
+        return None
+
+    def close(self):
+        """Save everything and free resources of the storage
+        """
+
+
+class LocalStorage(ScreenshotsStorage):
+    """Storage which saves every screenshot as a file in a local directory
+
+    It's useful to keep screenshots in another directory than numbers
+    and locks of the handler, E.G. on tmpfs.
+    """
+
+    def __init__(self, str_path_dir="", int_deletion_threads=8):
+        """Init storage, it starts working only after call of open(...)
+
+        Args:
+            str_path_dir (str, optional): Directory for the screenshots. \
+                By default it's the directory of the handler.
+            int_deletion_threads (int, optional): Number of the threads \
+                which delete many screenshots at once
+        """
+        self.str_path_dir = str_path_dir
+        self.deletion_engine = \
+            DeletionEngine(int_threads=int_deletion_threads)
+
+    def open(self, str_path_dir_with_screenshots):
+        self.str_path_dir = \
+            os.path.abspath(self.str_path_dir or str_path_dir_with_screenshots)
+        os.makedirs(self.str_path_dir, exist_ok=True)
+
+    def put(self, str_name, bytes_content):
+        str_path = self.get_location(str_name)
+        with open(str_path, "wb") as file_handle:
+            file_handle.write(bytes_content)
+        return str_path
+
+    def get(self, str_name):
+        try:
+            with open(self.get_location(str_name), "rb") as file_handle:
+                return file_handle.read()
+        except FileNotFoundError:
+            return None
+
+    def stat(self, str_name):
+        try:
+            stat_result = os.stat(self.get_location(str_name))
+        except FileNotFoundError:
+            return None
+        return stat_result.st_size, stat_result.st_mtime
+
+    def list(self):
+        with os.scandir(self.str_path_dir) as iter_entries:
+            for dir_entry in iter_entries:
+                if is_screenshot_filename(dir_entry.name) and \
+                dir_entry.is_file():
+                    stat_result = dir_entry.stat()
+                    yield \
+                        dir_entry.name, stat_result.st_size, \
+                        stat_result.st_mtime
+
+    def delete(self, list_names):
+        return self.deletion_engine.delete_files(self.str_path_dir, list_names)
+
+    def get_location(self, str_name):
+        return os.path.join(self.str_path_dir, str_name)
+
+    def close(self):
+        self.deletion_engine.close()
+
+
+class MemoryStorage(ScreenshotsStorage):
+    """Storage which keeps screenshots only in memory, E.G. for tests
+
+    Screenshots are lost when the process ends.
+    """
+
+    def __init__(self):
+        """Init empty storage"""
+        self._lock = threading.Lock()
+        # {name: (content, mtime)} in order of saving
+        self._dict_screenshot_by_name = OrderedDict()
+
+    def open(self, str_path_dir_with_screenshots):
+        pass
+
+    def put(self, str_name, bytes_content):
+        with self._lock:
+            self._dict_screenshot_by_name[str_name] = \
+                (bytes_content, time.time())
+        return self.get_location(str_name)
+
+    def get(self, str_name):
+        with self._lock:
+            tuple_screenshot = self._dict_screenshot_by_name.get(str_name)
+        return tuple_screenshot[0] if tuple_screenshot else None
+
+    def stat(self, str_name):
+        with self._lock:
+            tuple_screenshot = self._dict_screenshot_by_name.get(str_name)
+        if tuple_screenshot is None:
+            return None
+        return len(tuple_screenshot[0]), tuple_screenshot[1]
+
+    def list(self):
+        with self._lock:
+            list_tuples_screenshots = \
+                list(self._dict_screenshot_by_name.items())
+        for str_name, (bytes_content, float_mtime) in list_tuples_screenshots:
+            yield str_name, len(bytes_content), float_mtime
+
+    def delete(self, list_names):
+        int_deleted = 0
+        with self._lock:
+            for str_name in list_names:
+                if self._dict_screenshot_by_name.pop(str_name, None):
+                    int_deleted += 1
+        return int_deleted
+
+    def get_location(self, str_name):
+        return "memory://" + str_name
@@ -0,0 +1,154 @@
+"""File with functions to crop elements and regions from the screenshots"""
+# Standard library imports
+import io
+import math
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import import_optional_module
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+# One call returns rectangles of all elements in the viewport and the scale
+STR_JS_GET_ELEMENTS_RECTS = (
+    "return [window.devicePixelRatio || 1].concat(arguments[0].map("
+    "function (element) {"
+    "var rect = element.getBoundingClientRect();"
+    "return [rect.left, rect.top, rect.width, rect.height];"
+    "}));"
+)
+
+
+def is_region(element_or_region):
+    """Check if the value is a region (x, y, width, height) not an element
+
+    Args:
+        element_or_region (object): Webdriver element or region
+
+    Returns:
+        bool: True if it's a region
+    """
+    return isinstance(element_or_region, (tuple, list)) and \
+        len(element_or_region) == 4
+
+
+def get_regions_of_elements(webdriver, list_elements_or_regions):
+    """Get regions in pixels of the screenshot for elements and regions
+
+    Rectangles of all elements are got by one call to the webdriver.
+
+    Args:
+        webdriver (selenium.webdriver): Selenium Webdriver
+        list_elements_or_regions (list): Elements of the webdriver or \
+            regions (x, y, width, height) in pixels of the screenshot
+
+    Raises:
+        SeleniumScreenshotsError: Unable to get rectangles of the elements
+
+    Returns:
+        list: Regions (x, y, width, height) in the same order
+    """
+    list_elements = [
+        element_or_region for element_or_region in list_elements_or_regions
+        if not is_region(element_or_region)
+    ]
+    list_elements_regions = []
+    if list_elements:
+        try:
+            list_scale_and_rects = webdriver.execute_script(
+                STR_JS_GET_ELEMENTS_RECTS, list_elements)
+        except Exception as ex:
+            LOGGER.error("Unable to get rectangles of the elements")
+            raise SeleniumScreenshotsError(str(ex))
+        # Rectangles are in CSS pixels, screenshot is in device pixels
+        float_scale = float(list_scale_and_rects[0])
+        list_elements_regions = [
+            tuple(float(value) * float_scale for value in list_rect)
+            for list_rect in list_scale_and_rects[1:]
+        ]
+    iter_elements_regions = iter(list_elements_regions)
+    return [
+        tuple(element_or_region) if is_region(element_or_region)
+        else next(iter_elements_regions)
+        for element_or_region in list_elements_or_regions
+    ]
+
+
+def crop_png_to_regions(bytes_png, list_regions, int_threads=4):
+    """Crop many regions from the screenshot, decoding it only once
+
+    Crops are encoded to PNG in threads, as zlib releases GIL.
+
+    Args:
+        bytes_png (bytes): PNG content of the screenshot
+        list_regions (list): Regions (x, y, width, height) in pixels
+        int_threads (int, optional): Number of the threads which encode crops
+
+    Raises:
+        SeleniumScreenshotsError: Region is outside of the screenshot
+
+    Returns:
+        list: PNG contents of the crops in the same order
+    """
+    Image = import_optional_module("PIL.Image")
+    with Image.open(io.BytesIO(bytes_png)) as image:
+        image.load()
+    list_boxes = [
+        get_box_inside_image(tuple_region, image.width, image.height)
+        for tuple_region in list_regions
+    ]
+    if len(list_boxes) == 1:
+        return [get_png_of_crop(image, list_boxes[0])]
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(int_threads, len(list_boxes))),
+            thread_name_prefix="selenium_screenshots_crop",
+    ) as executor:
+        return list(executor.map(
+            lambda tuple_box: get_png_of_crop(image, tuple_box), list_boxes))
+
+
+def get_box_inside_image(tuple_region, int_image_width, int_image_height):
+    """Convert region to the box of Pillow cut by the image borders
+
+    Args:
+        tuple_region (tuple): (x, y, width, height) in pixels
+        int_image_width (int): Width of the image
+        int_image_height (int): Height of the image
+
+    Raises:
+        SeleniumScreenshotsError: Region is outside of the image
+
+    Returns:
+        tuple: (left, upper, right, lower)
+    """
+    float_x, float_y, float_width, float_height = tuple_region
+    tuple_box = (
+        max(0, int(math.floor(float_x))),
+        max(0, int(math.floor(float_y))),
+        min(int_image_width, int(math.ceil(float_x + float_width))),
+        min(int_image_height, int(math.ceil(float_y + float_height))),
+    )
+    if tuple_box[0] >= tuple_box[2] or tuple_box[1] >= tuple_box[3]:
+        raise SeleniumScreenshotsError(
+            "Region %s is outside of the screenshot %dx%d" % (
+                tuple_region, int_image_width, int_image_height))
+    return tuple_box
+
+
+def get_png_of_crop(image, tuple_box):
+    """Crop the image and encode the crop to PNG
+
+    Args:
+        image (PIL.Image.Image): Decoded screenshot
+        tuple_box (tuple): (left, upper, right, lower)
+
+    Returns:
+        bytes: PNG content of the crop
+    """
+    bytes_io = io.BytesIO()
+    image.crop(tuple_box).save(bytes_io, format="PNG")
+    return bytes_io.getvalue()
@@ -0,0 +1,91 @@
+"""File with the sorting of many items with limited memory
+
+Items are collected to runs of limited size, every full run is sorted
+and saved to a temporary file, then all runs are merged. So only one
+run and one item of every saved run are kept in memory at once.
+"""
+# Standard library imports
+import heapq
+import pickle
+import logging
+import tempfile
+import contextlib
+
+# Third party imports
+
+# Local imports
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+def iter_sorted_by_runs(iter_items, func_key, int_run_size):
+    """Iterate over the given items in sorted order
+
+    Items are read only once, temporary files are deleted when
+    the iteration is finished or the iterator is closed.
+
+    Args:
+        iter_items (iterable): Items to sort, they should be picklable
+        func_key (function): Function which gets key of the item
+        int_run_size (int): Max number of the items sorted in memory
+
+    Yields:
+        object: Items sorted by the key
+    """
+    with contextlib.ExitStack() as exit_stack:
+        list_iterators_of_runs = []
+        list_run = []
+        for item in iter_items:
+            list_run.append(item)
+            if len(list_run) >= int_run_size:
+                file_run = exit_stack.enter_context(tempfile.TemporaryFile())
+                save_sorted_run(file_run, list_run, func_key)
+                list_iterators_of_runs.append(iter_saved_run(file_run))
+                list_run = []
+        list_run.sort(key=func_key)
+        if not list_iterators_of_runs:
+            yield from list_run
+            return None
+        LOGGER.debug(
+            "Merge sorted runs saved to files: %d",
+            len(list_iterators_of_runs)
+        )
+        list_iterators_of_runs.append(iter(list_run))
+        yield from heapq.merge(*list_iterators_of_runs, key=func_key)
+    return None
+
+
+def save_sorted_run(file_run, list_run, func_key):
+    """Sort items and save them to the file one by one
+
+    Args:
+        file_run (file): Binary file opened for writing and reading
+        list_run (list): Items to save
+        func_key (function): Function which gets key of the item
+    """
+    list_run.sort(key=func_key)
+    pickler = pickle.Pickler(file_run, protocol=pickle.HIGHEST_PROTOCOL)
+    for item in list_run:
+        pickler.dump(item)
+        # Memo would keep references to all saved items
+        pickler.clear_memo()
+    file_run.flush()
+
+
+def iter_saved_run(file_run):
+    """Iterate over items saved to the file by save_sorted_run(...)
+
+    Args:
+        file_run (file): Binary file with the saved items
+
+    Yields:
+        object: Saved items in the same order
+    """
+    file_run.seek(0)
+    unpickler = pickle.Unpickler(file_run)
+    while True:
+        try:
+            yield unpickler.load()
+        except EOFError:
+            return None
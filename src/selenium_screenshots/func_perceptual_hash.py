@@ -0,0 +1,97 @@
+"""File with functions to compute perceptual hashes of the screenshots"""
+# Standard library imports
+import io
+import logging
+
+# Third party imports
+
+# Local imports
+from .additional import import_optional_module
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+def import_numpy_and_pillow():
+    """Import optional dependencies needed to work with images
+
+    Raises:
+        SeleniumScreenshotsError: numpy or Pillow is not installed
+
+    Returns:
+        tuple: (numpy module, PIL.Image module)
+    """
+    return \
+        import_optional_module("numpy"), import_optional_module("PIL.Image")
+
+
+def get_small_grayscale_image(bytes_or_path_image, int_hash_size=8):
+    """Decode image and resize it to the size needed for difference hash
+
+    Args:
+        bytes_or_path_image (bytes or str): Content of the image or path
+        int_hash_size (int, optional): Side of the hash in bits
+
+    Returns:
+        numpy.ndarray: Array with shape (int_hash_size, int_hash_size + 1)
+    """
+    numpy, Image = import_numpy_and_pillow()
+    if isinstance(bytes_or_path_image, bytes):
+        bytes_or_path_image = io.BytesIO(bytes_or_path_image)
+    with Image.open(bytes_or_path_image) as image:
+        # draft() lets decoder of some formats skip not needed pixels
+        image.draft("L", (int_hash_size + 1, int_hash_size))
+        image_small = image.convert("L").resize(
+            (int_hash_size + 1, int_hash_size), Image.BILINEAR)
+    return numpy.asarray(image_small, dtype=numpy.int16)
+
+
+def get_difference_hashes(list_small_images):
+    """Compute difference hashes for many small images at once
+
+    Every bit of the hash shows if a pixel is brighter than the next one.
+
+    Args:
+        list_small_images (list): Arrays from get_small_grayscale_image(...)
+
+    Returns:
+        list: Hashes as python ints
+    """
+    if not list_small_images:
+        return []
+    numpy, _ = import_numpy_and_pillow()
+    array_images = numpy.stack(list_small_images)
+    array_bits = (array_images[:, :, 1:] > array_images[:, :, :-1])
+    array_bits = array_bits.reshape(len(list_small_images), -1)
+    array_bytes = numpy.packbits(array_bits, axis=1)
+    return [
+        int.from_bytes(array_row.tobytes(), "big")
+        for array_row in array_bytes
+    ]
+
+
+def get_difference_hash(bytes_or_path_image, int_hash_size=8):
+    """Compute difference hash of the image
+
+    Args:
+        bytes_or_path_image (bytes or str): Content of the image or path
+        int_hash_size (int, optional): Side of the hash in bits
+
+    Returns:
+        int: Hash of the image with int_hash_size ** 2 bits
+    """
+    return get_difference_hashes([
+        get_small_grayscale_image(bytes_or_path_image, int_hash_size)])[0]
+
+
+def get_hamming_distance(int_hash_1, int_hash_2):
+    """Get number of different bits in two hashes
+
+    Args:
+        int_hash_1 (int): First hash
+        int_hash_2 (int): Second hash
+
+    Returns:
+        int: Number of different bits
+    """
+    return bin(int_hash_1 ^ int_hash_2).count("1")
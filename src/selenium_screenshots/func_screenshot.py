@@ -1,18 +1,27 @@
 """Main file of this python package with the class Screenshots"""
 # Standard library imports
+import os
+import atexit
 import logging
+import threading
+from collections import OrderedDict
 
 # Third party imports
-from char import char
 
 # Local imports
 from .class_screenshots import Screenshots
+from .additional import get_png_from_webdriver
+from .additional import char_if_strict
 
 
 LOGGER = logging.getLogger("selenium_screenshots")
+INT_MAX_CACHED_HANDLERS = 16
+# {absolute_path_to_dir: Screenshots, ...} from least to most recently used
+DICT_CACHED_HANDLER_BY_DIR = OrderedDict()
+LOCK_CACHED_HANDLERS = threading.Lock()
 
 
-@char
+@char_if_strict
 def make_screenshot(
         webdriver,
         str_description="",
@@ -20,6 +29,9 @@ def make_screenshot(
 ):
     """Create a screenshot without initializing a class obj
 
+    Handlers are cached by directory, so only the first call for
+    a directory has to scan it. Cached handlers don't keep webdrivers.
+
     Args:
         webdriver (selenium.webdriver): \
             webdriver which to use for creation of screenshot
@@ -27,9 +39,60 @@ def make_screenshot(
             Additional description of the screenshot
         str_path_dir_with_screenshots (str, optional): \
             Path to directory where to save screenshot
+
+    Returns:
+        str: Path to the new screenshot
     """
-    screenshot_obj = Screenshots(
-        webdriver,
-        str_path_dir_with_screenshots=str_path_dir_with_screenshots
+    screenshot_obj = _get_cached_handler(str_path_dir_with_screenshots)
+    return screenshot_obj.save_screenshot(
+        get_png_from_webdriver(webdriver),
+        str_description=str_description,
     )
-    screenshot_obj.create_screenshot(str_description=str_description)
+
+
+def clear_cached_handlers():
+    """Close and forget all handlers cached by make_screenshot(...)
+    """
+    with LOCK_CACHED_HANDLERS:
+        list_handlers = list(DICT_CACHED_HANDLER_BY_DIR.values())
+        DICT_CACHED_HANDLER_BY_DIR.clear()
+    for screenshot_obj in list_handlers:
+        screenshot_obj.close()
+
+
+def _get_cached_handler(str_path_dir_with_screenshots):
+    """Get handler for the directory, create it if it's not cached yet
+
+    Args:
+        str_path_dir_with_screenshots (str): Path to directory
+
+    Returns:
+        Screenshots: Handler of the screenshots in the directory
+    """
+    str_path_dir_abs = os.path.abspath(str_path_dir_with_screenshots)
+    list_handlers_to_close = []
+    with LOCK_CACHED_HANDLERS:
+        screenshot_obj = DICT_CACHED_HANDLER_BY_DIR.get(str_path_dir_abs)
+        if screenshot_obj is not None and \
+        not os.path.isdir(str_path_dir_abs):
+            # Directory was deleted, so cached numbers are not valid
+            list_handlers_to_close.append(screenshot_obj)
+            screenshot_obj = None
+        if screenshot_obj is None:
+            screenshot_obj = Screenshots(
+                None,
+                str_path_dir_with_screenshots=str_path_dir_abs,
+            )
+            DICT_CACHED_HANDLER_BY_DIR[str_path_dir_abs] = screenshot_obj
+            LOGGER.debug("Cached new handler for dir: %s", str_path_dir_abs)
+        DICT_CACHED_HANDLER_BY_DIR.move_to_end(str_path_dir_abs)
+        while len(DICT_CACHED_HANDLER_BY_DIR) > INT_MAX_CACHED_HANDLERS:
+            _, screenshot_obj_evicted = \
+                DICT_CACHED_HANDLER_BY_DIR.popitem(last=False)
+            list_handlers_to_close.append(screenshot_obj_evicted)
+    for screenshot_obj_to_close in list_handlers_to_close:
+        screenshot_obj_to_close.close()
+    return screenshot_obj
+
+
+atexit.register(clear_cached_handlers)
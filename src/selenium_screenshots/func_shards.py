@@ -0,0 +1,155 @@
+"""File with functions for the sharded layout of the screenshots directory
+
+In the sharded layout screenshot number N is saved in the subdirectory
+"<N // shard_size>", so no directory has more than shard_size screenshots.
+Names of the screenshots are relative paths like "<shard>/<num>_<descr>.png"
+"""
+# Standard library imports
+import os
+import logging
+
+# Third party imports
+
+# Local imports
+from .exceptions import SeleniumScreenshotsError
+from .additional import char_if_strict
+from .additional import get_screenshot_num_from_name
+from .additional import is_screenshot_filename
+from .class_screenshots_index import ScreenshotsIndex
+
+
+LOGGER = logging.getLogger("selenium_screenshots")
+
+
+def get_shard_name(int_screenshot_num, int_shard_size):
+    """Get name of the shard directory for the screenshot
+
+    Args:
+        int_screenshot_num (int): Number of the screenshot
+        int_shard_size (int): Max number of the screenshots in one shard
+
+    Returns:
+        str: Name of the shard directory
+    """
+    return str(int_screenshot_num // int_shard_size)
+
+
+def is_shard_dir_name(str_name):
+    """Check if the directory with given name can be a shard
+
+    Args:
+        str_name (str): Name of the directory
+
+    Returns:
+        bool: True if it's a name of a shard
+    """
+    return str_name.isdigit()
+
+
+def iter_screenshots_dir_entries(str_path_dir_with_screenshots, is_sharded):
+    """Iterate over all screenshots files in the directory
+
+    Args:
+        str_path_dir_with_screenshots (str): Directory with screenshots
+        is_sharded (bool): Flag if to look for screenshots in shards too
+
+    Yields:
+        tuple: (name of the screenshot, os.DirEntry)
+    """
+    list_shards_dirs_names = []
+    with os.scandir(str_path_dir_with_screenshots) as iter_entries:
+        for dir_entry in iter_entries:
+            if is_screenshot_filename(dir_entry.name):
+                if dir_entry.is_file():
+                    yield dir_entry.name, dir_entry
+            elif is_sharded and is_shard_dir_name(dir_entry.name) and \
+            dir_entry.is_dir():
+                list_shards_dirs_names.append(dir_entry.name)
+    for str_shard_name in list_shards_dirs_names:
+        try:
+            iter_shard_entries = os.scandir(
+                os.path.join(str_path_dir_with_screenshots, str_shard_name))
+        except FileNotFoundError:
+            # Shard was deleted by rotation in the meantime
+            continue
+        with iter_shard_entries:
+            for dir_entry in iter_shard_entries:
+                if is_screenshot_filename(dir_entry.name) and \
+                dir_entry.is_file():
+                    yield str_shard_name + "/" + dir_entry.name, dir_entry
+
+
+@char_if_strict
+def migrate_screenshots_layout(
+        str_path_dir_with_screenshots="screenshots",
+        int_shard_size=1000,
+):
+    """Move screenshots in the directory to the layout with given shard size
+
+    Screenshots are only renamed, so it's fast on one filesystem.
+    Index of the screenshots (if it's used) is dropped, it's rebuilt
+    on the next start of the handler. Don't create screenshots in the
+    directory while it's migrated.
+
+    Args:
+        str_path_dir_with_screenshots (str, optional): \
+            Path to directory with screenshots
+        int_shard_size (int, optional): Max number of the screenshots in \
+            one shard. If 0 then screenshots are moved to the flat layout.
+
+    Raises:
+        SeleniumScreenshotsError: Wrong shard size
+
+    Returns:
+        int: Number of the moved screenshots
+    """
+    if int_shard_size < 0:
+        raise SeleniumScreenshotsError("Shard size can't be negative")
+    list_tuples_name_and_entry = list(iter_screenshots_dir_entries(
+        str_path_dir_with_screenshots, is_sharded=True))
+    set_created_shards = set()
+    int_moved_screenshots = 0
+    for str_screen_name, dir_entry in list_tuples_name_and_entry:
+        int_screen_num = get_screenshot_num_from_name(str_screen_name)
+        if int_screen_num is None:
+            LOGGER.warning(
+                "Wrong filename of the screenshot: %s", str_screen_name)
+            continue
+        str_new_screen_name = dir_entry.name
+        if int_shard_size:
+            str_shard_name = get_shard_name(int_screen_num, int_shard_size)
+            str_new_screen_name = str_shard_name + "/" + dir_entry.name
+            if str_shard_name not in set_created_shards:
+                os.makedirs(
+                    os.path.join(
+                        str_path_dir_with_screenshots, str_shard_name),
+                    exist_ok=True
+                )
+                set_created_shards.add(str_shard_name)
+        if str_new_screen_name == str_screen_name:
+            continue
+        os.rename(
+            dir_entry.path,
+            os.path.join(str_path_dir_with_screenshots, str_new_screen_name)
+        )
+        int_moved_screenshots += 1
+    #####
+    # Delete shards left empty
+    with os.scandir(str_path_dir_with_screenshots) as iter_entries:
+        for dir_entry in iter_entries:
+            if is_shard_dir_name(dir_entry.name) and dir_entry.is_dir():
+                try:
+                    os.rmdir(dir_entry.path)
+                except OSError:
+                    pass
+    # Names in the index are not valid anymore
+    str_path_index_file = os.path.join(
+        str_path_dir_with_screenshots, ScreenshotsIndex.STR_INDEX_FILENAME)
+    for str_suffix in ("", "-wal", "-shm"):
+        if os.path.exists(str_path_index_file + str_suffix):
+            os.remove(str_path_index_file + str_suffix)
+    LOGGER.info(
+        "Moved screenshots to the layout with shard size %d: %d",
+        int_shard_size, int_moved_screenshots
+    )
+    return int_moved_screenshots
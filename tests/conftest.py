@@ -0,0 +1,40 @@
+"""Common fixtures for tests of selenium_screenshots"""
+import threading
+
+import pytest
+
+# Smallest valid PNG: 1x1 transparent pixel
+BYTES_PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d00000000"
+    "49454e44ae426082"
+)
+
+
+class FakeWebdriver(object):
+    """Webdriver stub which returns the same PNG on every call"""
+
+    def __init__(self, bytes_png=BYTES_PNG_1X1):
+        self.bytes_png = bytes_png
+        self.int_screenshots_taken = 0
+        self._lock = threading.Lock()
+
+    def get_screenshot_as_png(self):
+        with self._lock:
+            self.int_screenshots_taken += 1
+        return self.bytes_png
+
+    def get_screenshot_as_file(self, filename):
+        with open(filename, "wb") as file_handle:
+            file_handle.write(self.get_screenshot_as_png())
+        return True
+
+
+@pytest.fixture
+def fake_driver():
+    return FakeWebdriver()
+
+
+@pytest.fixture
+def str_screenshots_dir(tmp_path):
+    return str(tmp_path / "screenshots")
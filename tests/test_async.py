@@ -0,0 +1,76 @@
+import os
+import asyncio
+import threading
+from unittest import mock
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import AsyncScreenshots
+from conftest import BYTES_PNG_1X1
+
+
+class FakeAsyncWebdriver(object):
+    """Async webdriver which returns the same screenshot"""
+
+    async def get_screenshot_as_png(self):
+        await asyncio.sleep(0)
+        return BYTES_PNG_1X1
+
+
+def test_async_screenshots(str_screenshots_dir):
+    """"""
+
+    async def create_screenshots():
+        async with await AsyncScreenshots.create(
+                FakeAsyncWebdriver(),
+                str_path_dir_with_screenshots=str_screenshots_dir,
+                int_writer_threads=1,
+        ) as screenshots_handler:
+            return await asyncio.gather(*[
+                screenshots_handler.create_screenshot("async")
+                for _ in range(10)
+            ])
+
+    list_paths = asyncio.run(create_screenshots())
+    assert len(set(list_paths)) == 10, "ERROR: Screenshots names collided"
+    assert all(os.path.exists(str_path) for str_path in list_paths), \
+        "ERROR: Not all screenshots were saved"
+    #####
+    # Source can be a plain callable
+    async def create_screenshot_from_callable():
+        screenshots_handler = AsyncScreenshots(
+            lambda: BYTES_PNG_1X1,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+        )
+        str_path = await screenshots_handler.create_screenshot("sync")
+        await screenshots_handler.close()
+        return str_path
+
+    str_path = asyncio.run(create_screenshot_from_callable())
+    assert os.path.basename(str_path) == "11_sync.png", \
+        "ERROR: Numbering wasn't shared with the existing screenshots"
+
+
+def test_async_handler_is_created_in_executor(str_screenshots_dir):
+    """"""
+    list_thread_names = []
+
+    def get_handler_thread_name(*args, **kwargs):
+        list_thread_names.append(threading.current_thread().name)
+        return Screenshots(*args, **kwargs)
+
+    async def create_handler():
+        with mock.patch(
+                "selenium_screenshots.class_async_screenshots.Screenshots",
+                get_handler_thread_name,
+        ):
+            screenshots_handler = await AsyncScreenshots.create(
+                FakeAsyncWebdriver(),
+                str_path_dir_with_screenshots=str_screenshots_dir,
+            )
+        await screenshots_handler.close()
+        return threading.current_thread().name
+
+    str_loop_thread_name = asyncio.run(create_handler())
+    assert list_thread_names and \
+        list_thread_names[0] != str_loop_thread_name, \
+        "ERROR: Handler was created in the thread of the event loop"
@@ -0,0 +1,68 @@
+import os
+import threading
+from concurrent.futures import Future
+
+from selenium_screenshots import Screenshots
+
+
+def test_background_writer(fake_driver, str_screenshots_dir):
+    """"""
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            int_writer_threads=2,
+            int_max_pending_screenshots=2,
+    ) as screenshots_handler:
+        list_futures = [
+            screenshots_handler.create_screenshot(str_description="bg")
+            for _ in range(10)
+        ]
+        assert all(isinstance(future, Future) for future in list_futures), \
+            "ERROR: Background writer should return futures"
+        assert screenshots_handler.flush(), \
+            "ERROR: Not all screenshots were saved"
+        set_paths = {future.result() for future in list_futures}
+    assert len(set_paths) == 10, "ERROR: Screenshot numbers are not unique"
+    assert all(os.path.exists(str_path) for str_path in set_paths), \
+        "ERROR: Screenshot wasn't saved"
+    assert screenshots_handler._count_screenshots_in_the_directory() == 10, \
+        "ERROR: Wrong number of the screenshots"
+    # Sync mode returns path to the new screenshot
+    screenshots_handler = Screenshots(
+        fake_driver, str_path_dir_with_screenshots=str_screenshots_dir)
+    str_path = screenshots_handler.create_screenshot(str_description="sync")
+    assert os.path.basename(str_path) == "11_sync.png", \
+        "ERROR: Wrong name of the screenshot"
+
+
+def test_rotation_without_lock_of_handler(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=10,
+    )
+    list_is_lock_free = []
+    func_delete_oldest_half = \
+        screenshots_handler._delete_oldest_half_of_screenshots
+
+    def delete_oldest_half():
+        # Another thread should be able to take the lock during rotation
+        def take_lock():
+            is_acquired = screenshots_handler._lock.acquire(timeout=1.0)
+            list_is_lock_free.append(is_acquired)
+            if is_acquired:
+                screenshots_handler._lock.release()
+
+        thread = threading.Thread(target=take_lock)
+        thread.start()
+        thread.join()
+        func_delete_oldest_half()
+
+    screenshots_handler._delete_oldest_half_of_screenshots = \
+        delete_oldest_half
+    for _ in range(11):
+        screenshots_handler.create_screenshot()
+    assert list_is_lock_free == [True], \
+        "ERROR: Rotation holds the lock of the handler"
+    assert screenshots_handler._count_screenshots_in_the_directory() == 6
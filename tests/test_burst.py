@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+
+
+def test_capture_burst(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        is_to_use_index=True,
+    )
+    screenshots_handler.create_screenshot("before")
+    list_paths = screenshots_handler.capture_burst(3, str_description="anim")
+    assert [os.path.basename(str_path) for str_path in list_paths] == \
+        ["2_anim_frame0.png", "3_anim_frame1.png", "4_anim_frame2.png"], \
+        "ERROR: Wrong names of the burst screenshots"
+    assert screenshots_handler.counter.get_screenshots_in_the_dir() == 4, \
+        "ERROR: Wrong number of the screenshots"
+    assert screenshots_handler._count_screenshots_in_the_directory() == 4, \
+        "ERROR: Wrong number of the screenshots"
+
+
+def test_flight_recorder(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_writer_threads=1,
+    )
+    with pytest.raises(ValueError):
+        with screenshots_handler.flight_recorder(int_max_frames=3) as recorder:
+            for int_step in range(5):
+                recorder.record(str_description="step%d" % int_step)
+            assert len(recorder) == 3, "ERROR: Ring buffer is not bounded"
+            raise ValueError("test failed")
+    screenshots_handler.close()
+    assert sorted(
+        str_name for str_name in os.listdir(str_screenshots_dir)
+        if str_name.endswith(".png")
+    ) == ["1_step2.png", "2_step3.png", "3_step4.png"], \
+        "ERROR: Wrong screenshots were dumped"
+    assert fake_driver.int_screenshots_taken == 5, \
+        "ERROR: Wrong number of captures"
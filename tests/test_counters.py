@@ -0,0 +1,149 @@
+import os
+import multiprocessing
+
+import pytest
+from local_simple_database import LocalSimpleDatabase
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import MemoryScreenshotsCounter
+from selenium_screenshots import ProcessSafeScreenshotsCounter
+
+
+def test_memory_counter(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        counter=MemoryScreenshotsCounter(
+            int_changes_to_persist=1000,
+            float_seconds_to_persist=1000.0,
+        ),
+    )
+    for _ in range(5):
+        screenshots_handler.create_screenshot(str_description="mem")
+    assert screenshots_handler.LSD["int_last_screenshot_num"] == 0, \
+        "ERROR: Counter shouldn't be saved before flush"
+    assert screenshots_handler.counter.get_screenshots_in_the_dir() == 5, \
+        "ERROR: Wrong number of the screenshots"
+    #####
+    # Handler wasn't closed as after a crash, numbers are taken from disk
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        counter=MemoryScreenshotsCounter(),
+    )
+    str_path = screenshots_handler.create_screenshot(str_description="mem")
+    assert os.path.basename(str_path) == "6_mem.png", \
+        "ERROR: Numbering wasn't restored from the disk"
+    screenshots_handler.close()
+    assert screenshots_handler.LSD["int_last_screenshot_num"] == 6, \
+        "ERROR: Counter wasn't saved on close"
+    assert screenshots_handler.LSD["int_screenshots_in_the_dir"] == 6, \
+        "ERROR: Counter wasn't saved on close"
+
+
+def _create_screenshots_in_process(str_screenshots_dir, int_screenshots):
+    from conftest import FakeWebdriver
+    screenshots_handler = Screenshots(
+        FakeWebdriver(),
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_writer_threads=2,
+        counter=ProcessSafeScreenshotsCounter(int_block_size=7),
+    )
+    with screenshots_handler:
+        for _ in range(int_screenshots):
+            screenshots_handler.create_screenshot(str_description="proc")
+
+
+def test_process_safe_counter(str_screenshots_dir):
+    """"""
+    list_processes = [
+        multiprocessing.Process(
+            target=_create_screenshots_in_process,
+            args=(str_screenshots_dir, 25),
+        )
+        for _ in range(4)
+    ]
+    for process in list_processes:
+        process.start()
+    for process in list_processes:
+        process.join()
+        assert process.exitcode == 0, "ERROR: Worker process failed"
+    list_screens_names = [
+        str_name for str_name in os.listdir(str_screenshots_dir)
+        if str_name.endswith(".png")
+    ]
+    assert len(list_screens_names) == 100, \
+        "ERROR: Screenshots of different processes overwrote each other"
+    screenshots_handler = Screenshots(
+        None,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        counter=ProcessSafeScreenshotsCounter(),
+    )
+    assert screenshots_handler.counter.get_screenshots_in_the_dir() == 100, \
+        "ERROR: Wrong number of the screenshots"
+
+
+def _create_screenshots_after_barrier(
+        str_screenshots_dir,
+        int_screenshots,
+        int_screenshots_to_delete_half,
+        barrier,
+):
+    from conftest import FakeWebdriver
+    barrier.wait()
+    with Screenshots(
+            FakeWebdriver(),
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            int_screenshots_to_delete_half=int_screenshots_to_delete_half,
+            counter=ProcessSafeScreenshotsCounter(int_block_size=7),
+    ) as screenshots_handler:
+        for _ in range(int_screenshots):
+            screenshots_handler.create_screenshot(str_description="proc")
+
+
+@pytest.mark.parametrize("int_screenshots_to_delete_half", [9999, 60])
+def test_process_safe_count_of_screenshots(
+        str_screenshots_dir,
+        int_screenshots_to_delete_half,
+):
+    """"""
+    os.makedirs(str_screenshots_dir)
+    barrier = multiprocessing.Barrier(8)
+    list_processes = [
+        multiprocessing.Process(
+            target=_create_screenshots_after_barrier,
+            args=(
+                str_screenshots_dir,
+                30,
+                int_screenshots_to_delete_half,
+                barrier,
+            ),
+        )
+        for _ in range(8)
+    ]
+    for process in list_processes:
+        process.start()
+    for process in list_processes:
+        process.join()
+        assert process.exitcode == 0, "ERROR: Worker process failed"
+    int_screenshots_on_disk = len([
+        str_name for str_name in os.listdir(str_screenshots_dir)
+        if str_name.endswith(".png")
+    ])
+    if int_screenshots_to_delete_half == 9999:
+        assert int_screenshots_on_disk == 240
+    else:
+        # Every rotation deletes the same number of the oldest screenshots,
+        # so lost or double deletions break the multiple
+        int_screens_deleted_by_rotation = int_screenshots_to_delete_half // 2
+        assert (240 - int_screenshots_on_disk) % \
+            int_screens_deleted_by_rotation == 0, \
+            "ERROR: Rotations lost or repeated deletions of the screenshots"
+        assert int_screens_deleted_by_rotation <= int_screenshots_on_disk \
+            <= int_screenshots_to_delete_half + \
+            int_screens_deleted_by_rotation, \
+            "ERROR: Wrong number of the screenshots after the rotations"
+    assert LocalSimpleDatabase(str_screenshots_dir)[
+        "int_screenshots_in_the_dir"] == int_screenshots_on_disk, \
+        "ERROR: Processes overwrote the shared number of the screenshots"
@@ -0,0 +1,55 @@
+import io
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class FakeElement(object):
+    """Element stub with a rectangle in CSS pixels"""
+
+    def __init__(self, list_rect):
+        self.list_rect = list_rect
+
+
+def execute_script_with_scale_2(str_script, list_elements):
+    """Return scale and rectangles of the elements like the browser"""
+    return [2] + [element.list_rect for element in list_elements]
+
+
+def test_element_screenshots(fake_driver, str_screenshots_dir):
+    """"""
+    image = Image.new("RGB", (200, 100), (255, 255, 255))
+    image.paste((255, 0, 0), (20, 10, 60, 30))
+    bytes_io = io.BytesIO()
+    image.save(bytes_io, "PNG")
+    fake_driver.bytes_png = bytes_io.getvalue()
+    fake_driver.execute_script = execute_script_with_scale_2
+    screenshots_handler = Screenshots(
+        fake_driver, str_path_dir_with_screenshots=str_screenshots_dir)
+    str_path = screenshots_handler.create_screenshot(
+        "button", element=FakeElement([10, 5, 20, 10]))
+    assert os.path.basename(str_path) == "1_button.png"
+    with Image.open(str_path) as image_crop:
+        assert image_crop.size == (40, 20), "ERROR: Wrong size of the crop"
+        assert image_crop.getcolors() == [(800, (255, 0, 0))], \
+            "ERROR: Element wasn't cropped"
+    #####
+    # Many elements and regions are cropped from one capture
+    int_screenshots_taken = fake_driver.int_screenshots_taken
+    list_paths = screenshots_handler.create_element_screenshots(
+        [FakeElement([0, 0, 10, 10]), (150, 50, 100, 100)], "form")
+    assert fake_driver.int_screenshots_taken == int_screenshots_taken + 1, \
+        "ERROR: Webdriver was called more than once"
+    assert [os.path.basename(str_path) for str_path in list_paths] == \
+        ["2_form_element0.png", "3_form_element1.png"]
+    with Image.open(list_paths[1]) as image_crop:
+        assert image_crop.size == (50, 50), \
+            "ERROR: Region wasn't cut by the borders of the screenshot"
+    with pytest.raises(SeleniumScreenshotsError):
+        screenshots_handler.create_screenshot(
+            "hidden", tuple_region=(300, 0, 10, 10))
@@ -0,0 +1,73 @@
+import os
+import hashlib
+from unittest import mock
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import class_recent_content_hashes
+from selenium_screenshots.class_recent_content_hashes import \
+    RecentContentHashes
+
+
+def test_dedup_on_capture(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        str_dedup_mode="skip",
+    )
+    str_path_first = screenshots_handler.create_screenshot("poll")
+    str_path_second = screenshots_handler.create_screenshot("poll")
+    assert str_path_first == str_path_second, \
+        "ERROR: Same screenshot was saved twice"
+    fake_driver.bytes_png = fake_driver.bytes_png + b"changed"
+    str_path_third = screenshots_handler.create_screenshot("poll")
+    assert os.path.basename(str_path_third) == "2_poll.png", \
+        "ERROR: Changed screenshot wasn't saved"
+    # Deleted screenshot is not used for dedup
+    screenshots_handler.delete_all_screenshots()
+    str_path_fourth = screenshots_handler.create_screenshot("poll")
+    assert os.path.exists(str_path_fourth), "ERROR: Screenshot wasn't saved"
+    #####
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        str_dedup_mode="hardlink",
+    )
+    str_path_first = screenshots_handler.create_screenshot("link")
+    str_path_second = screenshots_handler.create_screenshot("link")
+    assert os.path.samefile(str_path_first, str_path_second), \
+        "ERROR: Same screenshot wasn't hardlinked"
+    assert screenshots_handler._count_screenshots_in_the_directory() == 3, \
+        "ERROR: Wrong number of the screenshots"
+    assert screenshots_handler.int_bytes_written == \
+        len(fake_driver.bytes_png), "ERROR: Hardlink was counted as written"
+
+
+def test_hardlink_takes_no_space(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        str_dedup_mode="hardlink",
+        is_to_use_index=True,
+    )
+    for _ in range(3):
+        screenshots_handler.create_screenshot("link")
+    assert screenshots_handler.get_total_bytes() == \
+        len(fake_driver.bytes_png), "ERROR: Hardlinks were counted as files"
+
+
+def test_content_hash():
+    """"""
+    bytes_content = b"screenshot" * 1000
+    with mock.patch.object(class_recent_content_hashes, "xxhash", None):
+        assert RecentContentHashes.get_content_hash(bytes_content) == \
+            hashlib.blake2b(bytes_content, digest_size=16).digest(), \
+            "ERROR: Wrong fallback hash without xxhash"
+    xxhash = pytest.importorskip("xxhash")
+    assert RecentContentHashes.get_content_hash(bytes_content) == \
+        xxhash.xxh3_128_digest(bytes_content), "ERROR: xxhash isn't used"
+    assert RecentContentHashes.get_content_hash(bytes_content) != \
+        RecentContentHashes.get_content_hash(bytes_content + b"1")
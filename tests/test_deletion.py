@@ -0,0 +1,101 @@
+import os
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots.class_deletion_engine import DeletionEngine
+from selenium_screenshots.class_deletion_engine import get_trash_lock
+
+
+def test_deletion_engine(tmp_path):
+    """"""
+    str_path_dir = str(tmp_path)
+    os.mkdir(os.path.join(str_path_dir, "1"))
+    list_files_names = ["%d.png" % int_num for int_num in range(500)] + \
+        ["1/%d.png" % int_num for int_num in range(100)]
+    for str_file_name in list_files_names:
+        with open(os.path.join(str_path_dir, str_file_name), "wb"):
+            pass
+    deletion_engine = DeletionEngine(int_threads=4, int_files_per_batch=64)
+    int_files_deleted = deletion_engine.delete_files(
+        str_path_dir, list_files_names + ["missing.png", "2/missing.png"])
+    assert int_files_deleted == 600, "ERROR: Wrong number of deleted files"
+    assert os.listdir(str_path_dir) == ["1"], "ERROR: Not all files deleted"
+    assert not os.listdir(os.path.join(str_path_dir, "1")), \
+        "ERROR: Files in subdirectory weren't deleted"
+    assert deletion_engine.get_files_per_second() > 0, \
+        "ERROR: Throughput wasn't measured"
+
+
+def test_delete_all_in_background(fake_driver, str_screenshots_dir):
+    """"""
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            int_shard_size=10,
+            is_to_use_index=True,
+    ) as screenshots_handler:
+        for _ in range(25):
+            screenshots_handler.create_screenshot("page")
+        screenshots_handler.delete_all_screenshots(
+            is_to_delete_in_background=True)
+        assert not screenshots_handler._get_names_of_all_screenshots(), \
+            "ERROR: Screenshots weren't removed from the index"
+        assert not any(
+            str_name.isdigit() for str_name in os.listdir(str_screenshots_dir)
+        ), "ERROR: Shards weren't moved to trash"
+        screenshots_handler.flush()
+        assert not any(
+            str_name.startswith(".screenshots_trash_")
+            for str_name in os.listdir(str_screenshots_dir)
+        ), "ERROR: Trash wasn't deleted"
+        assert screenshots_handler.deletion_engine.int_files_deleted == 25, \
+            "ERROR: Deleted files weren't counted"
+        assert os.path.basename(screenshots_handler.create_screenshot()) == \
+            "26.png", "ERROR: Numbering wasn't continued"
+
+
+def test_orphaned_trash_is_deleted(fake_driver, str_screenshots_dir):
+    """"""
+    str_path_trash_dir = \
+        os.path.join(str_screenshots_dir, ".screenshots_trash_crashed")
+    os.makedirs(os.path.join(str_path_trash_dir, "3"))
+    with open(os.path.join(str_path_trash_dir, "3", "31.png"), "wb"):
+        pass
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+    ) as screenshots_handler:
+        screenshots_handler.flush()
+        assert not os.path.exists(str_path_trash_dir), \
+            "ERROR: Trash left after a crash wasn't deleted"
+        assert not os.path.exists(str_path_trash_dir + ".lock"), \
+            "ERROR: Lock file of the trash wasn't removed"
+
+
+def test_trash_of_running_process_is_not_deleted(
+        fake_driver, str_screenshots_dir):
+    """"""
+    str_path_trash_dir = \
+        os.path.join(str_screenshots_dir, ".screenshots_trash_running")
+    os.makedirs(str_path_trash_dir)
+    # Lock is held by the process which deletes the trash
+    trash_lock = get_trash_lock(str_path_trash_dir)
+    trash_lock.acquire()
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+    ) as screenshots_handler:
+        screenshots_handler.flush()
+        assert os.path.exists(str_path_trash_dir), \
+            "ERROR: Trash of another process was deleted"
+    trash_lock.release()
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+    ) as screenshots_handler:
+        screenshots_handler.flush()
+        assert not os.path.exists(str_path_trash_dir), \
+            "ERROR: Trash wasn't deleted after its process stopped"
+    assert not [
+        str_name for str_name in os.listdir(str_screenshots_dir)
+        if str_name.startswith(".screenshots_trash_")
+    ], "ERROR: Trash or its lock file was left"
@@ -0,0 +1,167 @@
+import io
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import DeltaStorage
+from selenium_screenshots import RetentionPolicy
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+
+Image = pytest.importorskip("PIL.Image")
+numpy = pytest.importorskip("numpy")
+
+
+def get_png_with_square(int_x, int_y):
+    """Get noisy PNG 400x300 with a small black square at the given place"""
+    array_noise = numpy.random.RandomState(0).randint(
+        0, 256, (300, 400, 3), dtype=numpy.uint8)
+    image = Image.fromarray(array_noise, "RGB")
+    image.paste((0, 0, 0), (int_x, int_y, int_x + 5, int_y + 5))
+    bytes_io = io.BytesIO()
+    image.save(bytes_io, "PNG")
+    return bytes_io.getvalue()
+
+
+def test_delta_storage(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        delta_storage=DeltaStorage(int_tile_size=16, int_keyframe_interval=3),
+    )
+    list_bytes_png = [get_png_with_square(int_x, 10) for int_x in range(4)]
+    list_paths = [
+        screenshots_handler.save_screenshot(bytes_png, "step")
+        for bytes_png in list_bytes_png
+    ]
+    assert [os.path.basename(str_path) for str_path in list_paths] == [
+        "1_step.png", "2_step.delta.npz", "3_step.delta.npz", "4_step.png",
+    ], "ERROR: Wrong keyframes or deltas"
+    assert os.path.getsize(list_paths[1]) * 10 < len(list_bytes_png[1]), \
+        "ERROR: Delta is not much smaller than the full screenshot"
+    for int_num, bytes_png in enumerate(list_bytes_png, 1):
+        with Image.open(io.BytesIO(
+                screenshots_handler.materialize(int_num))) as image:
+            array_restored = numpy.asarray(image)
+            assert image.mode == "RGB"
+        with Image.open(io.BytesIO(bytes_png)) as image:
+            assert (array_restored == numpy.asarray(image)).all(), \
+                "ERROR: Screenshot %d wasn't restored" % int_num
+    assert screenshots_handler._count_screenshots_in_the_directory() == 4, \
+        "ERROR: Deltas weren't counted as screenshots"
+    #####
+    # Deltas of the deleted keyframe can't be restored
+    os.remove(list_paths[0])
+    with pytest.raises(SeleniumScreenshotsError):
+        screenshots_handler.materialize(2)
+    with pytest.raises(SeleniumScreenshotsError):
+        screenshots_handler.materialize(100)
+    os.remove(list_paths[3])
+    str_path = screenshots_handler.save_screenshot(list_bytes_png[0], "new")
+    assert str_path.endswith("5_new.png"), \
+        "ERROR: New keyframe wasn't started after deletion of the last one"
+
+
+def test_delta_storage_with_index_and_shards(
+        fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        delta_storage=DeltaStorage(),
+        is_to_use_index=True,
+        int_shard_size=2,
+    )
+    list_paths = screenshots_handler.save_screenshots([
+        (get_png_with_square(50, int_y), "") for int_y in range(3)])
+    assert list_paths[2].endswith(os.path.join("1", "3.delta.npz"))
+    with Image.open(io.BytesIO(screenshots_handler.materialize(3))) as image:
+        assert image.getpixel((50, 2)) == (0, 0, 0)
+    with pytest.raises(SeleniumScreenshotsError):
+        Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            delta_storage=DeltaStorage(),
+            str_dedup_mode="skip",
+        )
+
+
+@pytest.mark.parametrize("dict_kwargs", [
+    {"int_screenshots_to_delete_half": 6},
+    {"int_screenshots_to_delete_half": 6, "is_to_use_index": True},
+    {"retention_policy": RetentionPolicy(int_max_screenshots=5)},
+])
+def test_eviction_keeps_keyframes_of_deltas(
+        fake_driver, str_screenshots_dir, dict_kwargs):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        delta_storage=DeltaStorage(int_tile_size=16, int_keyframe_interval=4),
+        **dict_kwargs
+    )
+    dict_bytes_png_by_num = {}
+    for int_x in range(15):
+        bytes_png = get_png_with_square(int_x, 10)
+        str_path = screenshots_handler.save_screenshot(bytes_png, "step")
+        if os.path.exists(str_path):
+            dict_bytes_png_by_num[int(os.path.basename(str_path).split(
+                "_")[0])] = bytes_png
+    list_names = sorted(
+        (
+            str_name for str_name in os.listdir(str_screenshots_dir)
+            if "_step" in str_name
+        ),
+        key=lambda str_name: int(str_name.split("_")[0]),
+    )
+    assert list_names, "ERROR: All screenshots were deleted"
+    assert list_names[0].endswith(".png"), \
+        "ERROR: Oldest screenshot is a delta without keyframe"
+    assert any(str_name.endswith(".delta.npz") for str_name in list_names)
+    for str_name in list_names:
+        int_num = int(str_name.split("_")[0])
+        with Image.open(io.BytesIO(
+                screenshots_handler.materialize(int_num))) as image:
+            array_restored = numpy.asarray(image)
+        with Image.open(io.BytesIO(dict_bytes_png_by_num[int_num])) as image:
+            assert (array_restored == numpy.asarray(image)).all(), \
+                "ERROR: Screenshot %d wasn't restored" % int_num
+
+
+@pytest.mark.parametrize("is_to_use_index", [False, True])
+def test_deduplication_keeps_keyframes_of_deltas(
+        fake_driver, str_screenshots_dir, is_to_use_index):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        delta_storage=DeltaStorage(int_tile_size=16, int_keyframe_interval=3),
+        is_to_use_index=is_to_use_index,
+    )
+    list_bytes_png = [get_png_with_square(int_x, 10) for int_x in range(7)]
+    for bytes_png in list_bytes_png[:3]:
+        screenshots_handler.save_screenshot(bytes_png, "step")
+    screenshots_handler.delete_not_unique_screenshots()
+    assert sorted(screenshots_handler._get_names_of_all_screenshots()) == \
+        ["1_step.png", "3_step.delta.npz"], \
+        "ERROR: Keyframe of the kept delta was deleted"
+    #####
+    # Near duplicate keyframe is kept only while it has deltas
+    for bytes_png in list_bytes_png[3:]:
+        screenshots_handler.save_screenshot(bytes_png, "other")
+    assert screenshots_handler.delete_near_duplicate_screenshots() == 1
+    list_names = \
+        sorted(screenshots_handler._get_names_of_all_screenshots())
+    assert list_names == [
+        "1_step.png", "3_step.delta.npz",
+        "4_other.png", "5_other.delta.npz", "6_other.delta.npz",
+    ], "ERROR: Wrong near duplicate screenshots were deleted"
+    for str_name in list_names:
+        int_num = int(str_name.split("_")[0])
+        with Image.open(io.BytesIO(
+                screenshots_handler.materialize(int_num))) as image:
+            array_restored = numpy.asarray(image)
+        with Image.open(io.BytesIO(list_bytes_png[int_num - 1])) as image:
+            assert (array_restored == numpy.asarray(image)).all(), \
+                "ERROR: Screenshot %d wasn't restored" % int_num
@@ -0,0 +1,43 @@
+import io
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import JpegEncoder
+from selenium_screenshots import WebpEncoder
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_encoders(fake_driver, str_screenshots_dir):
+    """"""
+    bytes_io = io.BytesIO()
+    Image.new("RGBA", (40, 20), (255, 0, 0, 255)).save(bytes_io, "PNG")
+    fake_driver.bytes_png = bytes_io.getvalue()
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        encoder=WebpEncoder(),
+    )
+    str_path = screenshots_handler.create_screenshot("webp")
+    assert os.path.basename(str_path) == "1_webp.webp", \
+        "ERROR: Wrong name of the encoded screenshot"
+    with Image.open(str_path) as image:
+        assert image.format == "WEBP", "ERROR: Screenshot wasn't encoded"
+    assert screenshots_handler._count_screenshots_in_the_directory() == 1, \
+        "ERROR: Encoded screenshot wasn't counted"
+    #####
+    # Batch is encoded in processes
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            encoder=JpegEncoder(float_scale=0.5),
+            int_encoder_processes=2,
+    ) as screenshots_handler:
+        list_paths = screenshots_handler.capture_burst(3)
+    assert [os.path.basename(str_path) for str_path in list_paths] == \
+        ["2_frame0.jpg", "3_frame1.jpg", "4_frame2.jpg"], \
+        "ERROR: Wrong names of the encoded screenshots"
+    with Image.open(list_paths[0]) as image:
+        assert image.format == "JPEG", "ERROR: Screenshot wasn't encoded"
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import FilenamePolicy
+from selenium_screenshots.additional import \
+    delete_from_file_name_forbidden_characters
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+
+
+def test_default_policy_is_same_as_before():
+    """"""
+    list_texts = ["simple", "a b-c.d/e", "тест ünï_код!", "", "__"]
+    for str_text in list_texts:
+        str_expected = "".join(
+            str_char if str_char.isalnum() else "_"
+            for str_char in str_text
+        )
+        assert FilenamePolicy().sanitize(str_text) == str_expected, \
+            "ERROR: Default policy changed the name: %s" % str_text
+        assert delete_from_file_name_forbidden_characters(str_text) == \
+            str_expected, "ERROR: Old function changed the name"
+
+
+def test_policy_options():
+    """"""
+    policy = FilenamePolicy(
+        str_allowed_characters="-",
+        str_unicode_normalization="NFKD",
+        is_ascii_only=True,
+    )
+    assert policy.sanitize("café-1 2") == "cafe_-1_2", \
+        "ERROR: Wrong name with custom policy"
+    assert policy.sanitize.cache_info().misses == 1
+    policy.sanitize("café-1 2")
+    assert policy.sanitize.cache_info().hits == 1, \
+        "ERROR: Sanitized description wasn't cached"
+    policy_bytes = FilenamePolicy(is_to_limit_bytes=True)
+    str_cut = policy_bytes.truncate("1_" + "я" * 10, 7)
+    assert str_cut == "1_яя", "ERROR: Wrong cut by bytes: %s" % str_cut
+    assert FilenamePolicy().truncate("1_" + "я" * 10, 7) == "1_яяяяя"
+    with pytest.raises(SeleniumScreenshotsError):
+        FilenamePolicy(str_allowed_characters=".")
+    with pytest.raises(SeleniumScreenshotsError):
+        FilenamePolicy(str_unicode_normalization="NFX")
+
+
+def test_screenshots_with_filename_policy(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_max_length_of_filename=9,
+        filename_policy=FilenamePolicy(is_to_limit_bytes=True),
+    )
+    str_path = screenshots_handler.create_screenshot("шаг 1")
+    assert os.path.basename(str_path) == "1_шаг_.png", \
+        "ERROR: Wrong name of the screenshot: %s" % str_path
+    assert len(os.path.basename(str_path)[:-4].encode("utf-8")) <= 9
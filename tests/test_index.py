@@ -0,0 +1,47 @@
+import os
+
+from selenium_screenshots import Screenshots
+
+
+def test_screenshots_index(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=10,
+        is_to_use_index=True,
+    )
+    for int_num in range(11):
+        screenshots_handler.create_screenshot(
+            str_description="same" if int_num % 2 else "")
+    assert screenshots_handler._count_screenshots_in_the_directory() == 6, \
+        "ERROR: Oldest screenshots were not deleted"
+    assert sorted(os.listdir(str_screenshots_dir)) == sorted(
+        screenshots_handler._get_names_of_all_screenshots() +
+        [
+            str_name for str_name in os.listdir(str_screenshots_dir)
+            if ".png" not in str_name
+        ]
+    ), "ERROR: Index doesn't match the directory"
+    screenshots_handler.delete_not_unique_screenshots()
+    assert screenshots_handler._get_names_of_all_screenshots() == \
+        ["7.png", "9.png", "10_same.png", "11.png"], \
+        "ERROR: Wrong screenshots were deleted"
+    #####
+    # Files added without the handler are found after rebuild of the index
+    with open(os.path.join(str_screenshots_dir, "100_x.png"), "wb"):
+        pass
+    assert screenshots_handler.rebuild_index() == 5, \
+        "ERROR: Wrong number of the screenshots after rebuild"
+    screenshots_handler.close()
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        is_to_use_index=True,
+    )
+    str_path = screenshots_handler.create_screenshot(str_description="new")
+    assert os.path.basename(str_path) == "101_new.png", \
+        "ERROR: Numbering wasn't restored from the index"
+    screenshots_handler.delete_all_screenshots()
+    assert screenshots_handler._count_screenshots_in_the_directory() == 0, \
+        "ERROR: Wrong number of the screenshots"
@@ -0,0 +1,114 @@
+import os
+import random
+import datetime
+from unittest import mock
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import MemoryStorage
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+from selenium_screenshots.func_external_sort import iter_sorted_by_runs
+from conftest import BYTES_PNG_1X1
+
+
+@pytest.mark.parametrize(
+    "dict_kwargs",
+    [
+        {},
+        {"is_to_use_index": True},
+        {"int_shard_size": 3},
+        {"storage": MemoryStorage()},
+    ],
+)
+def test_iter_screenshots(fake_driver, str_screenshots_dir, dict_kwargs):
+    """"""
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            **dict_kwargs
+    ) as screenshots_handler:
+        for int_screenshot in range(11):
+            screenshots_handler.save_screenshot(
+                BYTES_PNG_1X1 + bytes(int_screenshot),
+                "login" if int_screenshot % 2 else "search%d" % int_screenshot
+            )
+        # Small batches are merged after one scan of the directory
+        with mock.patch.object(
+                screenshots_handler,
+                "_scan_directory_for_screenshots_rows",
+                wraps=screenshots_handler._scan_directory_for_screenshots_rows,
+        ) as mock_scan:
+            list_records = \
+                list(screenshots_handler.iter_screenshots(int_batch_size=3))
+        assert mock_scan.call_count == \
+            (0 if dict_kwargs.get("is_to_use_index") else 1), \
+            "ERROR: Directory was scanned more than once"
+        assert [record.int_num for record in list_records] == \
+            list(range(1, 12)), "ERROR: Screenshots aren't ordered by number"
+        record = list_records[4]
+        assert record.str_description == "search4"
+        assert record.int_size == len(BYTES_PNG_1X1) + 4
+        assert record.str_path.endswith("/5_search4.png")
+        assert record.str_path == \
+            screenshots_handler._get_screenshot_path(
+                screenshots_handler._get_screenshot_name_by_num(5))
+        assert not hasattr(record, "__dict__"), "ERROR: Record isn't slim"
+        #####
+        # Filters by description and time
+        assert [
+            record.int_num
+            for record in screenshots_handler.iter_screenshots(
+                str_description_glob="search[0-4]", int_batch_size=1)
+        ] == [1, 3, 5]
+        assert len(list(screenshots_handler.iter_screenshots(
+            str_description_glob="log*"))) == 5
+        float_in_hour = (
+            datetime.datetime.now() + datetime.timedelta(hours=1)
+        ).timestamp()
+        assert not list(screenshots_handler.iter_screenshots(
+            float_since=float_in_hour))
+        assert len(list(screenshots_handler.iter_screenshots(
+            float_since=0.0, float_until=float_in_hour))) == 11
+
+
+def test_iter_screenshots_by_mtime(fake_driver, str_screenshots_dir):
+    """"""
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+    ) as screenshots_handler:
+        for int_screenshot in range(5):
+            str_path = screenshots_handler.save_screenshot(BYTES_PNG_1X1)
+            os.utime(str_path, (1000.0 * int_screenshot,) * 2)
+        assert [
+            record.int_num
+            for record in screenshots_handler.iter_screenshots(
+                float_since=1000.0, float_until=3000.0)
+        ] == [2, 3]
+        # Int timestamps are accepted
+        assert [
+            record.int_num
+            for record in screenshots_handler.iter_screenshots(
+                float_since=1000, float_until=3000)
+        ] == [2, 3]
+        assert len(list(
+            screenshots_handler.iter_screenshots(float_since=0))) == 5
+        with pytest.raises(SeleniumScreenshotsError):
+            screenshots_handler.iter_screenshots(float_since="yesterday")
+        with pytest.raises(SeleniumScreenshotsError):
+            screenshots_handler.iter_screenshots(float_until=True)
+        with pytest.raises(SeleniumScreenshotsError):
+            screenshots_handler.iter_screenshots(int_batch_size=0)
+
+
+@pytest.mark.parametrize("int_run_size", [1, 7, 1000])
+def test_iter_sorted_by_runs(int_run_size):
+    """"""
+    list_items = [
+        (random.randint(0, 50), str(int_item)) for int_item in range(200)]
+    iter_sorted = iter_sorted_by_runs(
+        iter(list_items), lambda tuple_item: tuple_item[0], int_run_size)
+    assert list(iter_sorted) == \
+        sorted(list_items, key=lambda tuple_item: tuple_item[0]), \
+        "ERROR: Items weren't sorted or sorting isn't stable"
@@ -0,0 +1,45 @@
+import os
+import sys
+import subprocess
+
+
+def test_lazy_import():
+    """"""
+    str_output = subprocess.check_output([
+        sys.executable, "-c",
+        "import sys\n"
+        "from selenium_screenshots import make_screenshot\n"
+        "print(','.join(sorted(sys.modules)))\n"
+    ]).decode()
+    set_loaded_modules = set(str_output.strip().split(","))
+    for str_module in ("tqdm", "local_simple_database", "sqlite3", "asyncio"):
+        assert str_module not in set_loaded_modules, \
+            "ERROR: Module is imported before use: %s" % str_module
+
+
+def test_bare_import_has_no_side_effects():
+    """"""
+    str_output = subprocess.check_output([
+        sys.executable, "-c",
+        "import sys, logging\n"
+        "import selenium_screenshots\n"
+        "print('char' in sys.modules)\n"
+        "print([type(handler).__name__ for handler in "
+        "logging.getLogger('selenium_screenshots').handlers])\n"
+    ]).decode()
+    assert str_output.split() == ["False", "['NullHandler']"], \
+        "ERROR: Import of the package loads char or adds log handler"
+    #####
+    # char isn't needed at all if validation is off
+    str_output = subprocess.check_output(
+        [
+            sys.executable, "-c",
+            "import sys\n"
+            "from selenium_screenshots import Screenshots\n"
+            "from selenium_screenshots import make_screenshot\n"
+            "print('char' in sys.modules)\n"
+        ],
+        env=dict(os.environ, SELENIUM_SCREENSHOTS_VALIDATION="off"),
+    ).decode()
+    assert str_output.strip() == "False", \
+        "ERROR: char is imported with validation off"
@@ -0,0 +1,41 @@
+import os
+
+from selenium_screenshots import make_screenshot
+from selenium_screenshots import clear_cached_handlers
+from selenium_screenshots import func_screenshot
+
+
+def test_make_screenshot_reuses_handler(fake_driver, str_screenshots_dir):
+    """"""
+    clear_cached_handlers()
+    str_path = make_screenshot(
+        fake_driver, "first", str_path_dir_with_screenshots=str_screenshots_dir)
+    screenshots_handler = \
+        func_screenshot.DICT_CACHED_HANDLER_BY_DIR[str_screenshots_dir]
+    str_path = make_screenshot(
+        fake_driver, "second",
+        str_path_dir_with_screenshots=str_screenshots_dir)
+    assert os.path.basename(str_path) == "2_second.png", \
+        "ERROR: Wrong name of the screenshot"
+    assert screenshots_handler is \
+        func_screenshot.DICT_CACHED_HANDLER_BY_DIR[str_screenshots_dir], \
+        "ERROR: Handler wasn't reused"
+    assert screenshots_handler.webdriver is None, \
+        "ERROR: Cached handler shouldn't keep the webdriver"
+    clear_cached_handlers()
+    assert not func_screenshot.DICT_CACHED_HANDLER_BY_DIR, \
+        "ERROR: Cached handlers were not cleared"
+
+
+def test_make_screenshot_evicts_handlers(fake_driver, tmp_path, monkeypatch):
+    """"""
+    clear_cached_handlers()
+    monkeypatch.setattr(func_screenshot, "INT_MAX_CACHED_HANDLERS", 2)
+    for int_dir in range(3):
+        make_screenshot(
+            fake_driver,
+            str_path_dir_with_screenshots=str(tmp_path / str(int_dir)))
+    assert list(func_screenshot.DICT_CACHED_HANDLER_BY_DIR) == \
+        [str(tmp_path / "1"), str(tmp_path / "2")], \
+        "ERROR: Least recently used handler wasn't evicted"
+    clear_cached_handlers()
@@ -0,0 +1,65 @@
+import socket
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import CallbackMetrics
+from selenium_screenshots import StatsdMetrics
+from selenium_screenshots import HistogramMetrics
+
+
+def test_histogram_metrics(fake_driver, str_screenshots_dir):
+    """"""
+    metrics = HistogramMetrics()
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=4,
+        metrics=metrics,
+    )
+    for _ in range(5):
+        screenshots_handler.create_screenshot("page")
+    dict_summary = metrics.get_summary()
+    for str_phase in (
+            "create_screenshot", "capture", "counter", "name", "write",
+            "rotate", "delete"):
+        assert str_phase in dict_summary["phases"], \
+            "ERROR: Phase wasn't measured: %s" % str_phase
+    assert dict_summary["phases"]["capture"]["count"] == 5, \
+        "ERROR: Wrong number of the measurements"
+    assert dict_summary["counters"] == {
+        "screenshots_created": 5,
+        "bytes_written": 5 * len(fake_driver.bytes_png),
+        "files_evicted": 2,
+        "files_deleted": 2,
+    }, "ERROR: Wrong counters"
+    str_text = metrics.get_prometheus_text()
+    assert 'selenium_screenshots_phase_seconds_count{phase="capture"} 5' in \
+        str_text, "ERROR: Wrong Prometheus text"
+    assert "selenium_screenshots_files_evicted_total 2" in str_text, \
+        "ERROR: Counter isn't in Prometheus text"
+
+
+def test_callback_and_statsd_metrics(fake_driver, str_screenshots_dir):
+    """"""
+    list_calls = []
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        metrics=CallbackMetrics(
+            lambda str_kind, str_name, value:
+            list_calls.append((str_kind, str_name))),
+    )
+    screenshots_handler.create_screenshot()
+    assert ("phase", "write") in list_calls, "ERROR: Callback wasn't called"
+    assert ("counter", "screenshots_created") in list_calls, \
+        "ERROR: Counter wasn't passed to the callback"
+    #####
+    socket_statsd = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    socket_statsd.bind(("127.0.0.1", 0))
+    socket_statsd.settimeout(5)
+    metrics = StatsdMetrics(int_port=socket_statsd.getsockname()[1])
+    metrics.increase_counter("screenshots_created", 3)
+    assert socket_statsd.recv(1024) == \
+        b"selenium_screenshots.screenshots_created:3|c", \
+        "ERROR: Wrong StatsD message"
+    metrics.close()
+    socket_statsd.close()
@@ -0,0 +1,61 @@
+import io
+import os
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots.class_bk_tree import BKTree
+
+numpy = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def _create_png(array_image):
+    bytes_io = io.BytesIO()
+    Image.fromarray(array_image.astype(numpy.uint8)).save(bytes_io, "PNG")
+    return bytes_io.getvalue()
+
+
+@pytest.mark.parametrize("is_to_use_index", [False, True])
+def test_delete_near_duplicate_screenshots(
+        fake_driver, str_screenshots_dir, is_to_use_index):
+    """"""
+    array_page = numpy.tile(numpy.arange(0, 256, 2), (96, 1))
+    array_page_with_cursor = array_page.copy()
+    array_page_with_cursor[10:12, 5] = 255
+    array_other_page = array_page[:, ::-1]
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        is_to_use_index=is_to_use_index,
+    )
+    for str_description, array_image in [
+            ("page", array_page),
+            ("cursor", array_page_with_cursor),
+            ("other", array_other_page),
+            ("page_again", array_page),
+    ]:
+        fake_driver.bytes_png = _create_png(array_image)
+        screenshots_handler.create_screenshot(str_description)
+    with open(os.path.join(str_screenshots_dir, "5_broken.png"), "wb"):
+        pass
+    assert screenshots_handler.delete_near_duplicate_screenshots() == 2, \
+        "ERROR: Wrong number of near duplicates"
+    assert sorted(
+        str_name for str_name in os.listdir(str_screenshots_dir)
+        if str_name.endswith(".png")
+    ) == ["1_page.png", "3_other.png", "5_broken.png"], \
+        "ERROR: Wrong screenshots were deleted"
+    # Hashes are cached, nothing is deleted the second time
+    assert screenshots_handler.delete_near_duplicate_screenshots() == 0, \
+        "ERROR: Wrong number of near duplicates"
+
+
+def test_bk_tree():
+    """"""
+    bk_tree = BKTree()
+    for int_hash in [0b0000, 0b0001, 0b0111, 0b1111]:
+        bk_tree.add(int_hash, int_hash)
+    assert sorted(bk_tree.find(0b0011, 1)) == [(1, 0b0001), (1, 0b0111)], \
+        "ERROR: Wrong hashes were found"
+    assert len(bk_tree) == 4, "ERROR: Wrong size of the tree"
@@ -0,0 +1,120 @@
+import os
+import tarfile
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import PackStorage
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+from conftest import BYTES_PNG_1X1
+
+
+def test_pack_storage(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=10,
+        storage=PackStorage(int_max_pack_bytes=4096),
+    )
+    for int_screenshot in range(10):
+        str_path = screenshots_handler.save_screenshot(
+            BYTES_PNG_1X1 + bytes(int_screenshot),
+            "step%d" % (int_screenshot % 3)
+        )
+    assert str_path.endswith(".tar/10_step0.png"), \
+        "ERROR: Wrong location of the screenshot in the pack"
+    list_packs_names = screenshots_handler.storage.get_packs_names()
+    assert len(list_packs_names) > 1, "ERROR: Pack size isn't limited"
+    str_path_last_pack = \
+        os.path.join(str_screenshots_dir, list_packs_names[-1])
+    with tarfile.open(str_path_last_pack) as tar_pack:
+        assert tar_pack.getnames()[-1] == "10_step0.png", \
+            "ERROR: Pack isn't a valid tar archive"
+    assert screenshots_handler.materialize(4) == BYTES_PNG_1X1 + bytes(3), \
+        "ERROR: Wrong content read from the pack"
+    #####
+    # Rotation drops whole packs of old screenshots
+    screenshots_handler.save_screenshot(BYTES_PNG_1X1, "step1")
+    assert screenshots_handler._count_screenshots_in_the_directory() == 6
+    assert list_packs_names[0] not in \
+        screenshots_handler.storage.get_packs_names(), \
+        "ERROR: Old pack wasn't deleted"
+    screenshots_handler.delete_not_unique_screenshots()
+    assert sorted(screenshots_handler._get_names_of_all_screenshots()) == \
+        ["10_step0.png", "11_step1.png", "9_step2.png"], \
+        "ERROR: Not unique screenshots weren't deleted from the packs"
+    screenshots_handler.close()
+    #####
+    # Another handler reads the same packs
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            storage=PackStorage(int_max_pack_bytes=4096),
+            str_dedup_mode="skip",
+    ) as screenshots_handler:
+        assert screenshots_handler._count_screenshots_in_the_directory() == 3
+        str_path = screenshots_handler.save_screenshot(BYTES_PNG_1X1, "new")
+        assert str_path.endswith("/12_new.png")
+        assert screenshots_handler.save_screenshot(BYTES_PNG_1X1) == \
+            str_path, "ERROR: Same screenshot wasn't skipped"
+        screenshots_handler.delete_all_screenshots()
+        assert not [
+            str_filename for str_filename in os.listdir(str_screenshots_dir)
+            if str_filename.endswith(".tar")
+        ], "ERROR: Packs weren't deleted"
+
+
+def test_pack_storage_is_used_by_one_handler(str_screenshots_dir):
+    """"""
+    os.makedirs(str_screenshots_dir)
+    pack_storage = PackStorage()
+    pack_storage.open(str_screenshots_dir)
+    with pytest.raises(SeleniumScreenshotsError):
+        PackStorage().open(str_screenshots_dir)
+    pack_storage.close()
+    pack_storage = PackStorage()
+    pack_storage.open(str_screenshots_dir)
+    pack_storage.close()
+
+
+BYTES_CONTENT = BYTES_PNG_1X1 * 10
+INT_PADDING = -len(BYTES_CONTENT) % tarfile.BLOCKSIZE
+INT_END_OF_ARCHIVE = tarfile.BLOCKSIZE * 2
+
+
+@pytest.mark.parametrize("int_bytes_to_cut, int_screenshots_left", [
+    (1, 3),
+    (INT_END_OF_ARCHIVE + INT_PADDING // 2, 3),
+    (INT_END_OF_ARCHIVE + INT_PADDING + 1, 2),
+])
+def test_pack_storage_drops_truncated_screenshot(
+        str_screenshots_dir, int_bytes_to_cut, int_screenshots_left):
+    """"""
+    os.makedirs(str_screenshots_dir)
+    pack_storage = PackStorage()
+    pack_storage.open(str_screenshots_dir)
+    for int_screenshot_num in range(1, 4):
+        pack_storage.put("%d_step.png" % int_screenshot_num, BYTES_CONTENT)
+    str_path_pack = os.path.join(
+        str_screenshots_dir, pack_storage.get_packs_names()[0])
+    pack_storage.close()
+    with open(str_path_pack, "r+b") as file_pack:
+        file_pack.truncate(os.path.getsize(str_path_pack) - int_bytes_to_cut)
+    #####
+    # Truncated screenshot is dropped and overwritten by the next one
+    list_expected_names = [
+        "%d_step.png" % int_screenshot_num
+        for int_screenshot_num in range(1, int_screenshots_left + 1)
+    ]
+    pack_storage = PackStorage()
+    pack_storage.open(str_screenshots_dir)
+    assert [str_name for str_name, _, _ in pack_storage.list()] == \
+        list_expected_names, "ERROR: Wrong screenshots in truncated pack"
+    pack_storage.put("4_new.png", BYTES_PNG_1X1)
+    assert pack_storage.get("4_new.png") == BYTES_PNG_1X1
+    assert pack_storage.get("2_step.png") == BYTES_CONTENT
+    pack_storage.close()
+    with tarfile.open(str_path_pack) as tar_pack:
+        assert tar_pack.getnames() == list_expected_names + ["4_new.png"], \
+            "ERROR: Pack isn't a valid tar archive after truncated screenshot"
@@ -0,0 +1,152 @@
+import os
+import time
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import RetentionPolicy
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+
+
+def _get_screenshots_names(str_screenshots_dir):
+    return sorted(
+        (str_name for str_name in os.listdir(str_screenshots_dir)
+         if str_name.endswith(".png")),
+        key=lambda str_name: int(str_name.split("_")[0].split(".")[0])
+    )
+
+
+@pytest.mark.parametrize("is_to_use_index", [False, True])
+def test_keep_last_screenshots(
+        fake_driver, str_screenshots_dir, is_to_use_index):
+    """"""
+    with Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            is_to_use_index=is_to_use_index,
+            retention_policy=RetentionPolicy(
+                int_max_screenshots=5,
+                is_to_delete_in_background=True,
+            ),
+    ) as screenshots_handler:
+        for _ in range(20):
+            screenshots_handler.create_screenshot(str_description="keep")
+        screenshots_handler.flush()
+        assert _get_screenshots_names(str_screenshots_dir) == [
+            "%d_keep.png" % int_num for int_num in range(16, 21)
+        ], "ERROR: Wrong screenshots were kept"
+        assert screenshots_handler.counter.get_screenshots_in_the_dir() == 5, \
+            "ERROR: Wrong number of the screenshots"
+        assert screenshots_handler._count_screenshots_in_the_directory() == 5, \
+            "ERROR: Wrong number of the screenshots"
+
+
+def test_max_age_and_bytes(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver, str_path_dir_with_screenshots=str_screenshots_dir)
+    for _ in range(3):
+        screenshots_handler.create_screenshot(str_description="old")
+    float_old_time = time.time() - 3600
+    for str_name in _get_screenshots_names(str_screenshots_dir):
+        os.utime(
+            os.path.join(str_screenshots_dir, str_name),
+            (float_old_time, float_old_time)
+        )
+    # Old screenshots found on init are deleted, a few after every new one
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        retention_policy=RetentionPolicy(
+            float_max_age_seconds=60.0,
+            int_max_deletions_per_screenshot=2,
+        ),
+    )
+    screenshots_handler.create_screenshot(str_description="new")
+    assert _get_screenshots_names(str_screenshots_dir) == \
+        ["3_old.png", "4_new.png"], "ERROR: Wrong screenshots were deleted"
+    screenshots_handler.create_screenshot(str_description="new")
+    assert _get_screenshots_names(str_screenshots_dir) == \
+        ["4_new.png", "5_new.png"], "ERROR: Wrong screenshots were deleted"
+    #####
+    int_size = len(fake_driver.bytes_png)
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        retention_policy=RetentionPolicy(int_max_total_bytes=3 * int_size),
+    )
+    for _ in range(3):
+        screenshots_handler.create_screenshot(str_description="size")
+    assert _get_screenshots_names(str_screenshots_dir) == \
+        ["6_size.png", "7_size.png", "8_size.png"], \
+        "ERROR: Wrong screenshots were deleted"
+    with pytest.raises(SeleniumScreenshotsError):
+        RetentionPolicy()
+
+
+def test_max_total_bytes(fake_driver, str_screenshots_dir):
+    """"""
+    int_size = len(fake_driver.bytes_png)
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        is_to_use_index=True,
+    )
+    for _ in range(4):
+        screenshots_handler.create_screenshot()
+    assert screenshots_handler.get_total_bytes() == 4 * int_size, \
+        "ERROR: Wrong size of the screenshots"
+    screenshots_handler.close()
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_max_total_bytes=2 * int_size,
+    )
+    screenshots_handler.create_screenshot()
+    assert _get_screenshots_names(str_screenshots_dir) == \
+        ["4.png", "5.png"], "ERROR: Wrong screenshots were deleted"
+    assert screenshots_handler.get_total_bytes() == 2 * int_size, \
+        "ERROR: Wrong size of the screenshots"
+    assert screenshots_handler.int_bytes_written == int_size, \
+        "ERROR: Wrong number of the written bytes"
+
+
+def test_byte_budget_does_not_change_given_policy(
+        fake_driver, str_screenshots_dir):
+    """"""
+    retention_policy = RetentionPolicy(int_max_screenshots=3)
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        retention_policy=retention_policy,
+        int_max_total_bytes=1000,
+    )
+    assert retention_policy.int_max_total_bytes is None, \
+        "ERROR: Policy of the caller was changed"
+    assert screenshots_handler.retention_policy.int_max_total_bytes == 1000
+    assert screenshots_handler.retention_policy.int_max_screenshots == 3
+
+
+def test_policy_of_caller_is_copied(fake_driver, str_screenshots_dir):
+    """"""
+    class RetentionPolicyWithoutAge(RetentionPolicy):
+        def _is_to_delete_oldest(self, tuple_oldest_screenshot, float_now):
+            return len(self._list_heap_screenshots) > 2
+
+    retention_policy = RetentionPolicyWithoutAge(int_max_screenshots=100)
+    for int_max_total_bytes in (0, 1000):
+        screenshots_handler = Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            retention_policy=retention_policy,
+            int_max_total_bytes=int_max_total_bytes,
+        )
+        assert isinstance(
+            screenshots_handler.retention_policy, RetentionPolicyWithoutAge), \
+            "ERROR: Subclass of the policy was lost"
+        for _ in range(4):
+            screenshots_handler.create_screenshot(str_description="copy")
+        assert screenshots_handler._count_screenshots_in_the_directory() == 2
+    assert retention_policy.count_screenshots() == 0, \
+        "ERROR: Policy of the caller was changed"
+    assert retention_policy.int_max_total_bytes is None
@@ -0,0 +1,30 @@
+import os
+
+from selenium_screenshots import ScreenshotSession
+from conftest import FakeWebdriver
+
+
+def test_capture_all(str_screenshots_dir):
+    """"""
+    dict_driver_by_name = {
+        "driver_%d" % int_num: FakeWebdriver() for int_num in range(5)}
+    with ScreenshotSession(
+            dict_driver_by_name,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            int_writer_threads=2,
+    ) as session:
+        dict_path_by_name = session.capture_all("login")
+        assert sorted(dict_path_by_name) == sorted(dict_driver_by_name), \
+            "ERROR: Not all webdrivers were captured"
+        for str_name, str_path in dict_path_by_name.items():
+            assert os.path.exists(str_path), "ERROR: Screenshot wasn't saved"
+            assert os.path.basename(str_path).endswith(
+                "_%s_login.png" % str_name), "ERROR: Wrong screenshot name"
+        session.remove_webdriver("driver_0")
+        assert len(session.capture_all()) == 4, \
+            "ERROR: Removed webdriver was captured"
+        assert session.screenshots_handler.counter.\
+            get_last_screenshot_num() == 9, "ERROR: Wrong last number"
+    for webdriver in dict_driver_by_name.values():
+        assert webdriver.int_screenshots_taken in (1, 2), \
+            "ERROR: Wrong number of captures"
@@ -0,0 +1,83 @@
+import os
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import migrate_screenshots_layout
+
+
+def test_sharded_layout(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=8,
+        int_shard_size=3,
+    )
+    str_path = screenshots_handler.create_screenshot("first")
+    assert str_path == os.path.join(str_screenshots_dir, "0", "1_first.png"), \
+        "ERROR: Screenshot wasn't saved in the shard"
+    for _ in range(7):
+        screenshots_handler.create_screenshot("next")
+    assert screenshots_handler._count_screenshots_in_the_directory() == 8, \
+        "ERROR: Screenshots in shards weren't counted"
+    # Rotation deletes screenshots 1-4, shard 0 is deleted at once
+    screenshots_handler.create_screenshot("rotate")
+    assert not os.path.exists(os.path.join(str_screenshots_dir, "0")), \
+        "ERROR: Old shard wasn't deleted"
+    assert sorted(os.listdir(os.path.join(str_screenshots_dir, "1"))) == \
+        ["5_next.png"], "ERROR: Wrong screenshots left in the shard"
+    screenshots_handler.delete_not_unique_screenshots()
+    assert sorted(screenshots_handler._get_names_of_all_screenshots()) == \
+        ["2/8_next.png", "3/9_rotate.png"], \
+        "ERROR: Not unique screenshots in shards weren't deleted"
+    screenshots_handler.close()
+    #####
+    # Move screenshots back to the flat layout and in the shards again
+    assert migrate_screenshots_layout(str_screenshots_dir, 0) == 2, \
+        "ERROR: Wrong number of the moved screenshots"
+    assert os.path.exists(os.path.join(str_screenshots_dir, "9_rotate.png")), \
+        "ERROR: Screenshot wasn't moved to the flat layout"
+    assert not os.path.exists(os.path.join(str_screenshots_dir, "3")), \
+        "ERROR: Empty shard wasn't deleted"
+    migrate_screenshots_layout(str_screenshots_dir, 4)
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        is_to_use_index=True,
+        int_shard_size=4,
+    )
+    assert screenshots_handler._get_names_of_all_screenshots() == \
+        ["2/8_next.png", "2/9_rotate.png"], \
+        "ERROR: Index wasn't rebuilt from the shards"
+    assert os.path.basename(screenshots_handler.create_screenshot()) == \
+        "10.png", "ERROR: Numbering wasn't continued"
+    screenshots_handler.close()
+
+
+def test_rotation_keeps_shards_with_not_listed_files(
+        fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=8,
+        int_shard_size=3,
+        is_to_use_index=True,
+    )
+    for _ in range(8):
+        screenshots_handler.create_screenshot("next")
+    # Files which the index doesn't know about are in the oldest shard
+    for str_filename in ("notes.txt", "0_other.png"):
+        with open(os.path.join(str_screenshots_dir, "0", str_filename),
+                  "wb") as file_handle:
+            file_handle.write(b"")
+    screenshots_handler.create_screenshot("rotate")
+    assert sorted(os.listdir(os.path.join(str_screenshots_dir, "0"))) == \
+        ["0_other.png", "notes.txt"], \
+        "ERROR: Not listed files were deleted with the shard"
+    assert os.listdir(os.path.join(str_screenshots_dir, "1")) == \
+        ["5_next.png"], "ERROR: Wrong screenshots left in the shard"
+    assert screenshots_handler._get_names_of_all_screenshots() == [
+        "1/5_next.png", "2/6_next.png", "2/7_next.png", "2/8_next.png",
+        "3/9_rotate.png",
+    ], "ERROR: Index has stale screenshots"
+    screenshots_handler.close()
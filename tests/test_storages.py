@@ -0,0 +1,146 @@
+import datetime
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots import LocalStorage
+from selenium_screenshots import MemoryStorage
+from selenium_screenshots import ObjectStoreStorage
+from conftest import BYTES_PNG_1X1
+
+
+class FakeClientError(Exception):
+    """Error with the response like the one of botocore"""
+
+    def __init__(self, str_code):
+        super().__init__(str_code)
+        self.response = {"Error": {"Code": str_code}}
+
+
+class FakeBody(object):
+    def __init__(self, bytes_content):
+        self.bytes_content = bytes_content
+
+    def read(self):
+        return self.bytes_content
+
+
+class FakeS3Client(object):
+    """In-process stand-in of the S3 client with small pages of listing"""
+
+    def __init__(self, int_page_size=3):
+        self.int_page_size = int_page_size
+        self.dict_objects = {}
+        self.int_delete_requests = 0
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.dict_objects[(Bucket, Key)] = \
+            (Body, datetime.datetime.now(datetime.timezone.utc))
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.dict_objects:
+            raise FakeClientError("NoSuchKey")
+        return {"Body": FakeBody(self.dict_objects[(Bucket, Key)][0])}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.dict_objects:
+            raise FakeClientError("404")
+        bytes_content, datetime_modified = self.dict_objects[(Bucket, Key)]
+        return {
+            "ContentLength": len(bytes_content),
+            "LastModified": datetime_modified,
+        }
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken="0"):
+        list_keys = sorted(
+            str_key for str_bucket, str_key in self.dict_objects
+            if str_bucket == Bucket and str_key.startswith(Prefix)
+        )
+        int_start = int(ContinuationToken)
+        int_end = int_start + self.int_page_size
+        dict_response = {
+            "Contents": [
+                {
+                    "Key": str_key,
+                    "Size": len(self.dict_objects[(Bucket, str_key)][0]),
+                    "LastModified": self.dict_objects[(Bucket, str_key)][1],
+                }
+                for str_key in list_keys[int_start:int_end]
+            ],
+            "IsTruncated": int_end < len(list_keys),
+        }
+        if dict_response["IsTruncated"]:
+            dict_response["NextContinuationToken"] = str(int_end)
+        return dict_response
+
+    def delete_objects(self, Bucket, Delete):
+        self.int_delete_requests += 1
+        for dict_object in Delete["Objects"]:
+            self.dict_objects.pop((Bucket, dict_object["Key"]), None)
+        return {}
+
+
+def get_storages(tmp_path):
+    """"""
+    client = FakeS3Client()
+    # Object of another directory in the bucket isn't a screenshot
+    client.put_object("bucket", "run/other/1_x.png", b"", "image/png")
+    return [
+        ("memory://", MemoryStorage()),
+        (str(tmp_path / "local"), LocalStorage(str(tmp_path / "local"))),
+        (
+            "s3://bucket/run/",
+            ObjectStoreStorage("bucket", str_prefix="run/", client=client),
+        ),
+    ]
+
+
+@pytest.mark.parametrize("int_storage", [0, 1, 2])
+def test_storages(fake_driver, str_screenshots_dir, tmp_path, int_storage):
+    """"""
+    str_location_start, storage = get_storages(tmp_path)[int_storage]
+    screenshots_handler = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        int_screenshots_to_delete_half=10,
+        storage=storage,
+    )
+    for int_screenshot in range(10):
+        str_path = screenshots_handler.save_screenshot(
+            BYTES_PNG_1X1 + bytes(int_screenshot),
+            "step%d" % (int_screenshot % 3)
+        )
+    assert str_path.startswith(str_location_start)
+    assert str_path.endswith("/10_step0.png"), \
+        "ERROR: Wrong location of the screenshot"
+    assert screenshots_handler.materialize(4) == BYTES_PNG_1X1 + bytes(3), \
+        "ERROR: Wrong content read from the storage"
+    assert storage.get("missing.png") is None
+    assert storage.stat("missing.png") is None
+    assert storage.stat("4_step0.png")[0] == len(BYTES_PNG_1X1) + 3
+    #####
+    # Rotation deletes old half of the screenshots from the storage
+    screenshots_handler.save_screenshot(BYTES_PNG_1X1, "step1")
+    assert screenshots_handler._count_screenshots_in_the_directory() == 6
+    screenshots_handler.delete_not_unique_screenshots()
+    assert sorted(screenshots_handler._get_names_of_all_screenshots()) == \
+        ["10_step0.png", "11_step1.png", "9_step2.png"], \
+        "ERROR: Not unique screenshots weren't deleted from the storage"
+    screenshots_handler.delete_all_screenshots()
+    assert not list(storage.list()), "ERROR: Screenshots weren't deleted"
+    screenshots_handler.close()
+
+
+def test_object_store_deletes_by_batches():
+    """"""
+    client = FakeS3Client(int_page_size=1000)
+    storage = ObjectStoreStorage(
+        "bucket", client=client, int_max_connections=2)
+    list_names = ["%d_step.png" % int_num for int_num in range(2500)]
+    for str_name in list_names:
+        storage.put(str_name, BYTES_PNG_1X1)
+    assert len(list(storage.list())) == 2500
+    assert storage.delete(list_names) == 2500
+    assert client.int_delete_requests == 3, \
+        "ERROR: Objects weren't deleted by batches of 1000"
+    assert not client.dict_objects
@@ -0,0 +1,50 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from selenium_screenshots import Screenshots
+from selenium_screenshots.exceptions import SeleniumScreenshotsError
+
+
+def test_validation_mode(fake_driver, str_screenshots_dir):
+    """"""
+    screenshots_handler_strict = Screenshots(
+        fake_driver, str_path_dir_with_screenshots=str_screenshots_dir)
+    screenshots_handler_off = Screenshots(
+        fake_driver,
+        str_path_dir_with_screenshots=str_screenshots_dir,
+        str_validation_mode="off",
+    )
+    assert screenshots_handler_off.create_screenshot.__func__ is \
+        Screenshots.create_screenshot.__wrapped__, \
+        "ERROR: Method is still wrapped in off mode"
+    assert screenshots_handler_strict.create_screenshot.__func__ is \
+        Screenshots.create_screenshot, \
+        "ERROR: Another handler lost validation"
+    with pytest.raises(Exception):
+        screenshots_handler_strict.create_screenshot(123)
+    str_path = screenshots_handler_off.create_screenshot("off_mode")
+    assert os.path.basename(str_path) == "1_off_mode.png", \
+        "ERROR: Screenshot in off mode wasn't created"
+    with pytest.raises(SeleniumScreenshotsError):
+        Screenshots(
+            fake_driver,
+            str_path_dir_with_screenshots=str_screenshots_dir,
+            str_validation_mode="loose",
+        )
+
+
+def test_validation_mode_from_env():
+    """"""
+    str_output = subprocess.check_output(
+        [
+            sys.executable, "-c",
+            "import selenium_screenshots as s; "
+            "print(hasattr(s.make_screenshot, '__wrapped__'))"
+        ],
+        env=dict(os.environ, SELENIUM_SCREENSHOTS_VALIDATION="off"),
+    ).decode()
+    assert str_output.strip() == "False", \
+        "ERROR: make_screenshot is wrapped with validation off"